@@ -0,0 +1,26 @@
+"""Add participation ranking index
+
+Revision ID: 06256413d8d8
+Revises: 4b2c523eb1e8
+Create Date: 2026-10-18 12:41:09.371245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '06256413d8d8'
+down_revision: Union[str, None] = '4b2c523eb1e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_participations_trivia_ranking', 'participations', ['trivia_id', sa.text('score_total DESC'), 'finished_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_participations_trivia_ranking', table_name='participations')
@@ -0,0 +1,88 @@
+"""Add trivia question position
+
+Revision ID: 4b2c523eb1e8
+Revises: 9dce98e2eaec
+Create Date: 2026-10-18 10:03:17.554920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b2c523eb1e8'
+down_revision: Union[str, None] = '9dce98e2eaec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('trivia_questions', sa.Column('position', sa.Integer(), nullable=True))
+    # Questions were served in no stored order, and answered_count is already
+    # the number of answers, so each participation resumes at position
+    # answered_count. Put the questions most participants answered first, then
+    # the ones they tended to answer earlier, so that the answered questions
+    # become the leading positions.
+    op.execute(
+        """
+        UPDATE trivia_questions
+        SET position = ordered.position
+        FROM (
+            SELECT
+                tq.trivia_id,
+                tq.question_id,
+                ROW_NUMBER() OVER (
+                    PARTITION BY tq.trivia_id
+                    ORDER BY
+                        COUNT(a.id) DESC,
+                        AVG(a.answer_index),
+                        tq.created_at,
+                        tq.question_id
+                ) - 1 AS position
+            FROM trivia_questions AS tq
+            LEFT JOIN (
+                SELECT
+                    id,
+                    trivia_id,
+                    question_id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY participation_id ORDER BY created_at, id
+                    ) AS answer_index
+                FROM answers
+            ) AS a
+              ON a.trivia_id = tq.trivia_id AND a.question_id = tq.question_id
+            GROUP BY tq.trivia_id, tq.question_id, tq.created_at
+        ) AS ordered
+        WHERE ordered.trivia_id = trivia_questions.trivia_id
+          AND ordered.question_id = trivia_questions.question_id
+        """
+    )
+    # An in-progress participation with an answer at or past its cursor would
+    # be served a question it already answered and stay stuck. No order
+    # satisfies every such participation, so close it with the answers and
+    # score it has; nothing is deleted, and the downgrade leaves it finished.
+    op.execute(
+        """
+        UPDATE participations
+        SET status = 'finished', finished_at = CURRENT_TIMESTAMP
+        WHERE status = 'in_progress'
+          AND EXISTS (
+              SELECT 1
+              FROM answers AS a
+              JOIN trivia_questions AS tq
+                ON tq.trivia_id = a.trivia_id AND tq.question_id = a.question_id
+              WHERE a.participation_id = participations.id
+                AND tq.position >= participations.answered_count
+          )
+        """
+    )
+    with op.batch_alter_table('trivia_questions') as batch_op:
+        batch_op.alter_column('position', existing_type=sa.Integer(), nullable=False)
+    op.create_index('ix_trivia_questions_trivia_position', 'trivia_questions', ['trivia_id', 'position'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trivia_questions_trivia_position', table_name='trivia_questions')
+    op.drop_column('trivia_questions', 'position')
@@ -0,0 +1,31 @@
+"""Add keyset pagination indexes
+
+Revision ID: 83f0a00f9dd7
+Revises: 06256413d8d8
+Create Date: 2026-10-18 13:05:27.518346
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '83f0a00f9dd7'
+down_revision: Union[str, None] = '06256413d8d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_questions_created_at_id', 'questions', ['created_at', 'id'], unique=False)
+    op.create_index('ix_questions_difficulty_created_at_id', 'questions', ['difficulty', 'created_at', 'id'], unique=False)
+    op.create_index('ix_trivias_created_at_id', 'trivias', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trivias_created_at_id', table_name='trivias')
+    op.drop_index('ix_questions_difficulty_created_at_id', table_name='questions')
+    op.drop_index('ix_questions_created_at_id', table_name='questions')
+    op.drop_index('ix_users_created_at_id', table_name='users')
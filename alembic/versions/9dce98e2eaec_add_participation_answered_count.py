@@ -0,0 +1,38 @@
+"""Add participation answered_count
+
+Revision ID: 9dce98e2eaec
+Revises: 31654492ed3d
+Create Date: 2026-10-18 09:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9dce98e2eaec'
+down_revision: Union[str, None] = '31654492ed3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('participations', sa.Column('answered_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE participations
+        SET answered_count = counts.total
+        FROM (
+            SELECT participation_id, COUNT(*) AS total
+            FROM answers
+            GROUP BY participation_id
+        ) AS counts
+        WHERE counts.participation_id = participations.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('participations', 'answered_count')
@@ -0,0 +1,28 @@
+"""Add answer idempotency key
+
+Revision ID: c5e2a7b19f40
+Revises: 83f0a00f9dd7
+Create Date: 2026-10-18 15:22:48.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a7b19f40'
+down_revision: Union[str, None] = '83f0a00f9dd7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('answers', sa.Column('idempotency_key', sa.String(length=255), nullable=True))
+    op.create_unique_constraint('uq_answer_participation_idempotency_key', 'answers', ['participation_id', 'idempotency_key'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_answer_participation_idempotency_key', 'answers', type_='unique')
+    op.drop_column('answers', 'idempotency_key')
@@ -0,0 +1,32 @@
+"""Add collection versions
+
+Revision ID: d41f7c9a2b68
+Revises: c5e2a7b19f40
+Create Date: 2026-10-18 18:41:09.327514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7c9a2b68'
+down_revision: Union[str, None] = 'c5e2a7b19f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('collection_versions',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name', name=op.f('pk_collection_versions'))
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
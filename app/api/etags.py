@@ -0,0 +1,45 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.application.versions import Version
+
+# Clients may keep the body but must revalidate before reusing it.
+CACHE_CONTROL = "no-cache"
+
+
+def compute_etag(version: Version, *scope: object) -> str:
+    """Strong validator for one representation of a resource at a version.
+
+    ``scope`` carries whatever else shapes the body, such as the resource ID
+    and the query parameters of a page.
+    """
+    key = repr((scope, version.count, version.updated_at)).encode()
+    return '"' + hashlib.blake2b(key, digest_size=16).hexdigest() + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_response(
+    request: Request, response: Response, version: Version, *scope: object
+) -> Optional[Response]:
+    """Tags ``response`` and returns a 304 to send instead when the client's
+    copy is still current."""
+    etag = compute_etag(version, *scope)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
@@ -0,0 +1,193 @@
+import json
+import logging
+import math
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.db.instrumentation import (
+    QueryStats,
+    start_tracking,
+    stop_tracking,
+)
+from app.infrastructure.db.session import (
+    WriteMarker,
+    start_write_tracking,
+    stop_write_tracking,
+)
+from app.infrastructure.metrics import http_request_duration, http_requests_in_flight
+
+logger = logging.getLogger("app.requests")
+
+SLOWEST_STATEMENT_CHARS = 500
+WRITE_COOKIE = "last_write"
+
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    return (
+        f'db;dur={stats.total * 1000:.3f};desc="{stats.count} queries", '
+        f"app;dur={elapsed * 1000:.3f}"
+    )
+
+
+class QueryInstrumentationMiddleware:
+    """Counts and times the SQL each request runs.
+
+    The totals go out in a ``Server-Timing`` header and in one JSON log line
+    per request. With a positive ``n_plus_one_threshold``, statement shapes
+    that repeat more often than that within a request are logged as warnings.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 0):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(track_shapes=self.n_plus_one_threshold > 0)
+        token = start_tracking(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", server_timing(stats, time.perf_counter() - started)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            stop_tracking(token)
+            self._log(scope, stats, status_code, time.perf_counter() - started)
+
+    def _log(
+        self, scope: Scope, stats: QueryStats, status_code: int, elapsed: float
+    ) -> None:
+        route = route_template(scope)
+        if logger.isEnabledFor(logging.INFO):
+            record = {
+                "event": "request",
+                "method": scope["method"],
+                "route": route,
+                "status": status_code,
+                "duration_ms": round(elapsed * 1000, 3),
+                "db_ms": round(stats.total * 1000, 3),
+                "queries": stats.count,
+            }
+            if stats.slowest_statement is not None:
+                record["slowest_ms"] = round(stats.slowest * 1000, 3)
+                record["slowest_statement"] = stats.slowest_statement[
+                    :SLOWEST_STATEMENT_CHARS
+                ]
+            logger.info(json.dumps(record))
+        for shape, count in stats.repeated(self.n_plus_one_threshold):
+            logger.warning(
+                json.dumps(
+                    {
+                        "event": "n_plus_one",
+                        "method": scope["method"],
+                        "route": route,
+                        "count": count,
+                        "statement": shape[:SLOWEST_STATEMENT_CHARS],
+                    }
+                )
+            )
+
+
+class MetricsMiddleware:
+    """Records per-route latency histograms and the in-flight request gauge."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                route_template(scope),
+                str(status_code),
+            )
+
+
+def _parse_last_write(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        last_write = float(value)
+    except ValueError:
+        return None
+    return last_write if math.isfinite(last_write) else None
+
+
+class ReadYourWritesMiddleware:
+    """Keeps a client's reads on the primary for a while after it writes.
+
+    A request that commits through the primary gets a ``last_write`` cookie
+    with the commit time. Whichever worker the client reaches next serves its
+    reads from the primary until ``window`` seconds have passed, so replica
+    lag never hides the client's own writes. Worker clocks are assumed to
+    agree to well within the window.
+    """
+
+    def __init__(self, app: ASGIApp, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cookie = HTTPConnection(scope).cookies.get(WRITE_COOKIE)
+        marker = WriteMarker(last_write=_parse_last_write(cookie))
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker.wrote_at:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{WRITE_COOKIE}={marker.wrote_at:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; "
+                    "SameSite=Lax",
+                )
+            await send(message)
+
+        token = start_write_tracking(marker)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            stop_write_tracking(token)
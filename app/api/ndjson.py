@@ -0,0 +1,31 @@
+import json
+from typing import Any
+
+from fastapi import HTTPException
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def parse_items(body: bytes, content_type: str) -> list[Any]:
+    """Decodes a bulk request body sent either as a JSON array or as NDJSON.
+
+    Malformed NDJSON lines are returned as ``ValueError`` instances in place,
+    so callers can report them against the line's index.
+    """
+    if content_type.split(";")[0].strip() == NDJSON_MEDIA_TYPE:
+        items: list[Any] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(ValueError(f"Invalid JSON: {e}"))
+        return items
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array")
+    return payload
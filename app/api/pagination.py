@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+
+from app.application.pagination import PageCursor
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+
+def decode_page_cursor(cursor: Optional[str]) -> Optional[PageCursor]:
+    if not cursor:
+        return None
+    payload = decode_cursor(cursor)
+    try:
+        return PageCursor(
+            created_at=datetime.fromisoformat(payload["created_at"]),
+            id=UUID(payload["id"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, cursor: Optional[PageCursor]) -> None:
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            {"created_at": cursor.created_at.isoformat(), "id": str(cursor.id)}
+        )
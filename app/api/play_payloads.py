@@ -0,0 +1,101 @@
+"""Pre-encoded question payloads for the play and answer routes.
+
+Every step of a trivia returns the same question shape, so each question is
+encoded to JSON once and cached. Per request only the message and the answer
+links, which embed the player's IDs, are filled in. Links are built from a
+path template resolved once per app instead of a route lookup per option.
+"""
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi import Request, Response
+from starlette.applications import Starlette
+
+from app.domain.entities.question import Question
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.config import settings
+
+ANSWER_ROUTE = "answer_question"
+ANSWER_PATH_PARAMS = ("user_id", "trivia_id", "question_id", "option_id")
+
+fragment_cache: "LRUCache[QuestionFragment]" = LRUCache(
+    maxsize=settings.question_cache_size, ttl=settings.question_cache_ttl
+)
+
+
+def answer_path_template(app: Starlette) -> str:
+    """The answer route path with ``str.format`` placeholders for its params."""
+    template = getattr(app.state, "answer_path_template", None)
+    if template is None:
+        template = app.url_path_for(
+            ANSWER_ROUTE, **{name: "{" + name + "}" for name in ANSWER_PATH_PARAMS}
+        )
+        app.state.answer_path_template = template
+    return template
+
+
+@dataclass(frozen=True)
+class QuestionFragment:
+    # '"question_id":…,"text":…,"options":[' and, per option, its ID with
+    # '{"option_id":…,"text":…,"answer":' ready for the link.
+    head: bytes
+    options: tuple[tuple[UUID, bytes], ...]
+
+    @classmethod
+    def encode(cls, question: Question) -> "QuestionFragment":
+        head = orjson.dumps(
+            {"question_id": str(question.id), "text": question.text, "options": []}
+        )
+        return cls(
+            head=head[1:-2],
+            options=tuple(
+                (
+                    option.id,
+                    orjson.dumps(
+                        {
+                            "option_id": str(option.id),
+                            "text": option.text,
+                            "answer": None,
+                        }
+                    )[:-5],
+                )
+                for option in question.options
+            ),
+        )
+
+
+def question_fragment(question: Question) -> QuestionFragment:
+    # Questions are never edited, so a fragment stays valid for its ID.
+    fragment = fragment_cache.get(question.id)
+    if fragment is None:
+        fragment = QuestionFragment.encode(question)
+        fragment_cache.set(question.id, fragment)
+    return fragment
+
+
+def question_response(
+    request: Request,
+    user_id: UUID,
+    trivia_id: UUID,
+    question: Question,
+    fields: dict[str, Any],
+) -> Response:
+    """Renders ``fields`` followed by the question and its answer links."""
+    fragment = question_fragment(question)
+    base_url = str(request.base_url).rstrip("/")
+    links = base_url + answer_path_template(request.app).format(
+        user_id=user_id,
+        trivia_id=trivia_id,
+        question_id=question.id,
+        option_id="{option_id}",
+    )
+    options = b",".join(
+        prefix + orjson.dumps(links.replace("{option_id}", str(option_id))) + b"}"
+        for option_id, prefix in fragment.options
+    )
+    body = b"".join(
+        (orjson.dumps(fields)[:-1], b",", fragment.head, options, b"]}")
+    )
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,121 @@
+import json
+from typing import Any, AsyncIterator, Callable, List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.ndjson import NDJSON_MEDIA_TYPE
+from app.application.ports.answer_repo import AnswerRepo
+from app.application.ports.question_repo import QuestionRepo
+from app.application.ports.trivia_repo import TriviaRepo
+from app.application.use_cases.export import (
+    ExportAnswers,
+    ExportQuestions,
+    ExportTrivias,
+)
+from app.domain.entities.answer import Answer
+from app.domain.entities.question import Question
+from app.domain.entities.trivia import Trivia
+from app.infrastructure.backend import get_session, repositories
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = 10000
+
+router = APIRouter()
+
+# Exports read straight from the database; the caches only hold the hot set.
+# The responses stream after the endpoint returns, which needs FastAPI 0.118+
+# to keep these yield-dependency sessions open until the body is sent.
+async def get_question_repo(db: AsyncSession = Depends(get_session)):
+    return repositories.question_repo(db)
+
+
+async def get_trivia_repo(db: AsyncSession = Depends(get_session)):
+    return repositories.trivia_repo(db)
+
+
+async def get_answer_repo(db: AsyncSession = Depends(get_session)):
+    return repositories.answer_repo(db)
+
+
+def _question_row(question: Question) -> dict[str, Any]:
+    return {
+        "id": str(question.id),
+        "text": question.text,
+        "difficulty": question.difficulty.value,
+        "options": [
+            {"id": str(option.id), "text": option.text, "is_correct": option.is_correct}
+            for option in question.options
+        ],
+    }
+
+
+def _trivia_row(trivia: Trivia) -> dict[str, Any]:
+    return {
+        "id": str(trivia.id),
+        "name": trivia.name,
+        "description": trivia.description,
+        "question_ids": [str(question_id) for question_id in trivia.question_ids],
+        "user_ids": [str(user_id) for user_id in trivia.user_ids],
+    }
+
+
+def _answer_row(answer: Answer) -> dict[str, Any]:
+    return {
+        "id": str(answer.id),
+        "participation_id": str(answer.participation_id),
+        "trivia_id": str(answer.trivia_id),
+        "question_id": str(answer.question_id),
+        "option_id": str(answer.option_id),
+        "is_correct": answer.is_correct,
+        "score_awarded": answer.score_awarded,
+        "answered_at": answer.answered_at.isoformat() if answer.answered_at else None,
+    }
+
+
+async def _ndjson(
+    batches: AsyncIterator[List[Any]], to_row: Callable[[Any], dict[str, Any]]
+) -> AsyncIterator[str]:
+    # One chunk per batch keeps writes coarse while memory stays bounded by
+    # the batch size.
+    async for batch in batches:
+        yield "".join(
+            json.dumps(to_row(item), separators=(",", ":")) + "\n" for item in batch
+        )
+
+
+@router.get("/exports/questions")
+async def export_questions(
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    question_repo: QuestionRepo = Depends(get_question_repo),
+):
+    use_case = ExportQuestions(question_repo)
+    return StreamingResponse(
+        _ndjson(use_case.execute(batch_size), _question_row),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.get("/exports/trivias")
+async def export_trivias(
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    trivia_repo: TriviaRepo = Depends(get_trivia_repo),
+):
+    use_case = ExportTrivias(trivia_repo)
+    return StreamingResponse(
+        _ndjson(use_case.execute(batch_size), _trivia_row),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.get("/exports/answers")
+async def export_answers(
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    answer_repo: AnswerRepo = Depends(get_answer_repo),
+):
+    use_case = ExportAnswers(answer_repo)
+    return StreamingResponse(
+        _ndjson(use_case.execute(batch_size), _answer_row),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
@@ -1,7 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.infrastructure.db.session import get_db
+from app.infrastructure.db.pool_metrics import pool_status
+from app.infrastructure.db.session import (
+    engine,
+    get_db,
+    pool_wait_stats,
+    read_engine,
+    read_pool_wait_stats,
+)
 
 router = APIRouter()
 
@@ -16,3 +23,10 @@ async def health_check_db(db: AsyncSession = Depends(get_db)):
         return {"status": "ok", "database": "connected"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
+
+@router.get("/health/pool")
+async def health_check_pool():
+    status = pool_status(engine, pool_wait_stats)
+    if read_engine is not engine:
+        status["read"] = pool_status(read_engine, read_pool_wait_stats)
+    return status
@@ -0,0 +1,98 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.api.play_payloads import fragment_cache
+from app.infrastructure import metrics
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.db.pool_metrics import pool_status
+from app.infrastructure.db.session import (
+    engine,
+    pool_wait_stats,
+    read_engine,
+    read_pool_wait_stats,
+)
+from app.infrastructure.repositories.cached_question_repo import question_cache
+from app.infrastructure.repositories.cached_trivia_repo import (
+    answer_key_cache,
+    composition_cache,
+)
+from app.infrastructure.repositories.ranked_participation_repo import (
+    leaderboard_cache,
+)
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+CACHES: dict[str, LRUCache] = {
+    "question": question_cache,
+    "composition": composition_cache,
+    "answer_key": answer_key_cache,
+    "leaderboard": leaderboard_cache,
+    "question_fragment": fragment_cache,
+}
+
+router = APIRouter()
+
+
+def _pool_metrics() -> list:
+    pools = {"primary": (engine, pool_wait_stats)}
+    if read_engine is not engine:
+        pools["replica"] = (read_engine, read_pool_wait_stats)
+
+    gauges = {
+        gauge: metrics.Gauge(f"db_pool_{gauge}", help_text, labels=("pool",))
+        for gauge, help_text in (
+            ("size", "Configured pool size."),
+            ("checkedout", "Connections checked out of the pool."),
+            ("checkedin", "Idle connections in the pool."),
+            ("overflow", "Connections open beyond the pool size."),
+        )
+    }
+    checkouts = metrics.Counter(
+        "db_pool_checkouts_total", "Timed connection checkouts.", labels=("pool",)
+    )
+    wait_total = metrics.Counter(
+        "db_pool_wait_seconds_total",
+        "Time spent checking out connections.",
+        labels=("pool",),
+    )
+    wait_max = metrics.Gauge(
+        "db_pool_wait_seconds_max", "Longest connection checkout.", labels=("pool",)
+    )
+    for name, (pooled, wait_stats) in pools.items():
+        status = pool_status(pooled, wait_stats)
+        for gauge, metric in gauges.items():
+            if gauge in status:
+                metric.set(name, value=status[gauge])
+        checkouts.inc(name, amount=status["wait"]["count"])
+        wait_total.inc(name, amount=status["wait"]["total_seconds"])
+        wait_max.set(name, value=status["wait"]["max_seconds"])
+    return [*gauges.values(), checkouts, wait_total, wait_max]
+
+
+def _cache_metrics() -> list:
+    hits = metrics.Counter("cache_hits_total", "Cache hits.", labels=("cache",))
+    misses = metrics.Counter("cache_misses_total", "Cache misses.", labels=("cache",))
+    size = metrics.Gauge("cache_entries", "Entries held.", labels=("cache",))
+    hit_ratio = metrics.Gauge(
+        "cache_hit_ratio", "Hits over lookups since start.", labels=("cache",)
+    )
+    for name, cache in CACHES.items():
+        stats = cache.stats()
+        hits.inc(name, amount=stats["hits"])
+        misses.inc(name, amount=stats["misses"])
+        size.set(name, value=stats["size"])
+        hit_ratio.set(name, value=stats["hit_ratio"])
+    return [hits, misses, size, hit_ratio]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    body = metrics.render(
+        [
+            *metrics.REQUEST_METRICS,
+            *metrics.DOMAIN_METRICS,
+            *_pool_metrics(),
+            *_cache_metrics(),
+        ]
+    )
+    return PlainTextResponse(body, media_type=PROMETHEUS_MEDIA_TYPE)
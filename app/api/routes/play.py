@@ -1,35 +1,60 @@
-from typing import Union
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.api.schemas.play import PlayQuestionResponse, PlayQuestionOption
+from app.api.play_payloads import question_response
+from app.api.schemas.play import PlayQuestionResponse
 from app.api.schemas.answer import AnswerFinishedResponse, AnswerNextQuestionResponse
 from app.application.use_cases.play_trivia import PlayTrivia
 from app.application.use_cases.answer_question import AnswerQuestion
-from app.infrastructure.db.session import get_db
-from app.infrastructure.repositories.participation_repo import (
-    ParticipationRepoSqlAlchemy,
+from app.domain.errors import (
+    IdempotencyKeyReused,
+    TriviaNotAssigned,
+    TriviaQuestionRemoved,
+)
+from app.infrastructure.backend import get_session, repositories
+from app.infrastructure.metrics import answers_graded, participations_finished
+from app.infrastructure.repositories.ranked_participation_repo import (
+    RankedParticipationRepo,
+    leaderboard_cache,
+)
+from app.infrastructure.repositories.cached_trivia_repo import (
+    CachedTriviaRepo,
+    answer_key_cache,
+    composition_cache,
+)
+from app.infrastructure.repositories.cached_question_repo import (
+    CachedQuestionRepo,
+    question_cache,
 )
-from app.infrastructure.repositories.trivia_repo import TriviaRepoSqlAlchemy
-from app.infrastructure.repositories.question_repo import QuestionRepoSqlAlchemy
-from app.infrastructure.repositories.answer_repo import AnswerRepoSqlAlchemy
 
 router = APIRouter()
 
-async def get_play_trivia_use_case(db: AsyncSession = Depends(get_db)):
-    participation_repo = ParticipationRepoSqlAlchemy(db)
-    trivia_repo = TriviaRepoSqlAlchemy(db)
-    question_repo = QuestionRepoSqlAlchemy(db)
+async def get_play_trivia_use_case(db: AsyncSession = Depends(get_session)):
+    participation_repo = RankedParticipationRepo(
+        repositories.participation_repo(db), leaderboard_cache
+    )
+    trivia_repo = CachedTriviaRepo(
+        repositories.trivia_repo(db), composition_cache, answer_key_cache
+    )
+    question_repo = CachedQuestionRepo(repositories.question_repo(db), question_cache)
     return PlayTrivia(participation_repo, trivia_repo, question_repo)
 
-async def get_answer_question_use_case(db: AsyncSession = Depends(get_db)):
-    answer_repo = AnswerRepoSqlAlchemy(db)
-    participation_repo = ParticipationRepoSqlAlchemy(db)
-    question_repo = QuestionRepoSqlAlchemy(db)
-    trivia_repo = TriviaRepoSqlAlchemy(db)
-    return AnswerQuestion(answer_repo, participation_repo, question_repo, trivia_repo)
+async def get_answer_question_use_case(db: AsyncSession = Depends(get_session)):
+    answer_repo = repositories.answer_repo(db)
+    unit_of_work = repositories.unit_of_work(db)
+    participation_repo = RankedParticipationRepo(
+        repositories.participation_repo(db), leaderboard_cache, unit_of_work
+    )
+    question_repo = CachedQuestionRepo(repositories.question_repo(db), question_cache)
+    trivia_repo = CachedTriviaRepo(
+        repositories.trivia_repo(db), composition_cache, answer_key_cache
+    )
+    return AnswerQuestion(
+        answer_repo, participation_repo, question_repo, trivia_repo, unit_of_work
+    )
 
 @router.get(
     "/users/{user_id}/trivias/{trivia_id}/play", response_model=PlayQuestionResponse
@@ -44,6 +69,8 @@ async def play_trivia(
         question, participation_id, trivia_name, is_new, final_score = (
             await use_case.execute(user_id, trivia_id)
         )
+    except TriviaNotAssigned as e:
+        raise HTTPException(status_code=403, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -61,25 +88,8 @@ async def play_trivia(
     else:
         message = "Continuemos con la trivia"
 
-    options = [
-        PlayQuestionOption(
-            option_id=opt.id,
-            text=opt.text,
-            answer=str(
-                request.url_for(
-                    "answer_question",
-                    user_id=user_id,
-                    trivia_id=trivia_id,
-                    question_id=question.id,
-                    option_id=opt.id,
-                )
-            ),
-        )
-        for opt in question.options
-    ]
-
-    return PlayQuestionResponse(
-        question_id=question.id, text=question.text, options=options, message=message
+    return question_response(
+        request, user_id, trivia_id, question, {"message": message}
     )
 
 
@@ -93,12 +103,19 @@ async def answer_question(
     trivia_id: UUID,
     question_id: UUID,
     option_id: UUID,
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255),
     use_case: AnswerQuestion = Depends(get_answer_question_use_case),
 ):
     try:
-        next_question, final_score, is_finished, is_correct = await use_case.execute(
-            user_id, trivia_id, question_id, option_id
+        next_question, final_score, is_finished, is_correct, replayed = (
+            await use_case.execute(
+                user_id, trivia_id, question_id, option_id, idempotency_key
+            )
         )
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except TriviaQuestionRemoved as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         error_msg = str(e)
         if error_msg == "Question already answered":
@@ -109,6 +126,11 @@ async def answer_question(
             )
         raise HTTPException(status_code=400, detail=error_msg)
 
+    # A replay resends a result that was counted when it was first graded.
+    if not replayed:
+        answers_graded.inc("true" if is_correct else "false")
+        if is_finished:
+            participations_finished.inc()
     if is_finished:
         message = f"Trivia finalizada. Tu puntaje final es {final_score}."
         return AnswerFinishedResponse(
@@ -120,27 +142,10 @@ async def answer_question(
     else:
         message = "Incorrecto. Sigamos con la siguiente."
 
-    options = [
-        {
-            "option_id": str(opt.id),
-            "text": opt.text,
-            "answer": str(
-                request.url_for(
-                    "answer_question",
-                    user_id=user_id,
-                    trivia_id=trivia_id,
-                    question_id=next_question.id,
-                    option_id=opt.id,
-                )
-            ),
-        }
-        for opt in next_question.options
-    ]
-
-    return AnswerNextQuestionResponse(
-        finished=False,
-        question_id=next_question.id,
-        text=next_question.text,
-        options=options,
-        message=message,
+    return question_response(
+        request,
+        user_id,
+        trivia_id,
+        next_question,
+        {"message": message, "finished": False},
     )
@@ -1,23 +1,61 @@
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.schemas.question import QuestionCreate, QuestionResponse
-from app.application.use_cases.question import CreateQuestion, ListQuestions
+from app.api.etags import conditional_response
+from app.api.ndjson import parse_items
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_page_cursor,
+    set_next_cursor,
+)
+from app.api.schemas.question import (
+    ImportItemErrorResponse,
+    QuestionCreate,
+    QuestionImportResponse,
+    QuestionResponse,
+)
+from app.application.use_cases.question import (
+    CreateQuestion,
+    ImportQuestions,
+    ListQuestions,
+)
 from app.domain.errors import InvalidQuestionOptions
-from app.infrastructure.db.session import get_db
-from app.infrastructure.repositories.question_repo import QuestionRepoSqlAlchemy
+from app.domain.value_objects.difficulty import Difficulty
+from app.infrastructure.backend import get_read_session, get_session, repositories
+from app.infrastructure.repositories.cached_question_repo import (
+    CachedQuestionRepo,
+    question_cache,
+)
 
 router = APIRouter()
 
-async def get_question_repo(db: AsyncSession = Depends(get_db)):
-    return QuestionRepoSqlAlchemy(db)
+async def get_question_repo(db: AsyncSession = Depends(get_session)):
+    return CachedQuestionRepo(repositories.question_repo(db), question_cache)
+
+
+async def get_read_question_repo(db: AsyncSession = Depends(get_read_session)):
+    return CachedQuestionRepo(repositories.question_repo(db), question_cache)
+
+
+async def get_import_questions_use_case(db: AsyncSession = Depends(get_session)):
+    question_repo = CachedQuestionRepo(repositories.question_repo(db), question_cache)
+    return ImportQuestions(question_repo, repositories.unit_of_work(db))
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
 
 @router.post("/questions", response_model=QuestionResponse)
 async def create_question(
     question_in: QuestionCreate,
-    question_repo: QuestionRepoSqlAlchemy = Depends(get_question_repo),
+    question_repo: CachedQuestionRepo = Depends(get_question_repo),
 ):
     use_case = CreateQuestion(question_repo)
     options_data = [opt.model_dump() for opt in question_in.options]
@@ -31,9 +69,69 @@ async def create_question(
         raise HTTPException(status_code=422, detail=str(e))
 
 
+@router.post("/questions/import", response_model=QuestionImportResponse)
+async def import_questions(
+    request: Request,
+    use_case: ImportQuestions = Depends(get_import_questions_use_case),
+):
+    items = parse_items(await request.body(), request.headers.get("content-type", ""))
+
+    # Shape errors are reported here; the use case only sees well-formed items
+    # and reports domain rule violations against their position in `valid`.
+    errors: List[ImportItemErrorResponse] = []
+    valid: List[dict] = []
+    positions: List[int] = []
+    for index, item in enumerate(items):
+        if isinstance(item, ValueError):
+            errors.append(ImportItemErrorResponse(index=index, error=str(item)))
+            continue
+        try:
+            question_in = QuestionCreate.model_validate(item)
+        except ValidationError as e:
+            errors.append(
+                ImportItemErrorResponse(index=index, error=_validation_message(e))
+            )
+            continue
+        valid.append(question_in.model_dump())
+        positions.append(index)
+
+    report = await use_case.execute(valid)
+
+    question_ids: List[Optional[UUID]] = [None] * len(items)
+    for position, question_id in zip(positions, report.question_ids, strict=True):
+        question_ids[position] = question_id
+    errors.extend(
+        ImportItemErrorResponse(index=positions[e.index], error=e.error)
+        for e in report.errors
+    )
+    errors.sort(key=lambda e: e.index)
+    return QuestionImportResponse(
+        imported=report.imported, question_ids=question_ids, errors=errors
+    )
+
+
 @router.get("/questions", response_model=List[QuestionResponse])
 async def list_questions(
-    question_repo: QuestionRepoSqlAlchemy = Depends(get_question_repo)
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    difficulty: Optional[Difficulty] = None,
+    question_repo: CachedQuestionRepo = Depends(get_read_question_repo),
 ):
     use_case = ListQuestions(question_repo)
-    return await use_case.execute()
+    after = decode_page_cursor(cursor)
+    not_modified = conditional_response(
+        request,
+        response,
+        await use_case.version(difficulty),
+        "questions",
+        limit,
+        cursor,
+        difficulty,
+    )
+    if not_modified:
+        return not_modified
+    page = await use_case.execute(limit, after, difficulty)
+    set_next_cursor(response, page.next_cursor)
+    return page.items
@@ -1,55 +1,209 @@
-from typing import List
+from typing import Iterable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.api.schemas.trivia import TriviaCreate, TriviaResponse, RankingResponse
+from app.api.etags import conditional_response
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    decode_page_cursor,
+    encode_cursor,
+    set_next_cursor,
+)
+from app.api.schemas.trivia import (
+    TriviaCreate,
+    TriviaResponse,
+    RankingResponse,
+    UserRankResponse,
+    TriviaMembershipUpdate,
+    TriviaMembershipResponse,
+)
 from app.application.use_cases.trivia import (
     CreateTrivia,
     GetTrivia,
     ListUserTrivias,
     ListTrivias,
     GetTriviaRanking,
+    GetUserRank,
+    UpdateTriviaQuestions,
+    UpdateTriviaUsers,
+)
+from app.domain.errors import (
+    InvalidTriviaComposition,
+    QuestionsAlreadyAnswered,
+    UnknownTriviaMembers,
 )
-from app.domain.errors import InvalidTriviaComposition
-from app.infrastructure.db.session import get_db
-from app.infrastructure.repositories.trivia_repo import TriviaRepoSqlAlchemy
-from app.infrastructure.repositories.participation_repo import (
-    ParticipationRepoSqlAlchemy,
+from app.infrastructure.backend import get_read_session, get_session, repositories
+from app.infrastructure.db.session import mark_recent_write
+from app.infrastructure.repositories.cached_trivia_repo import (
+    CachedTriviaRepo,
+    answer_key_cache,
+    composition_cache,
+)
+from app.infrastructure.repositories.ranked_participation_repo import (
+    RankedParticipationRepo,
+    leaderboard_cache,
 )
 
 router = APIRouter()
 
-async def get_trivia_repo(db: AsyncSession = Depends(get_db)):
-    return TriviaRepoSqlAlchemy(db)
+async def get_trivia_repo(db: AsyncSession = Depends(get_session)):
+    return CachedTriviaRepo(
+        repositories.trivia_repo(db), composition_cache, answer_key_cache
+    )
+
+
+async def get_read_trivia_repo(db: AsyncSession = Depends(get_read_session)):
+    return CachedTriviaRepo(
+        repositories.trivia_repo(db), composition_cache, answer_key_cache
+    )
 
 
-async def get_participation_repo(db: AsyncSession = Depends(get_db)):
-    return ParticipationRepoSqlAlchemy(db)
+async def get_participation_repo(db: AsyncSession = Depends(get_read_session)):
+    return RankedParticipationRepo(
+        repositories.participation_repo(db), leaderboard_cache
+    )
+
+
+async def get_create_trivia_use_case(db: AsyncSession = Depends(get_session)):
+    trivia_repo = CachedTriviaRepo(
+        repositories.trivia_repo(db), composition_cache, answer_key_cache
+    )
+    return CreateTrivia(
+        trivia_repo, repositories.question_repo(db), repositories.user_repo(db)
+    )
+
+
+async def get_update_trivia_users_use_case(
+    db: AsyncSession = Depends(get_session),
+    trivia_repo: CachedTriviaRepo = Depends(get_trivia_repo),
+):
+    return UpdateTriviaUsers(
+        trivia_repo, repositories.user_repo(db), repositories.unit_of_work(db)
+    )
+
+
+async def get_update_trivia_questions_use_case(
+    db: AsyncSession = Depends(get_session),
+    trivia_repo: CachedTriviaRepo = Depends(get_trivia_repo),
+):
+    return UpdateTriviaQuestions(
+        trivia_repo,
+        repositories.question_repo(db),
+        repositories.answer_repo(db),
+        repositories.unit_of_work(db),
+    )
+
+
+def _mark_trivia_write(trivia_id: UUID, user_ids: Iterable[UUID] = ()) -> None:
+    # Other clients read these through the replica, so send their reads to the
+    # primary until it catches up. Each member's trivia list changes too.
+    mark_recent_write(
+        [("trivia_id", str(trivia_id))]
+        + [("user_id", str(user_id)) for user_id in user_ids]
+    )
+
+
+def _unknown_members_error(e: UnknownTriviaMembers) -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail={
+            "message": str(e),
+            "missing_question_ids": [str(i) for i in e.missing_question_ids],
+            "missing_user_ids": [str(i) for i in e.missing_user_ids],
+        },
+    )
 
 @router.post("/trivias", response_model=TriviaResponse)
 async def create_trivia(
     trivia_in: TriviaCreate,
-    trivia_repo: TriviaRepoSqlAlchemy = Depends(get_trivia_repo),
+    use_case: CreateTrivia = Depends(get_create_trivia_use_case),
 ):
-    use_case = CreateTrivia(trivia_repo)
     try:
-        return await use_case.execute(
+        trivia = await use_case.execute(
             name=trivia_in.name,
             description=trivia_in.description,
             question_ids=trivia_in.question_ids,
             user_ids=trivia_in.user_ids,
         )
+    except UnknownTriviaMembers as e:
+        raise _unknown_members_error(e)
+    except InvalidTriviaComposition as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    _mark_trivia_write(trivia.id, trivia.user_ids)
+    return trivia
+
+
+@router.patch(
+    "/trivias/{trivia_id}/users", response_model=TriviaMembershipResponse
+)
+async def update_trivia_users(
+    trivia_id: UUID,
+    delta: TriviaMembershipUpdate,
+    use_case: UpdateTriviaUsers = Depends(get_update_trivia_users_use_case),
+    trivia_repo: CachedTriviaRepo = Depends(get_trivia_repo),
+):
+    try:
+        added, removed = await use_case.execute(trivia_id, delta.add, delta.remove)
+    except UnknownTriviaMembers as e:
+        raise _unknown_members_error(e)
+    except InvalidTriviaComposition as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    # Drop the cached composition again now that the change is committed, in
+    # case a concurrent play request re-cached it mid-transaction.
+    trivia_repo.invalidate(trivia_id)
+    _mark_trivia_write(trivia_id, added + removed)
+    return TriviaMembershipResponse(
+        trivia_id=trivia_id, added=added, removed=removed
+    )
+
+
+@router.patch(
+    "/trivias/{trivia_id}/questions", response_model=TriviaMembershipResponse
+)
+async def update_trivia_questions(
+    trivia_id: UUID,
+    delta: TriviaMembershipUpdate,
+    use_case: UpdateTriviaQuestions = Depends(get_update_trivia_questions_use_case),
+    trivia_repo: CachedTriviaRepo = Depends(get_trivia_repo),
+):
+    try:
+        added, removed = await use_case.execute(trivia_id, delta.add, delta.remove)
+    except UnknownTriviaMembers as e:
+        raise _unknown_members_error(e)
     except InvalidTriviaComposition as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except QuestionsAlreadyAnswered as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    trivia_repo.invalidate(trivia_id)
+    _mark_trivia_write(trivia_id)
+    return TriviaMembershipResponse(
+        trivia_id=trivia_id, added=added, removed=removed
+    )
 
 
 @router.get("/trivias/{trivia_id}", response_model=TriviaResponse)
 async def get_trivia(
-    trivia_id: UUID, trivia_repo: TriviaRepoSqlAlchemy = Depends(get_trivia_repo)
+    request: Request,
+    response: Response,
+    trivia_id: UUID,
+    trivia_repo: CachedTriviaRepo = Depends(get_read_trivia_repo),
 ):
     use_case = GetTrivia(trivia_repo)
+    version = await use_case.version(trivia_id)
+    if version is not None:
+        not_modified = conditional_response(
+            request, response, version, "trivia", trivia_id
+        )
+        if not_modified:
+            return not_modified
     trivia = await use_case.execute(trivia_id)
     if not trivia:
         raise HTTPException(status_code=404, detail="Trivia not found")
@@ -58,23 +212,84 @@ async def get_trivia(
 
 @router.get("/users/{user_id}/trivias", response_model=List[TriviaResponse])
 async def list_user_trivias(
-    user_id: UUID, trivia_repo: TriviaRepoSqlAlchemy = Depends(get_trivia_repo)
+    request: Request,
+    response: Response,
+    user_id: UUID,
+    trivia_repo: CachedTriviaRepo = Depends(get_read_trivia_repo),
 ):
     use_case = ListUserTrivias(trivia_repo)
+    version = await use_case.version(user_id)
+    not_modified = conditional_response(
+        request, response, version, "user_trivias", user_id
+    )
+    if not_modified:
+        return not_modified
     return await use_case.execute(user_id)
 
 
 @router.get("/trivias", response_model=List[TriviaResponse])
-async def list_trivias(trivia_repo: TriviaRepoSqlAlchemy = Depends(get_trivia_repo)):
+async def list_trivias(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    trivia_repo: CachedTriviaRepo = Depends(get_read_trivia_repo),
+):
     use_case = ListTrivias(trivia_repo)
-    return await use_case.execute()
+    page = await use_case.execute(limit, decode_page_cursor(cursor))
+    set_next_cursor(response, page.next_cursor)
+    return page.items
 
 
 @router.get("/trivias/{trivia_id}/ranking", response_model=RankingResponse)
 async def get_trivia_ranking(
     trivia_id: UUID,
-    participation_repo: ParticipationRepoSqlAlchemy = Depends(get_participation_repo),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    top: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    participation_repo: RankedParticipationRepo = Depends(get_participation_repo),
 ):
     use_case = GetTriviaRanking(participation_repo)
-    ranking = await use_case.execute(trivia_id)
-    return RankingResponse(trivia_id=trivia_id, ranking=ranking)
+    if top is not None:
+        ranking = await use_case.execute(trivia_id, 0, top)
+        return RankingResponse(trivia_id=trivia_id, ranking=ranking)
+
+    offset = 0
+    if cursor:
+        offset = decode_cursor(cursor).get("offset")
+        if not isinstance(offset, int) or offset < 0:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    ranking = await use_case.execute(trivia_id, offset, limit + 1)
+    next_cursor = None
+    if len(ranking) > limit:
+        ranking = ranking[:limit]
+        next_cursor = encode_cursor({"offset": offset + limit})
+    return RankingResponse(
+        trivia_id=trivia_id, ranking=ranking, next_cursor=next_cursor
+    )
+
+
+@router.get(
+    "/users/{user_id}/trivias/{trivia_id}/rank", response_model=UserRankResponse
+)
+async def get_user_rank(
+    user_id: UUID,
+    trivia_id: UUID,
+    neighbours: int = Query(2, ge=0, le=50),
+    participation_repo: RankedParticipationRepo = Depends(get_participation_repo),
+):
+    use_case = GetUserRank(participation_repo)
+    result = await use_case.execute(trivia_id, user_id, neighbours)
+    if not result:
+        raise HTTPException(status_code=404, detail="Participation not found")
+
+    entry, above, below = result
+    return UserRankResponse(
+        trivia_id=trivia_id,
+        user_id=user_id,
+        rank=entry["rank"],
+        score=entry["score"],
+        finished_at=entry["finished_at"],
+        above=above,
+        below=below,
+    )
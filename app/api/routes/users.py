@@ -1,27 +1,77 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.schemas.user import UserCreate, UserResponse
-from app.application.use_cases.user import CreateUser, ListUsers
-from app.infrastructure.db.session import get_db
-from app.infrastructure.repositories.user_repo import UserRepoSqlAlchemy
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_page_cursor,
+    set_next_cursor,
+)
+from app.api.schemas.user import (
+    UserBulkCreate,
+    UserBulkResponse,
+    UserBulkResult,
+    UserCreate,
+    UserResponse,
+)
+from app.application.ports.user_repo import UserRepo
+from app.application.use_cases.user import CreateUser, ListUsers, ProvisionUsers
+from app.domain.errors import EmailAlreadyRegistered
+from app.infrastructure.backend import get_read_session, get_session, repositories
 
 router = APIRouter()
 
-async def get_user_repo(db: AsyncSession = Depends(get_db)):
-    return UserRepoSqlAlchemy(db)
+async def get_user_repo(db: AsyncSession = Depends(get_session)):
+    return repositories.user_repo(db)
+
+
+async def get_read_user_repo(db: AsyncSession = Depends(get_read_session)):
+    return repositories.user_repo(db)
+
+
+async def get_provision_users_use_case(db: AsyncSession = Depends(get_session)):
+    return ProvisionUsers(repositories.user_repo(db), repositories.unit_of_work(db))
 
 @router.post("/users", response_model=UserResponse)
 async def create_user(
-    user_in: UserCreate, user_repo: UserRepoSqlAlchemy = Depends(get_user_repo)
+    user_in: UserCreate, user_repo: UserRepo = Depends(get_user_repo)
 ):
     use_case = CreateUser(user_repo)
-    return await use_case.execute(name=user_in.name, email=user_in.email)
+    try:
+        return await use_case.execute(name=user_in.name, email=user_in.email)
+    except EmailAlreadyRegistered as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/users/bulk", response_model=UserBulkResponse)
+async def provision_users(
+    users_in: UserBulkCreate,
+    use_case: ProvisionUsers = Depends(get_provision_users_use_case),
+):
+    provisioned = await use_case.execute(
+        [user_in.model_dump() for user_in in users_in.users]
+    )
+    # Repeated emails share one user, which is listed once.
+    return UserBulkResponse(
+        created_ids=list(dict.fromkeys(u.id for u in provisioned if u.created)),
+        existing_ids=list(dict.fromkeys(u.id for u in provisioned if not u.created)),
+        results=[
+            UserBulkResult(id=user.id, email=user.email, created=user.created)
+            for user in provisioned
+        ],
+    )
 
 
 @router.get("/users", response_model=List[UserResponse])
-async def list_users(user_repo: UserRepoSqlAlchemy = Depends(get_user_repo)):
+async def list_users(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_repo: UserRepo = Depends(get_read_user_repo),
+):
     use_case = ListUsers(user_repo)
-    return await use_case.execute()
+    page = await use_case.execute(limit, decode_page_cursor(cursor))
+    set_next_cursor(response, page.next_cursor)
+    return page.items
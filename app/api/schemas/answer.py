@@ -2,6 +2,8 @@ from uuid import UUID
 from typing import Optional
 from pydantic import BaseModel
 
+from app.api.schemas.play import PlayQuestionOption
+
 class AnswerFinishedResponse(BaseModel):
     message: str
     finished: bool
@@ -12,7 +14,7 @@ class AnswerNextQuestionResponse(BaseModel):
     finished: bool
     question_id: UUID
     text: str
-    options: list[dict]
+    options: list[PlayQuestionOption]
 
     class Config:
         from_attributes = True
@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -33,3 +34,14 @@ class QuestionResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ImportItemErrorResponse(BaseModel):
+    index: int
+    error: str
+
+
+class QuestionImportResponse(BaseModel):
+    imported: int
+    question_ids: list[Optional[UUID]]
+    errors: list[ImportItemErrorResponse]
@@ -11,6 +11,17 @@ class TriviaCreate(BaseModel):
     user_ids: list[UUID]
 
 
+class TriviaMembershipUpdate(BaseModel):
+    add: list[UUID] = []
+    remove: list[UUID] = []
+
+
+class TriviaMembershipResponse(BaseModel):
+    trivia_id: UUID
+    added: list[UUID]
+    removed: list[UUID]
+
+
 class TriviaResponse(BaseModel):
     id: UUID
     name: str
@@ -27,8 +38,20 @@ class RankingEntry(BaseModel):
     user_name: str
     score: int
     finished_at: Optional[datetime] = None
+    rank: Optional[int] = None
 
 
 class RankingResponse(BaseModel):
     trivia_id: UUID
     ranking: list[RankingEntry]
+    next_cursor: Optional[str] = None
+
+
+class UserRankResponse(BaseModel):
+    trivia_id: UUID
+    user_id: UUID
+    rank: int
+    score: int
+    finished_at: Optional[datetime] = None
+    above: list[RankingEntry]
+    below: list[RankingEntry]
@@ -1,6 +1,8 @@
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+
+MAX_BULK_USERS = 10000
 
 class UserCreate(BaseModel):
     name: str
@@ -13,3 +15,17 @@ class UserResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UserBulkCreate(BaseModel):
+    users: list[UserCreate] = Field(min_length=1, max_length=MAX_BULK_USERS)
+
+class UserBulkResult(BaseModel):
+    id: UUID
+    email: EmailStr
+    created: bool
+
+class UserBulkResponse(BaseModel):
+    created_ids: list[UUID]
+    existing_ids: list[UUID]
+    results: list[UserBulkResult]
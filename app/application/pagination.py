@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+from uuid import UUID
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Position after the last (created_at, id) pair of a keyset page."""
+
+    created_at: datetime
+    id: UUID
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[PageCursor] = None
@@ -1,4 +1,4 @@
-from typing import Protocol, Optional, List
+from typing import AsyncIterator, Iterable, Protocol, Optional, List, Set
 from uuid import UUID
 
 from app.domain.entities.answer import Answer
@@ -9,12 +9,27 @@ class AnswerRepo(Protocol):
         """Saves an answer to the repository."""
         ...
 
-    async def get_by_participation(self, participation_id: UUID) -> List[Answer]:
-        """Retrieves all answers for a participation."""
+    async def add(self, answer: Answer) -> bool:
+        """Writes an answer in the current unit of work unless it conflicts with
+        a stored one for the same question or idempotency key. Returns whether
+        it was written.
+
+        Raises TriviaQuestionRemoved if the question is no longer in the trivia.
+        """
         ...
 
-    async def get_by_participation_and_question(
-        self, participation_id: UUID, question_id: UUID
+    async def get_by_idempotency_key(
+        self, participation_id: UUID, idempotency_key: str
     ) -> Optional[Answer]:
-        """Retrieves an answer for a specific question in a participation."""
+        """Retrieves the answer a participation submitted with an idempotency key."""
+        ...
+
+    async def get_answered_question_ids(
+        self, trivia_id: UUID, question_ids: Iterable[UUID]
+    ) -> Set[UUID]:
+        """Returns which of the given questions have answers in a trivia."""
+        ...
+
+    def stream_all(self, batch_size: int) -> AsyncIterator[List[Answer]]:
+        """Yields every answer in batches, oldest first."""
         ...
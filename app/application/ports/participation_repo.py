@@ -16,10 +16,34 @@ class ParticipationRepo(Protocol):
         """Retrieves a participation by trivia and user."""
         ...
 
-    async def update(self, participation: Participation) -> Participation:
-        """Updates an existing participation."""
+    async def advance(
+        self,
+        participation_id: UUID,
+        points: int,
+        expected_answered_count: int,
+        finished_at: Optional[datetime] = None,
+    ) -> Optional[Participation]:
+        """Atomically adds points, moves the cursor forward and optionally finishes.
+
+        Returns the new state, or None when the participation is finished or
+        its cursor no longer matches the expected answered count.
+        """
+        ...
+
+    async def get_ranking_page(
+        self, trivia_id: UUID, offset: int, limit: int
+    ) -> list[dict]:
+        """Retrieves up to `limit` ranking entries after the first `offset` ranks."""
         ...
 
-    async def get_ranking(self, trivia_id: UUID) -> list[dict]:
-        """Retrieves the ranking for a trivia."""
+    async def get_ranking_around(
+        self, trivia_id: UUID, user_id: UUID, neighbours: int
+    ) -> list[dict]:
+        """Retrieves a participant's ranking entry with its neighbours on each side."""
+        ...
+
+    async def get_ranking_entry(
+        self, trivia_id: UUID, user_id: UUID
+    ) -> Optional[dict]:
+        """Retrieves the ranking entry of a single participant of a trivia."""
         ...
@@ -1,7 +1,10 @@
-from typing import List, Protocol, Optional
+from typing import AsyncIterator, Iterable, List, Protocol, Optional, Set
 from uuid import UUID
 
+from app.application.pagination import Page, PageCursor
+from app.application.versions import Version
 from app.domain.entities.question import Question
+from app.domain.value_objects.difficulty import Difficulty
 
 
 class QuestionRepo(Protocol):
@@ -13,6 +16,31 @@ class QuestionRepo(Protocol):
         """Retrieves all questions from the repository."""
         ...
 
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        difficulty: Optional[Difficulty] = None,
+    ) -> Page[Question]:
+        """Retrieves the questions after a cursor, oldest first."""
+        ...
+
+    async def save_many(self, questions: List[Question]) -> None:
+        """Stages new questions to be written when the unit of work commits."""
+        ...
+
+    async def get_version(self, difficulty: Optional[Difficulty] = None) -> Version:
+        """Returns a change marker for the questions, optionally of one difficulty."""
+        ...
+
+    def stream_all(self, batch_size: int) -> AsyncIterator[List[Question]]:
+        """Yields every question in batches, oldest first."""
+        ...
+
+    async def get_existing_ids(self, question_ids: Iterable[UUID]) -> Set[UUID]:
+        """Returns the subset of the given IDs that belong to stored questions."""
+        ...
+
     async def get_by_id(self, question_id: UUID) -> Optional[Question]:
         """Retrieves a question by ID."""
         ...
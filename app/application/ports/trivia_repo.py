@@ -1,7 +1,12 @@
-from typing import List, Protocol, Optional
+from datetime import datetime
+from typing import AsyncIterator, List, Protocol, Optional
 from uuid import UUID
 
+from app.application.pagination import Page, PageCursor
+from app.application.versions import Version
 from app.domain.entities.trivia import Trivia
+from app.domain.services.answer_key import AnswerKey
+from app.domain.value_objects.trivia_composition import TriviaComposition
 
 class TriviaRepo(Protocol):
     async def save(self, trivia: Trivia) -> Trivia:
@@ -12,10 +17,91 @@ class TriviaRepo(Protocol):
         """Retrieves a trivia by ID."""
         ...
 
+    async def get_composition(self, trivia_id: UUID) -> Optional[TriviaComposition]:
+        """Retrieves the ordered question IDs and member IDs of a trivia."""
+        ...
+
+    async def get_question_ids(self, trivia_id: UUID) -> List[UUID]:
+        """Retrieves the ordered question IDs of a trivia without loading it."""
+        ...
+
+    async def get_question_id_at(
+        self, trivia_id: UUID, position: int
+    ) -> Optional[UUID]:
+        """Retrieves the ID of the question at a position of a trivia."""
+        ...
+
+    async def get_question_position(
+        self, trivia_id: UUID, question_id: UUID
+    ) -> Optional[int]:
+        """Retrieves the position of a question within a trivia."""
+        ...
+
+    async def get_answer_key(self, trivia_id: UUID) -> AnswerKey:
+        """Retrieves the option ID index used to grade a trivia's answers."""
+        ...
+
     async def get_by_user_id(self, user_id: UUID) -> List[Trivia]:
         """Retrieves all trivias assigned to a user."""
         ...
 
+    async def get_version(self, trivia_id: UUID) -> Optional[Version]:
+        """Returns the trivia's change marker, or None if it does not exist."""
+        ...
+
+    async def get_user_trivias_version(self, user_id: UUID) -> Version:
+        """Returns a change marker for the trivias assigned to a user."""
+        ...
+
     async def get_all(self) -> List[Trivia]:
         """Retrieves all trivias."""
         ...
+
+    async def get_page(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[Trivia]:
+        """Retrieves the trivias after a cursor, oldest first."""
+        ...
+
+    def stream_all(self, batch_size: int) -> AsyncIterator[List[Trivia]]:
+        """Yields every trivia in batches, oldest first.
+
+        A batch holds at most batch_size trivias and, unless it is a single
+        trivia, at most batch_size member ids.
+        """
+        ...
+
+    async def get_updated_at(self, trivia_id: UUID) -> Optional[datetime]:
+        """Returns the stamp every membership change bumps, or None if the
+        trivia does not exist. Caching implementations also drop entries
+        older than the stamp."""
+        ...
+
+    async def touch(self, trivia_id: UUID) -> bool:
+        """Bumps the trivia's updated_at, locking it until the unit of work ends.
+
+        Returns False if the trivia does not exist.
+        """
+        ...
+
+    async def add_users(self, trivia_id: UUID, user_ids: List[UUID]) -> List[UUID]:
+        """Stages new user members and returns the ones that were not members."""
+        ...
+
+    async def remove_users(
+        self, trivia_id: UUID, user_ids: List[UUID]
+    ) -> List[UUID]:
+        """Stages member removals and returns the ones that were members."""
+        ...
+
+    async def add_questions(
+        self, trivia_id: UUID, question_ids: List[UUID]
+    ) -> List[UUID]:
+        """Appends questions after the last position, skipping existing ones."""
+        ...
+
+    async def remove_questions(
+        self, trivia_id: UUID, question_ids: List[UUID]
+    ) -> List[UUID]:
+        """Removes questions and closes the gaps they leave in the positions."""
+        ...
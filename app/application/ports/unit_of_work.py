@@ -0,0 +1,16 @@
+from typing import Callable, Protocol
+
+
+class UnitOfWork(Protocol):
+    async def commit(self) -> None:
+        """Commits every change staged by the repositories sharing this unit."""
+        ...
+
+    async def rollback(self) -> None:
+        """Discards every change staged by the repositories sharing this unit."""
+        ...
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Runs ``callback`` once the next commit succeeds. A rollback or a
+        failed commit discards it."""
+        ...
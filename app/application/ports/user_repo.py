@@ -1,6 +1,7 @@
-from typing import List, Protocol
+from typing import Iterable, List, Optional, Protocol, Set, Tuple
 from uuid import UUID
 
+from app.application.pagination import Page, PageCursor
 from app.domain.entities.user import User
 
 class UserRepo(Protocol):
@@ -8,6 +9,25 @@ class UserRepo(Protocol):
         """Saves a user to the repository."""
         ...
 
+    async def save_many(self, users: List[User]) -> List[Tuple[UUID, bool]]:
+        """Stages users whose email is not registered yet.
+
+        Returns the stored ID of every input user, in input order, with a flag
+        telling whether it was created now or already existed. Repeated emails
+        resolve to their first occurrence and share its result.
+        """
+        ...
+
+    async def get_existing_ids(self, user_ids: Iterable[UUID]) -> Set[UUID]:
+        """Returns the subset of the given IDs that belong to stored users."""
+        ...
+
     async def get_all(self) -> List[User]:
         """Retrieves all users from the repository."""
         ...
+
+    async def get_page(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[User]:
+        """Retrieves the users after a cursor, oldest first."""
+        ...
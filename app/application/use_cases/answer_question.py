@@ -3,14 +3,14 @@ from uuid import uuid4, UUID
 from datetime import datetime
 
 from app.domain.entities.answer import Answer
-from app.domain.entities.question import Question
 from app.domain.entities.participation import Participation
-from app.domain.services.scoring import score_for
-from app.domain.value_objects.participation_status import ParticipationStatus
+from app.domain.entities.question import Question
+from app.domain.errors import IdempotencyKeyReused, TriviaQuestionRemoved
 from app.application.ports.answer_repo import AnswerRepo
 from app.application.ports.participation_repo import ParticipationRepo
 from app.application.ports.question_repo import QuestionRepo
 from app.application.ports.trivia_repo import TriviaRepo
+from app.application.ports.unit_of_work import UnitOfWork
 
 class AnswerQuestion:
     def __init__(
@@ -19,11 +19,13 @@ class AnswerQuestion:
         participation_repo: ParticipationRepo,
         question_repo: QuestionRepo,
         trivia_repo: TriviaRepo,
+        unit_of_work: UnitOfWork,
     ):
         self.answer_repo = answer_repo
         self.participation_repo = participation_repo
         self.question_repo = question_repo
         self.trivia_repo = trivia_repo
+        self.unit_of_work = unit_of_work
 
     async def execute(
         self,
@@ -31,7 +33,12 @@ class AnswerQuestion:
         trivia_id: UUID,
         question_id: UUID,
         option_id: UUID,
-    ) -> tuple[Optional[Question], Optional[int], bool, bool]:
+        idempotency_key: Optional[str] = None,
+    ) -> tuple[Optional[Question], Optional[int], bool, bool, bool]:
+        """Grades an answer and returns the next question, the final score,
+        whether the trivia finished, whether the answer was correct and whether
+        this was a replay of an answer already stored under ``idempotency_key``.
+        """
         participation = await self.participation_repo.get_by_trivia_and_user(
             trivia_id, user_id
         )
@@ -39,26 +46,35 @@ class AnswerQuestion:
             raise ValueError("Participation not found")
 
         if not participation.can_answer():
-            raise ValueError("Participation is already finished")
-
-        existing_answer = await self.answer_repo.get_by_participation_and_question(
-            participation.id, question_id
-        )
-        if existing_answer:
-            raise ValueError("Question already answered")
-
-        question = await self.question_repo.get_by_id(question_id)
-        if not question:
-            raise ValueError("Question not found")
+            return await self._replay(
+                participation,
+                question_id,
+                option_id,
+                idempotency_key,
+                "Participation is already finished",
+            )
 
-        selected_option = next(
-            (opt for opt in question.options if opt.id == option_id), None
+        current_question_id = await self.trivia_repo.get_question_id_at(
+            trivia_id, participation.answered_count
         )
-        if not selected_option:
-            raise ValueError("Option not found")
+        if current_question_id != question_id:
+            position = await self.trivia_repo.get_question_position(
+                trivia_id, question_id
+            )
+            if position is None:
+                raise ValueError("Question not found")
+            if position < participation.answered_count:
+                return await self._replay(
+                    participation,
+                    question_id,
+                    option_id,
+                    idempotency_key,
+                    "Question already answered",
+                )
+            raise ValueError("Question is not the current one")
 
-        is_correct = selected_option.is_correct
-        score_awarded = score_for(question.difficulty) if is_correct else 0
+        answer_key = await self.trivia_repo.get_answer_key(trivia_id)
+        is_correct, score_awarded = answer_key.grade(question_id, option_id)
 
         answer = Answer(
             id=uuid4(),
@@ -69,30 +85,95 @@ class AnswerQuestion:
             is_correct=is_correct,
             score_awarded=score_awarded,
             answered_at=datetime.now(),
+            idempotency_key=idempotency_key,
         )
-        await self.answer_repo.save(answer)
+        expected_answered_count = participation.answered_count
+        participation.record_answer(score_awarded)
 
-        participation.add_score(score_awarded)
-
-        trivia = await self.trivia_repo.get_by_id(trivia_id)
-        if not trivia:
-            raise ValueError("Trivia not found")
-
-        answered_questions = await self.answer_repo.get_by_participation(
-            participation.id
+        next_question_id = await self.trivia_repo.get_question_id_at(
+            trivia_id, participation.answered_count
         )
-        answered_question_ids = {ans.question_id for ans in answered_questions}
+        if not next_question_id:
+            # Finishing is final, so check that no question was appended since
+            # the composition was cached before trusting it.
+            if await self.trivia_repo.get_updated_at(trivia_id) is None:
+                raise ValueError("Trivia not found")
+            next_question_id = await self.trivia_repo.get_question_id_at(
+                trivia_id, participation.answered_count
+            )
+        if not next_question_id:
+            participation.finish(datetime.now())
 
-        next_question_id = next(
-            (qid for qid in trivia.question_ids if qid not in answered_question_ids),
-            None,
+        # The conditional update settles concurrent answers before the insert,
+        # so only the request that moved the cursor writes its answer.
+        advanced = await self.participation_repo.advance(
+            participation.id,
+            score_awarded,
+            expected_answered_count,
+            participation.finished_at,
         )
+        # The insert skips conflicts rather than failing, which also catches a
+        # reused idempotency key without aborting the transaction.
+        try:
+            added = bool(advanced) and await self.answer_repo.add(answer)
+        except TriviaQuestionRemoved:
+            # Removals are rare, so answers do not lock against them; the
+            # composition this one was checked against is refreshed instead.
+            await self.unit_of_work.rollback()
+            await self.trivia_repo.get_updated_at(trivia_id)
+            raise
+        if not added:
+            await self.unit_of_work.rollback()
+            participation = await self.participation_repo.get_by_trivia_and_user(
+                trivia_id, user_id
+            )
+            return await self._replay(
+                participation,
+                question_id,
+                option_id,
+                idempotency_key,
+                "Question already answered",
+            )
+
+        await self.unit_of_work.commit()
 
         if next_question_id:
-            await self.participation_repo.update(participation)
             next_question = await self.question_repo.get_by_id(next_question_id)
-            return next_question, None, False, is_correct
-        else:
-            participation.finish(datetime.now())
-            await self.participation_repo.update(participation)
-            return None, participation.score_total, True, is_correct
+            return next_question, None, False, is_correct, False
+
+        return None, advanced.score_total, True, is_correct, False
+
+    async def _replay(
+        self,
+        participation: Participation,
+        question_id: UUID,
+        option_id: UUID,
+        idempotency_key: Optional[str],
+        error: str,
+    ) -> tuple[Optional[Question], Optional[int], bool, bool, bool]:
+        """Rebuilds the result of the answer stored under ``idempotency_key``,
+        so a retried request gets the response it missed. Raises ``error``
+        when nothing was stored under the key."""
+        answer = None
+        if idempotency_key is not None:
+            answer = await self.answer_repo.get_by_idempotency_key(
+                participation.id, idempotency_key
+            )
+        if answer is None:
+            raise ValueError(error)
+        if (answer.question_id, answer.option_id) != (question_id, option_id):
+            raise IdempotencyKeyReused(idempotency_key)
+
+        trivia_id = participation.trivia_id
+        position = await self.trivia_repo.get_question_position(trivia_id, question_id)
+        # The question may have left the trivia since it was answered.
+        if position is None:
+            raise ValueError("Question not found")
+        next_question_id = await self.trivia_repo.get_question_id_at(
+            trivia_id, position + 1
+        )
+        if next_question_id:
+            next_question = await self.question_repo.get_by_id(next_question_id)
+            return next_question, None, False, answer.is_correct, True
+
+        return None, participation.score_total, True, answer.is_correct, True
@@ -0,0 +1,32 @@
+from typing import AsyncIterator, List
+
+from app.domain.entities.answer import Answer
+from app.domain.entities.question import Question
+from app.domain.entities.trivia import Trivia
+from app.application.ports.answer_repo import AnswerRepo
+from app.application.ports.question_repo import QuestionRepo
+from app.application.ports.trivia_repo import TriviaRepo
+
+
+class ExportQuestions:
+    def __init__(self, question_repo: QuestionRepo):
+        self.question_repo = question_repo
+
+    def execute(self, batch_size: int) -> AsyncIterator[List[Question]]:
+        return self.question_repo.stream_all(batch_size)
+
+
+class ExportTrivias:
+    def __init__(self, trivia_repo: TriviaRepo):
+        self.trivia_repo = trivia_repo
+
+    def execute(self, batch_size: int) -> AsyncIterator[List[Trivia]]:
+        return self.trivia_repo.stream_all(batch_size)
+
+
+class ExportAnswers:
+    def __init__(self, answer_repo: AnswerRepo):
+        self.answer_repo = answer_repo
+
+    def execute(self, batch_size: int) -> AsyncIterator[List[Answer]]:
+        return self.answer_repo.stream_all(batch_size)
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from app.domain.entities.participation import Participation
 from app.domain.entities.question import Question
+from app.domain.errors import TriviaNotAssigned
 from app.domain.value_objects.participation_status import ParticipationStatus
 from app.application.ports.participation_repo import ParticipationRepo
 from app.application.ports.question_repo import QuestionRepo
@@ -27,10 +28,18 @@ class PlayTrivia:
             trivia_id, user_id
         )
 
-        trivia = await self.trivia_repo.get_by_id(trivia_id)
-        if not trivia:
+        # The composition may come from a process-local cache; reading the stamp
+        # first drops it if another process changed the trivia meanwhile.
+        if await self.trivia_repo.get_updated_at(trivia_id) is None:
             raise ValueError("Trivia not found")
 
+        composition = await self.trivia_repo.get_composition(trivia_id)
+        if not composition:
+            raise ValueError("Trivia not found")
+
+        if not composition.has_user(user_id):
+            raise TriviaNotAssigned("User is not assigned to this trivia")
+
         is_new = False
         if not participation:
             is_new = True
@@ -42,16 +51,23 @@ class PlayTrivia:
                 score_total=0,
                 started_at=datetime.now(),
                 finished_at=None,
+                answered_count=0,
             )
             participation = await self.participation_repo.save(participation)
 
         if participation.status == ParticipationStatus.FINISHED:
-            return None, participation.id, trivia.name, False, participation.score_total
+            return (
+                None,
+                participation.id,
+                composition.name,
+                False,
+                participation.score_total,
+            )
 
-        if not trivia.question_ids:
-            return None, participation.id, trivia.name, is_new, None
+        next_question_id = composition.question_id_at(participation.answered_count)
+        if not next_question_id:
+            return None, participation.id, composition.name, is_new, None
 
-        first_question_id = trivia.question_ids[0]
-        question = await self.question_repo.get_by_id(first_question_id)
+        question = await self.question_repo.get_by_id(next_question_id)
 
-        return question, participation.id, trivia.name, is_new, None
+        return question, participation.id, composition.name, is_new, None
@@ -1,8 +1,16 @@
-from typing import List
-from uuid import uuid4
+from dataclasses import dataclass, field
+from typing import List, Optional
+from uuid import UUID, uuid4
 
 from app.domain.entities.question import Question, QuestionOption
+from app.domain.errors import InvalidQuestionOptions
+from app.domain.value_objects.difficulty import Difficulty
+from app.application.pagination import Page, PageCursor
 from app.application.ports.question_repo import QuestionRepo
+from app.application.ports.unit_of_work import UnitOfWork
+from app.application.versions import Version
+
+IMPORT_BATCH_SIZE = 1000
 
 
 class CreateQuestion:
@@ -28,5 +36,77 @@ class ListQuestions:
     def __init__(self, question_repo: QuestionRepo):
         self.question_repo = question_repo
 
-    async def execute(self) -> List[Question]:
-        return await self.question_repo.get_all()
+    async def execute(
+        self,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        difficulty: Optional[Difficulty] = None,
+    ) -> Page[Question]:
+        return await self.question_repo.get_page(limit, after, difficulty)
+
+    async def version(self, difficulty: Optional[Difficulty] = None) -> Version:
+        return await self.question_repo.get_version(difficulty)
+
+
+@dataclass(frozen=True)
+class ImportItemError:
+    index: int
+    error: str
+
+
+@dataclass
+class ImportReport:
+    """Outcome of a bulk import, with IDs aligned to the input items."""
+
+    question_ids: List[Optional[UUID]] = field(default_factory=list)
+    errors: List[ImportItemError] = field(default_factory=list)
+
+    @property
+    def imported(self) -> int:
+        return sum(1 for question_id in self.question_ids if question_id is not None)
+
+
+class ImportQuestions:
+    def __init__(
+        self,
+        question_repo: QuestionRepo,
+        unit_of_work: UnitOfWork,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ):
+        self.question_repo = question_repo
+        self.unit_of_work = unit_of_work
+        self.batch_size = batch_size
+
+    async def execute(self, items: List[dict]) -> ImportReport:
+        report = ImportReport()
+        batch: List[Question] = []
+        for index, item in enumerate(items):
+            try:
+                question = Question(
+                    id=uuid4(),
+                    text=item["text"],
+                    difficulty=item["difficulty"],
+                    options=[
+                        QuestionOption(
+                            id=uuid4(), text=opt["text"], is_correct=opt["is_correct"]
+                        )
+                        for opt in item["options"]
+                    ],
+                )
+            except InvalidQuestionOptions as e:
+                report.question_ids.append(None)
+                report.errors.append(ImportItemError(index=index, error=str(e)))
+                continue
+            report.question_ids.append(question.id)
+            batch.append(question)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        await self._flush(batch)
+        return report
+
+    async def _flush(self, batch: List[Question]) -> None:
+        if not batch:
+            return
+        await self.question_repo.save_many(batch)
+        await self.unit_of_work.commit()
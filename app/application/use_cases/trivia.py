@@ -1,13 +1,31 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import uuid4, UUID
 
 from app.domain.entities.trivia import Trivia
+from app.domain.errors import (
+    InvalidTriviaComposition,
+    QuestionsAlreadyAnswered,
+    UnknownTriviaMembers,
+)
+from app.application.pagination import Page, PageCursor
 from app.application.ports.trivia_repo import TriviaRepo
+from app.application.ports.answer_repo import AnswerRepo
 from app.application.ports.participation_repo import ParticipationRepo
+from app.application.ports.question_repo import QuestionRepo
+from app.application.ports.unit_of_work import UnitOfWork
+from app.application.ports.user_repo import UserRepo
+from app.application.versions import Version
 
 class CreateTrivia:
-    def __init__(self, trivia_repo: TriviaRepo):
+    def __init__(
+        self,
+        trivia_repo: TriviaRepo,
+        question_repo: QuestionRepo,
+        user_repo: UserRepo,
+    ):
         self.trivia_repo = trivia_repo
+        self.question_repo = question_repo
+        self.user_repo = user_repo
 
     async def execute(
         self,
@@ -23,6 +41,12 @@ class CreateTrivia:
             question_ids=question_ids,
             user_ids=user_ids,
         )
+        known_questions = await self.question_repo.get_existing_ids(question_ids)
+        known_users = await self.user_repo.get_existing_ids(user_ids)
+        missing_questions = [qid for qid in question_ids if qid not in known_questions]
+        missing_users = [uid for uid in user_ids if uid not in known_users]
+        if missing_questions or missing_users:
+            raise UnknownTriviaMembers(missing_questions, missing_users)
         return await self.trivia_repo.save(trivia)
 
 
@@ -33,6 +57,9 @@ class GetTrivia:
     async def execute(self, trivia_id: UUID) -> Optional[Trivia]:
         return await self.trivia_repo.get_by_id(trivia_id)
 
+    async def version(self, trivia_id: UUID) -> Optional[Version]:
+        return await self.trivia_repo.get_version(trivia_id)
+
 
 class ListUserTrivias:
     def __init__(self, trivia_repo: TriviaRepo):
@@ -41,18 +68,132 @@ class ListUserTrivias:
     async def execute(self, user_id: UUID) -> List[Trivia]:
         return await self.trivia_repo.get_by_user_id(user_id)
 
+    async def version(self, user_id: UUID) -> Version:
+        return await self.trivia_repo.get_user_trivias_version(user_id)
+
 
 class ListTrivias:
     def __init__(self, trivia_repo: TriviaRepo):
         self.trivia_repo = trivia_repo
 
-    async def execute(self) -> List[Trivia]:
-        return await self.trivia_repo.get_all()
+    async def execute(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[Trivia]:
+        return await self.trivia_repo.get_page(limit, after)
 
 
 class GetTriviaRanking:
     def __init__(self, participation_repo: ParticipationRepo):
         self.participation_repo = participation_repo
 
-    async def execute(self, trivia_id: UUID) -> list[dict]:
-        return await self.participation_repo.get_ranking(trivia_id)
+    async def execute(self, trivia_id: UUID, offset: int, limit: int) -> list[dict]:
+        return await self.participation_repo.get_ranking_page(
+            trivia_id, offset, limit
+        )
+
+
+class GetUserRank:
+    def __init__(self, participation_repo: ParticipationRepo):
+        self.participation_repo = participation_repo
+
+    async def execute(
+        self, trivia_id: UUID, user_id: UUID, neighbours: int
+    ) -> Optional[tuple[dict, list[dict], list[dict]]]:
+        entries = await self.participation_repo.get_ranking_around(
+            trivia_id, user_id, neighbours
+        )
+        position = next(
+            (i for i, entry in enumerate(entries) if entry["user_id"] == user_id),
+            None,
+        )
+        if position is None:
+            return None
+        return entries[position], entries[:position], entries[position + 1 :]
+
+
+def _membership_delta(
+    add: List[UUID], remove: List[UUID]
+) -> Tuple[List[UUID], List[UUID]]:
+    add = list(dict.fromkeys(add))
+    remove = list(dict.fromkeys(remove))
+    overlap = set(add) & set(remove)
+    if overlap:
+        raise InvalidTriviaComposition(
+            "Ids cannot be both added and removed: "
+            + ", ".join(str(i) for i in add if i in overlap)
+        )
+    return add, remove
+
+
+class UpdateTriviaUsers:
+    def __init__(
+        self, trivia_repo: TriviaRepo, user_repo: UserRepo, unit_of_work: UnitOfWork
+    ):
+        self.trivia_repo = trivia_repo
+        self.user_repo = user_repo
+        self.unit_of_work = unit_of_work
+
+    async def execute(
+        self, trivia_id: UUID, add: List[UUID], remove: List[UUID]
+    ) -> Tuple[List[UUID], List[UUID]]:
+        add, remove = _membership_delta(add, remove)
+        if not await self.trivia_repo.touch(trivia_id):
+            await self.unit_of_work.rollback()
+            raise ValueError("Trivia not found")
+
+        known = await self.user_repo.get_existing_ids(add)
+        missing = [user_id for user_id in add if user_id not in known]
+        if missing:
+            await self.unit_of_work.rollback()
+            raise UnknownTriviaMembers(missing_user_ids=missing)
+
+        removed = await self.trivia_repo.remove_users(trivia_id, remove)
+        added = await self.trivia_repo.add_users(trivia_id, add)
+        await self.unit_of_work.commit()
+        return added, removed
+
+
+class UpdateTriviaQuestions:
+    def __init__(
+        self,
+        trivia_repo: TriviaRepo,
+        question_repo: QuestionRepo,
+        answer_repo: AnswerRepo,
+        unit_of_work: UnitOfWork,
+    ):
+        self.trivia_repo = trivia_repo
+        self.question_repo = question_repo
+        self.answer_repo = answer_repo
+        self.unit_of_work = unit_of_work
+
+    async def execute(
+        self, trivia_id: UUID, add: List[UUID], remove: List[UUID]
+    ) -> Tuple[List[UUID], List[UUID]]:
+        add, remove = _membership_delta(add, remove)
+        if not await self.trivia_repo.touch(trivia_id):
+            await self.unit_of_work.rollback()
+            raise ValueError("Trivia not found")
+
+        known = await self.question_repo.get_existing_ids(add)
+        missing = [question_id for question_id in add if question_id not in known]
+        if missing:
+            await self.unit_of_work.rollback()
+            raise UnknownTriviaMembers(missing_question_ids=missing)
+
+        # Positions are the participants' cursor; only questions nobody has
+        # reached yet can be taken out without skipping or replaying one.
+        answered = await self.answer_repo.get_answered_question_ids(trivia_id, remove)
+        if answered:
+            await self.unit_of_work.rollback()
+            raise QuestionsAlreadyAnswered(
+                [question_id for question_id in remove if question_id in answered]
+            )
+
+        try:
+            removed = await self.trivia_repo.remove_questions(trivia_id, remove)
+        except QuestionsAlreadyAnswered:
+            await self.unit_of_work.rollback()
+            raise
+        added = await self.trivia_repo.add_questions(trivia_id, add)
+        await self.unit_of_work.commit()
+        return added, removed
@@ -1,9 +1,14 @@
-from typing import List
-from uuid import uuid4
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 
 from app.domain.entities.user import User
+from app.application.pagination import Page, PageCursor
+from app.application.ports.unit_of_work import UnitOfWork
 from app.application.ports.user_repo import UserRepo
 
+PROVISION_BATCH_SIZE = 1000
+
 class CreateUser:
     def __init__(self, user_repo: UserRepo):
         self.user_repo = user_repo
@@ -17,5 +22,53 @@ class ListUsers:
     def __init__(self, user_repo: UserRepo):
         self.user_repo = user_repo
 
-    async def execute(self) -> List[User]:
-        return await self.user_repo.get_all()
+    async def execute(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[User]:
+        return await self.user_repo.get_page(limit, after)
+
+
+@dataclass(frozen=True)
+class ProvisionedUser:
+    id: UUID
+    email: str
+    created: bool
+
+
+class ProvisionUsers:
+    def __init__(
+        self,
+        user_repo: UserRepo,
+        unit_of_work: UnitOfWork,
+        batch_size: int = PROVISION_BATCH_SIZE,
+    ):
+        self.user_repo = user_repo
+        self.unit_of_work = unit_of_work
+        self.batch_size = batch_size
+
+    async def execute(self, users: List[dict]) -> List[ProvisionedUser]:
+        # Repeated emails in one request resolve to their first occurrence.
+        unique: Dict[str, User] = {}
+        for data in users:
+            if data["email"] not in unique:
+                unique[data["email"]] = User(
+                    id=uuid4(), name=data["name"], email=data["email"]
+                )
+
+        stored: Dict[str, Tuple[UUID, bool]] = {}
+        pending = list(unique.values())
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            results = await self.user_repo.save_many(batch)
+            emails = (user.email for user in batch)
+            stored.update(zip(emails, results, strict=True))
+        await self.unit_of_work.commit()
+
+        # Repeats of an email report the result of the user they resolved to.
+        provisioned = []
+        for data in users:
+            user_id, created = stored[data["email"]]
+            provisioned.append(
+                ProvisionedUser(id=user_id, email=data["email"], created=created)
+            )
+        return provisioned
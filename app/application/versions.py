@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Version:
+    """Change marker for a resource or collection, read without loading it.
+
+    Counting rows as well as taking the latest ``updated_at`` catches rows
+    committed out of timestamp order and rows that were removed. Collections
+    that keep a write counter report it as ``count`` instead.
+    """
+
+    count: int
+    updated_at: Optional[datetime]
@@ -13,3 +13,4 @@ class Answer:
     is_correct: bool
     score_awarded: int
     answered_at: Optional[datetime]
+    idempotency_key: Optional[str] = None
@@ -15,6 +15,7 @@ class Participation:
     score_total: int
     started_at: Optional[datetime]
     finished_at: Optional[datetime]
+    answered_count: int = 0
 
     def can_answer(self) -> bool:
         return self.status != ParticipationStatus.FINISHED
@@ -24,6 +25,10 @@ class Participation:
             raise InvalidScore("Points cannot be negative")
         self.score_total += points
 
+    def record_answer(self, points: int):
+        self.add_score(points)
+        self.answered_count += 1
+
     def finish(self, at: datetime):
         if self.status == ParticipationStatus.FINISHED:
             raise ParticipationFinished("Participation is already finished")
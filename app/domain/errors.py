@@ -14,6 +14,24 @@ class InvalidTriviaComposition(DomainError):
     """Raised when trivia composition is invalid (e.g. empty name, duplicate ids)."""
     pass
 
+class UnknownTriviaMembers(InvalidTriviaComposition):
+    """Raised when a trivia references questions or users that do not exist."""
+
+    def __init__(self, missing_question_ids=(), missing_user_ids=()):
+        self.missing_question_ids = list(missing_question_ids)
+        self.missing_user_ids = list(missing_user_ids)
+        parts = []
+        if self.missing_question_ids:
+            parts.append(
+                "unknown question ids: "
+                + ", ".join(str(i) for i in self.missing_question_ids)
+            )
+        if self.missing_user_ids:
+            parts.append(
+                "unknown user ids: " + ", ".join(str(i) for i in self.missing_user_ids)
+            )
+        super().__init__("Trivia references " + "; ".join(parts))
+
 class ParticipationFinished(DomainError):
     """Raised when trying to perform an action on a finished participation."""
     pass
@@ -21,3 +39,34 @@ class ParticipationFinished(DomainError):
 class InvalidScore(DomainError):
     """Raised when a score is invalid."""
     pass
+
+class TriviaNotAssigned(DomainError):
+    """Raised when a user tries to play a trivia they are not assigned to."""
+    pass
+
+class EmailAlreadyRegistered(DomainError):
+    """Raised when creating a user with an email that is already taken."""
+    pass
+
+class QuestionsAlreadyAnswered(DomainError):
+    """Raised when removing trivia questions that participants already answered."""
+
+    def __init__(self, question_ids):
+        self.question_ids = list(question_ids)
+        super().__init__(
+            "Questions already answered: "
+            + ", ".join(str(i) for i in self.question_ids)
+        )
+
+class TriviaQuestionRemoved(DomainError):
+    """Raised when a question is removed from a trivia while it is being answered."""
+    pass
+
+class IdempotencyKeyReused(DomainError):
+    """Raised when an idempotency key is sent again with a different answer."""
+
+    def __init__(self, idempotency_key: str):
+        self.idempotency_key = idempotency_key
+        super().__init__(
+            f"Idempotency key {idempotency_key!r} was already used for another answer"
+        )
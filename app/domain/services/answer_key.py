@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from app.domain.services.scoring import score_for
+from app.domain.value_objects.difficulty import Difficulty
+
+@dataclass(frozen=True)
+class AnswerKeyEntry:
+    question_id: UUID
+    is_correct: bool
+    difficulty: Difficulty
+
+
+class AnswerKey:
+    """Grades answers of a trivia from an option ID index."""
+
+    def __init__(self, entries: dict[UUID, AnswerKeyEntry]):
+        self._entries = entries
+        self._points = {
+            option_id: score_for(entry.difficulty) if entry.is_correct else 0
+            for option_id, entry in entries.items()
+        }
+
+    def grade(self, question_id: UUID, option_id: UUID) -> tuple[bool, int]:
+        entry = self._entries.get(option_id)
+        if entry is None or entry.question_id != question_id:
+            raise ValueError("Option not found")
+        return entry.is_correct, self._points[option_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,108 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+RankingKey = tuple[int, int, float, UUID]
+
+
+def ranking_key(
+    user_id: UUID, score: int, finished_at: Optional[datetime]
+) -> RankingKey:
+    """Orders by score descending, then earliest finish, unfinished last."""
+    if finished_at is None:
+        return (-score, 1, 0.0, user_id)
+    return (-score, 0, finished_at.timestamp(), user_id)
+
+
+class Leaderboard:
+    """Ranking of a trivia kept sorted as scores change.
+
+    Lookups bisect a sorted key list, so rank and page queries cost
+    O(log n) plus the size of the page instead of a full sort.
+
+    With a ``size`` the board keeps only the top ``size`` entries, and
+    ``complete`` tells whether those are all the participants. Scores only
+    grow, so the top stays exact as long as newcomers to it are known.
+    """
+
+    def __init__(self, entries: Iterable[dict] = (), size: Optional[int] = None):
+        self.size = size
+        self.complete = True
+        self._keys: list[RankingKey] = []
+        self._entries: dict[UUID, tuple[RankingKey, dict]] = {}
+        # Entries are taken to be every participant unless there are more
+        # than ``size`` of them.
+        for entry in entries:
+            self.upsert(entry)
+
+    def upsert(self, entry: dict) -> None:
+        self.remove(entry["user_id"])
+        key = ranking_key(entry["user_id"], entry["score"], entry["finished_at"])
+        insort(self._keys, key)
+        self._entries[entry["user_id"]] = (key, dict(entry))
+        if self.size is not None and len(self) > self.size:
+            self.remove(self._keys[-1][3])
+            self.complete = False
+
+    def update_score(
+        self, user_id: UUID, score: int, finished_at: Optional[datetime]
+    ) -> bool:
+        """Moves a participant to its new score. Returns False when the board
+        cannot place it: it is not on the board yet but may now belong there."""
+        key = ranking_key(user_id, score, finished_at)
+        current = self._entries.get(user_id)
+        if not self.complete and key > self._keys[-1]:
+            # Below the board, where only a newcomer is known to stay out.
+            return current is None
+        if current is None:
+            return False
+        _, entry = current
+        self.upsert({**entry, "score": score, "finished_at": finished_at})
+        return True
+
+    def covers(self, end: int) -> bool:
+        """Whether the ranks up to ``end`` are all on the board."""
+        return self.complete or end <= len(self)
+
+    def remove(self, user_id: UUID) -> None:
+        current = self._entries.pop(user_id, None)
+        if current is not None:
+            del self._keys[bisect_left(self._keys, current[0])]
+
+    def entry(self, user_id: UUID) -> Optional[dict]:
+        current = self._entries.get(user_id)
+        return dict(current[1]) if current is not None else None
+
+    def __contains__(self, user_id: UUID) -> bool:
+        return user_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def rank_of(self, user_id: UUID) -> Optional[int]:
+        current = self._entries.get(user_id)
+        if current is None:
+            return None
+        return bisect_left(self._keys, current[0]) + 1
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> list[dict]:
+        end = None if limit is None else offset + limit
+        return [
+            self._entry_for(key, rank)
+            for rank, key in enumerate(self._keys[offset:end], start=offset + 1)
+        ]
+
+    def top(self, limit: int) -> list[dict]:
+        return self.page(0, limit)
+
+    def around(self, user_id: UUID, neighbours: int) -> list[dict]:
+        """Returns a participant's entry with up to N entries above and below."""
+        rank = self.rank_of(user_id)
+        if rank is None:
+            return []
+        offset = max(rank - 1 - neighbours, 0)
+        return self.page(offset, rank - offset + neighbours)
+
+    def _entry_for(self, key: RankingKey, rank: int) -> dict:
+        return {**self._entries[key[3]][1], "rank": rank}
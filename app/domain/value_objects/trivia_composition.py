@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from typing import Optional
+from uuid import UUID
+
+@dataclass(frozen=True)
+class TriviaComposition:
+    trivia_id: UUID
+    name: str
+    question_ids: tuple[UUID, ...]
+    user_ids: frozenset[UUID]
+    # The trivia's updated_at when this was read, to tell if it is stale.
+    updated_at: Optional[datetime] = None
+
+    @cached_property
+    def _positions(self) -> dict[UUID, int]:
+        return {question_id: i for i, question_id in enumerate(self.question_ids)}
+
+    def question_id_at(self, position: int) -> Optional[UUID]:
+        if 0 <= position < len(self.question_ids):
+            return self.question_ids[position]
+        return None
+
+    def position_of(self, question_id: UUID) -> Optional[int]:
+        return self._positions.get(question_id)
+
+    def has_user(self, user_id: UUID) -> bool:
+        return user_id in self.user_ids
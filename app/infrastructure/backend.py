@@ -0,0 +1,115 @@
+"""Selects the repository implementations the API is wired to.
+
+``REPOSITORY_BACKEND=sqlalchemy`` (the default) serves every request from
+Postgres. ``memory`` swaps in the in-memory repositories over a single
+process-wide store, for benchmarking the use-case and API layers on their
+own or for single-node event deployments.
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from app.application.ports.answer_repo import AnswerRepo
+from app.application.ports.participation_repo import ParticipationRepo
+from app.application.ports.question_repo import QuestionRepo
+from app.application.ports.trivia_repo import TriviaRepo
+from app.application.ports.unit_of_work import UnitOfWork
+from app.application.ports.user_repo import UserRepo
+from app.infrastructure.config import settings
+from app.infrastructure.db.session import get_db, get_read_db
+from app.infrastructure.db.unit_of_work import UnitOfWorkSqlAlchemy
+from app.infrastructure.memory.snapshot import load_snapshot, save_snapshot
+from app.infrastructure.memory.store import MemorySession, MemoryStore
+from app.infrastructure.memory.unit_of_work import UnitOfWorkInMemory
+from app.infrastructure.repositories.answer_repo import AnswerRepoSqlAlchemy
+from app.infrastructure.repositories.memory_answer_repo import AnswerRepoInMemory
+from app.infrastructure.repositories.memory_participation_repo import (
+    ParticipationRepoInMemory,
+)
+from app.infrastructure.repositories.memory_question_repo import (
+    QuestionRepoInMemory,
+)
+from app.infrastructure.repositories.memory_trivia_repo import TriviaRepoInMemory
+from app.infrastructure.repositories.memory_user_repo import UserRepoInMemory
+from app.infrastructure.repositories.participation_repo import (
+    ParticipationRepoSqlAlchemy,
+)
+from app.infrastructure.repositories.question_repo import QuestionRepoSqlAlchemy
+from app.infrastructure.repositories.trivia_repo import TriviaRepoSqlAlchemy
+from app.infrastructure.repositories.user_repo import UserRepoSqlAlchemy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Repositories:
+    """Builds each port's implementation around a request session."""
+
+    user_repo: Callable[[Any], UserRepo]
+    question_repo: Callable[[Any], QuestionRepo]
+    trivia_repo: Callable[[Any], TriviaRepo]
+    participation_repo: Callable[[Any], ParticipationRepo]
+    answer_repo: Callable[[Any], AnswerRepo]
+    unit_of_work: Callable[[Any], UnitOfWork]
+
+
+SQLALCHEMY_REPOSITORIES = Repositories(
+    user_repo=UserRepoSqlAlchemy,
+    question_repo=QuestionRepoSqlAlchemy,
+    trivia_repo=TriviaRepoSqlAlchemy,
+    participation_repo=ParticipationRepoSqlAlchemy,
+    answer_repo=AnswerRepoSqlAlchemy,
+    unit_of_work=UnitOfWorkSqlAlchemy,
+)
+
+MEMORY_REPOSITORIES = Repositories(
+    user_repo=UserRepoInMemory,
+    question_repo=QuestionRepoInMemory,
+    trivia_repo=TriviaRepoInMemory,
+    participation_repo=ParticipationRepoInMemory,
+    answer_repo=AnswerRepoInMemory,
+    unit_of_work=UnitOfWorkInMemory,
+)
+
+memory_store: Optional[MemoryStore] = None
+
+
+async def get_memory_session():
+    session = MemorySession(memory_store)
+    try:
+        yield session
+    finally:
+        # Whatever the request left uncommitted is discarded, as when a
+        # database session closes.
+        await session.rollback()
+
+
+if settings.repository_backend == "memory":
+    memory_store = MemoryStore()
+    repositories = MEMORY_REPOSITORIES
+    get_session = get_read_session = get_memory_session
+else:
+    repositories = SQLALCHEMY_REPOSITORIES
+    get_session = get_db
+    get_read_session = get_read_db
+
+
+def load_memory_snapshot() -> None:
+    """Restores the memory store from its snapshot, if there is one."""
+    global memory_store
+    if memory_store is None or not settings.memory_snapshot_path:
+        return
+    path = Path(settings.memory_snapshot_path)
+    if path.exists():
+        memory_store = load_snapshot(path)
+        logger.info("Loaded memory snapshot from %s", path)
+
+
+def save_memory_snapshot() -> None:
+    if memory_store is None or not settings.memory_snapshot_path:
+        return
+    path = Path(settings.memory_snapshot_path)
+    save_snapshot(memory_store, path)
+    logger.info("Saved memory snapshot to %s", path)
@@ -0,0 +1,75 @@
+from typing import Literal, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Deployment settings, read from environment variables (case-insensitive)."""
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+    postgres_user: str = "postgres"
+    postgres_password: str = "password"
+    postgres_host: str = "db"
+    postgres_port: int = 5432
+    postgres_db: str = "talatrivia"
+
+    # Read replica; reads stay on the primary when no host is configured.
+    postgres_read_host: Optional[str] = None
+    postgres_read_port: Optional[int] = None
+    read_your_writes_window: float = 5.0
+    read_your_writes_size: int = 100000
+
+    # Where repositories keep their data. "memory" serves everything from
+    # process-local dicts, snapshotted to memory_snapshot_path at shutdown.
+    repository_backend: Literal["sqlalchemy", "memory"] = "sqlalchemy"
+    memory_snapshot_path: Optional[str] = None
+
+    # Connection pool
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_pool_prewarm: int = -1  # connections to open at startup; -1 = pool size
+    db_echo: bool = False
+
+    # Request instrumentation; 0 disables the N+1 detector.
+    sql_instrumentation: bool = True
+    n_plus_one_threshold: int = 0
+    metrics_enabled: bool = True
+
+    # Process-local caches
+    question_cache_size: int = 10000
+    question_cache_ttl: float = 300
+    trivia_cache_size: int = 1000
+    trivia_cache_ttl: float = 300
+    leaderboard_cache_size: int = 100
+    leaderboard_cache_ttl: float = 30
+    leaderboard_size: int = 1000
+
+    @property
+    def database_url(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
+            f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+        )
+
+    @property
+    def read_database_url(self) -> Optional[str]:
+        if not self.postgres_read_host:
+            return None
+        port = self.postgres_read_port or self.postgres_port
+        return (
+            f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
+            f"@{self.postgres_read_host}:{port}/{self.postgres_db}"
+        )
+
+    @property
+    def prewarm_connections(self) -> int:
+        if self.db_pool_prewarm < 0:
+            return self.db_pool_size
+        return min(self.db_pool_prewarm, self.db_pool_size)
+
+
+settings = Settings()
@@ -0,0 +1,19 @@
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Uuid, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def uuid_array(name: str, ids: Iterable[UUID]):
+    """Binds IDs as a single ``uuid[]`` parameter.
+
+    Unlike ``in_()``, which expands to one parameter per ID and hits the
+    driver's bind limit on large member lists, this stays one parameter.
+    """
+    return bindparam(name, list(ids), type_=ARRAY(Uuid()))
+
+
+def any_uuid(name: str, ids: Iterable[UUID]):
+    """Right-hand side for ``column == any_uuid(...)`` membership tests."""
+    return any_(uuid_array(name, ids))
@@ -0,0 +1,45 @@
+"""Named loader profiles.
+
+Relationships are lazy by default, so every repository query that needs
+related rows opts into one of these profiles explicitly.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, joinedload, selectinload
+
+from app.infrastructure.db.models import Question, Trivia, User
+
+# A list of questions together with their options.
+QUESTIONS_WITH_OPTIONS = (selectinload(Question.options),)
+
+# A single question together with its options, in one round trip.
+QUESTION_WITH_OPTIONS = (joinedload(Question.options),)
+
+# Trivias with the IDs of their questions and users, without their payloads.
+TRIVIAS_WITH_MEMBER_IDS = (
+    selectinload(Trivia.questions).load_only(Question.id),
+    selectinload(Trivia.users).load_only(User.id),
+)
+
+
+class UnexpectedLazyLoad(RuntimeError):
+    """Raised when a relationship is lazy loaded while the guard is installed."""
+
+
+def _raise_on_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    state = orm_execute_state.lazy_loaded_from
+    if state is not None:
+        raise UnexpectedLazyLoad(
+            f"Unexpected lazy load from {state.class_.__name__}; "
+            "add the relationship to a loader profile"
+        )
+
+
+def forbid_lazy_loads() -> None:
+    """Makes every lazy relationship load raise, for all sessions."""
+    if not event.contains(Session, "do_orm_execute", _raise_on_lazy_load):
+        event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
+
+
+def allow_lazy_loads() -> None:
+    if event.contains(Session, "do_orm_execute", _raise_on_lazy_load):
+        event.remove(Session, "do_orm_execute", _raise_on_lazy_load)
@@ -40,8 +40,12 @@ class TriviaQuestion(Base, TimestampMixin):
     question_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("questions.id"), primary_key=True
     )
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
 
-    __table_args__ = (Index("ix_trivia_questions_question_id", "question_id"),)
+    __table_args__ = (
+        Index("ix_trivia_questions_question_id", "question_id"),
+        Index("ix_trivia_questions_trivia_position", "trivia_id", "position"),
+    )
 
 
 class TriviaUser(Base, TimestampMixin):
@@ -65,12 +69,14 @@ class User(Base, UUIDMixin, TimestampMixin):
 
     # Relationships
     participations: Mapped[List["Participation"]] = relationship(
-        back_populates="user", lazy="selectin", cascade="all, delete-orphan"
+        back_populates="user", cascade="all, delete-orphan"
     )
     trivias: Mapped[List["Trivia"]] = relationship(
-        secondary="trivia_users", back_populates="users", lazy="selectin"
+        secondary="trivia_users", back_populates="users"
     )
 
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
+
 
 class Question(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "questions"
@@ -82,10 +88,17 @@ class Question(Base, UUIDMixin, TimestampMixin):
 
     # Relationships
     options: Mapped[List["QuestionOption"]] = relationship(
-        back_populates="question", lazy="selectin", cascade="all, delete-orphan"
+        back_populates="question", cascade="all, delete-orphan"
     )
     trivias: Mapped[List["Trivia"]] = relationship(
-        secondary="trivia_questions", back_populates="questions", lazy="selectin"
+        secondary="trivia_questions", back_populates="questions"
+    )
+
+    __table_args__ = (
+        Index("ix_questions_created_at_id", "created_at", "id"),
+        Index(
+            "ix_questions_difficulty_created_at_id", "difficulty", "created_at", "id"
+        ),
     )
 
 
@@ -113,15 +126,19 @@ class Trivia(Base, UUIDMixin, TimestampMixin):
 
     # Relationships
     participations: Mapped[List["Participation"]] = relationship(
-        back_populates="trivia", lazy="selectin", cascade="all, delete-orphan"
+        back_populates="trivia", cascade="all, delete-orphan"
     )
     questions: Mapped[List["Question"]] = relationship(
-        secondary="trivia_questions", back_populates="trivias", lazy="selectin"
+        secondary="trivia_questions",
+        back_populates="trivias",
+        order_by="TriviaQuestion.position",
     )
     users: Mapped[List["User"]] = relationship(
-        secondary="trivia_users", back_populates="trivias", lazy="selectin"
+        secondary="trivia_users", back_populates="trivias"
     )
 
+    __table_args__ = (Index("ix_trivias_created_at_id", "created_at", "id"),)
+
 
 class Participation(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "participations"
@@ -136,6 +153,9 @@ class Participation(Base, UUIDMixin, TimestampMixin):
         default=ParticipationStatus.in_progress,
     )
     score_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    answered_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     started_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
@@ -147,7 +167,7 @@ class Participation(Base, UUIDMixin, TimestampMixin):
     user: Mapped["User"] = relationship(back_populates="participations")
     trivia: Mapped["Trivia"] = relationship(back_populates="participations")
     answers: Mapped[List["Answer"]] = relationship(
-        back_populates="participation", lazy="selectin", cascade="all, delete-orphan"
+        back_populates="participation", cascade="all, delete-orphan"
     )
 
     __table_args__ = (
@@ -157,6 +177,14 @@ class Participation(Base, UUIDMixin, TimestampMixin):
     )
 
 
+Index(
+    "ix_participations_trivia_ranking",
+    Participation.trivia_id,
+    Participation.score_total.desc(),
+    Participation.finished_at,
+)
+
+
 class Answer(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "answers"
 
@@ -177,6 +205,7 @@ class Answer(Base, UUIDMixin, TimestampMixin):
     answered_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     # Relationships
     participation: Mapped["Participation"] = relationship(back_populates="answers")
@@ -190,6 +219,11 @@ class Answer(Base, UUIDMixin, TimestampMixin):
     
     __table_args__ = (
         UniqueConstraint("participation_id", "question_id", name="uq_answer_participation_question"),
+        UniqueConstraint(
+            "participation_id",
+            "idempotency_key",
+            name="uq_answer_participation_idempotency_key",
+        ),
         ForeignKeyConstraint(
             ["trivia_id", "question_id"],
             ["trivia_questions.trivia_id", "trivia_questions.question_id"],
@@ -201,3 +235,12 @@ class Answer(Base, UUIDMixin, TimestampMixin):
     )
 
 
+
+
+class CollectionVersion(Base, TimestampMixin):
+    """Write counter for a collection, so its ETag needs no table scan."""
+
+    __tablename__ = "collection_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,24 @@
+from typing import Callable, Optional, Sequence, TypeVar
+
+from sqlalchemy import Select, tuple_
+
+from app.application.pagination import Page, PageCursor
+
+T = TypeVar("T")
+
+
+def keyset(stmt: Select, model, limit: int, after: Optional[PageCursor]) -> Select:
+    """Restricts a select to one (created_at, id) keyset page plus a lookahead row."""
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(model.created_at, model.id) > tuple_(after.created_at, after.id)
+        )
+    return stmt.order_by(model.created_at, model.id).limit(limit + 1)
+
+
+def to_page(rows: Sequence, limit: int, to_domain: Callable[..., T]) -> Page[T]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = PageCursor(created_at=rows[-1].created_at, id=rows[-1].id)
+    return Page(items=[to_domain(row) for row in rows], next_cursor=next_cursor)
@@ -0,0 +1,45 @@
+import threading
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class PoolWaitStats:
+    """Accumulates how long requests waited to check a connection out."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.last = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_seconds": self.total,
+                "max_seconds": self.max,
+                "last_seconds": self.last,
+                "avg_seconds": self.total / self.count if self.count else 0.0,
+            }
+
+
+def pool_status(engine: AsyncEngine, wait_stats: PoolWaitStats) -> dict[str, Any]:
+    pool = engine.sync_engine.pool
+    # Non-queue pools (e.g. NullPool in scripts) have no size accounting.
+    status: dict[str, Any] = {"pool": type(pool).__name__}
+    for gauge in ("size", "checkedin", "checkedout", "overflow"):
+        reader = getattr(pool, gauge, None)
+        if reader is not None:
+            status[gauge] = reader()
+    status["wait"] = wait_stats.snapshot()
+    return status
@@ -1,20 +1,177 @@
-import os
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional
 
-POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
-POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "password")
-POSTGRES_HOST = os.getenv("POSTGRES_HOST", "db")
-POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
-POSTGRES_DB = os.getenv("POSTGRES_DB", "talatrivia")
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.config import Settings, settings
+from app.infrastructure.db.pool_metrics import PoolWaitStats
+
+logger = logging.getLogger(__name__)
+
+# Path parameters that identify whose state a request reads.
+WRITE_SCOPE_PARAMS = ("user_id", "trivia_id")
+
+# Wall clock for write markers, which are compared across processes.
+clock = time.time
+
+
+def create_engine(settings: Settings, url: Optional[str] = None) -> AsyncEngine:
+    return create_async_engine(
+        url or settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        echo=settings.db_echo,
+    )
+
+
+async def prewarm_pool(engine: AsyncEngine, connections: int) -> int:
+    """Opens up to ``connections`` pooled connections so the first requests
+    do not pay for connection setup. Returns how many were opened."""
+    if connections <= 0:
+        return 0
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in opened:
+        await conn.close()
+    failures = [error for error in results if isinstance(error, BaseException)]
+    if failures:
+        logger.warning(
+            "Pre-warmed %d of %d connections: %s",
+            len(opened),
+            connections,
+            failures[0],
+        )
+    return len(opened)
+
+
+@dataclass
+class WriteMarker:
+    """When the client last wrote through the primary: ``last_write`` as sent
+    back in its cookie, and ``wrote_at`` once this request commits."""
+
+    last_write: Optional[float] = None
+    wrote_at: Optional[float] = None
+
+
+_write_marker: ContextVar[Optional[WriteMarker]] = ContextVar(
+    "write_marker", default=None
+)
+
+
+def start_write_tracking(marker: WriteMarker) -> Token:
+    return _write_marker.set(marker)
+
+
+def stop_write_tracking(token: Token) -> None:
+    _write_marker.reset(token)
+
+
+def client_last_write() -> Optional[float]:
+    marker = _write_marker.get()
+    return marker.last_write if marker is not None else None
 
-DATABASE_URL = (
-    f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+class PrimarySession(Session):
+    """Session class for primary connections, whose commits mark the client."""
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_client_write(session: Session) -> None:
+    marker = _write_marker.get()
+    if marker is not None:
+        marker.wrote_at = clock()
+
+
+engine = create_engine(settings)
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    sync_session_class=PrimarySession,
 )
+pool_wait_stats = PoolWaitStats()
+
+read_engine = (
+    create_engine(settings, settings.read_database_url)
+    if settings.read_database_url
+    else engine
+)
+AsyncReadSessionLocal = (
+    async_sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not engine
+    else AsyncSessionLocal
+)
+read_pool_wait_stats = PoolWaitStats() if read_engine is not engine else pool_wait_stats
+
+# Users and trivias whose membership changed recently enough that the replica
+# may not have caught up; everyone's reads of them go to the primary. This is
+# per process, so other workers can still serve them from a lagging replica.
+# A client's own writes are covered on every worker by its write cookie.
+recent_writes: LRUCache[bool] = LRUCache(
+    maxsize=settings.read_your_writes_size, ttl=settings.read_your_writes_window
+)
+
 
-engine = create_async_engine(DATABASE_URL)
-AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+def _write_scope(params: Mapping[str, str]) -> list[tuple[str, str]]:
+    return [(name, str(params[name])) for name in WRITE_SCOPE_PARAMS if name in params]
+
+
+def mark_recent_write(scope: Iterable[tuple[str, str]]) -> None:
+    for key in scope:
+        recent_writes.set(key, True)
+
+
+def read_session_factory(
+    params: Mapping[str, str], last_write: Optional[float] = None
+) -> async_sessionmaker:
+    if AsyncReadSessionLocal is AsyncSessionLocal:
+        return AsyncSessionLocal
+    if last_write is not None and (
+        clock() - last_write < settings.read_your_writes_window
+    ):
+        return AsyncSessionLocal
+    if any(recent_writes.get(key) for key in _write_scope(params)):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+@asynccontextmanager
+async def _checked_out_session(factory: async_sessionmaker, wait_stats: PoolWaitStats):
+    async with factory() as session:
+        # Check the connection out up front so time spent queueing on a
+        # saturated pool is measured rather than folded into the first query.
+        started = time.perf_counter()
+        await session.connection()
+        wait_stats.observe(time.perf_counter() - started)
+        yield session
 
 
 async def get_db():
-    async with AsyncSessionLocal() as session:
+    async with _checked_out_session(AsyncSessionLocal, pool_wait_stats) as session:
+        yield session
+
+
+async def get_read_db(request: Request):
+    factory = read_session_factory(request.path_params, client_last_write())
+    stats = pool_wait_stats if factory is AsyncSessionLocal else read_pool_wait_stats
+    async with _checked_out_session(factory, stats) as session:
         yield session
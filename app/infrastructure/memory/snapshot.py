@@ -0,0 +1,140 @@
+"""JSON snapshots of a memory store, written at shutdown and loaded at startup."""
+
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from app.domain.entities.answer import Answer
+from app.domain.entities.participation import Participation
+from app.domain.entities.question import Question, QuestionOption
+from app.domain.entities.user import User
+from app.domain.value_objects.difficulty import Difficulty
+from app.domain.value_objects.participation_status import ParticipationStatus
+from app.infrastructure.memory.store import MemoryStore, Table, TriviaRow
+
+SNAPSHOT_VERSION = 1
+
+
+def _rows(table: Table, extra: Callable[[Any], dict] = lambda row: {}) -> list[dict]:
+    return [
+        {
+            **asdict(row),
+            **extra(row),
+            "created_at": table.created_at[row.id],
+            "updated_at": table.updated_at[row.id],
+        }
+        for row in table.scan()
+    ]
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (UUID, datetime)):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def dump(store: MemoryStore) -> dict:
+    return {
+        "version": SNAPSHOT_VERSION,
+        "users": _rows(store.users),
+        "questions": _rows(store.questions),
+        "trivias": _rows(
+            store.trivias,
+            lambda row: {
+                "question_ids": store.trivia_questions.get(row.id, []),
+                "user_ids": list(store.trivia_users.get(row.id, ())),
+            },
+        ),
+        "participations": _rows(store.participations),
+        "answers": _rows(store.answers),
+    }
+
+
+def _uuid(value: str) -> UUID:
+    return UUID(value)
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def load(data: dict) -> MemoryStore:
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+
+    store = MemoryStore()
+    for row in data["users"]:
+        user = User(id=_uuid(row["id"]), name=row["name"], email=row["email"])
+        store.users.insert(user.id, user, _datetime(row["created_at"]))
+    for row in data["questions"]:
+        question = Question(
+            id=_uuid(row["id"]),
+            text=row["text"],
+            difficulty=Difficulty(row["difficulty"]),
+            options=[
+                QuestionOption(
+                    id=_uuid(option["id"]),
+                    text=option["text"],
+                    is_correct=option["is_correct"],
+                )
+                for option in row["options"]
+            ],
+        )
+        store.questions.insert(question.id, question, _datetime(row["created_at"]))
+    for row in data["trivias"]:
+        trivia = TriviaRow(
+            id=_uuid(row["id"]), name=row["name"], description=row["description"]
+        )
+        store.trivias.insert(trivia.id, trivia, _datetime(row["created_at"]))
+        store.trivias.touch(
+            trivia.id, _datetime(row.get("updated_at", row["created_at"]))
+        )
+        store.set_trivia_questions(trivia.id, [_uuid(i) for i in row["question_ids"]])
+        for user_id in row["user_ids"]:
+            store.add_trivia_user(trivia.id, _uuid(user_id))
+    for row in data["participations"]:
+        participation = Participation(
+            id=_uuid(row["id"]),
+            trivia_id=_uuid(row["trivia_id"]),
+            user_id=_uuid(row["user_id"]),
+            status=ParticipationStatus(row["status"]),
+            score_total=row["score_total"],
+            started_at=_datetime(row["started_at"]),
+            finished_at=_datetime(row["finished_at"]),
+            answered_count=row["answered_count"],
+        )
+        store.participations.insert(
+            participation.id, participation, _datetime(row["created_at"])
+        )
+        store.rank(participation)
+    for row in data["answers"]:
+        answer = Answer(
+            id=_uuid(row["id"]),
+            participation_id=_uuid(row["participation_id"]),
+            trivia_id=_uuid(row["trivia_id"]),
+            question_id=_uuid(row["question_id"]),
+            option_id=_uuid(row["option_id"]),
+            is_correct=row["is_correct"],
+            score_awarded=row["score_awarded"],
+            answered_at=_datetime(row["answered_at"]),
+            idempotency_key=row.get("idempotency_key"),
+        )
+        store.answers.insert(answer.id, answer, _datetime(row["created_at"]))
+        store.index_answer(answer)
+    return store
+
+
+def save_snapshot(store: MemoryStore, path: Path) -> None:
+    # Written beside the target and renamed, so a crash mid-write never
+    # leaves a truncated snapshot behind.
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(dump(store), default=_encode))
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: Path) -> MemoryStore:
+    return load(json.loads(path.read_text()))
@@ -0,0 +1,303 @@
+"""Process-local storage backing the in-memory repositories.
+
+Rows live in dicts keyed by ID, with the secondary indexes the SQL queries
+rely on: unique constraints, (created_at, id) keyset order and per-trivia
+memberships, answers and leaderboards. Writes apply immediately and push an
+undo step onto the session journal, so a rollback restores the previous
+state and a commit just drops the journal. Repository calls never suspend,
+so each use case runs atomically on the event loop.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import (
+    Callable,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+from app.application.pagination import Page, PageCursor
+from app.application.versions import Version
+from app.domain.entities.answer import Answer
+from app.domain.entities.participation import Participation
+from app.domain.entities.question import Question
+from app.domain.entities.user import User
+from app.domain.services.leaderboard import Leaderboard
+
+T = TypeVar("T")
+Undo = Callable[[], None]
+OrderKey = Tuple[datetime, UUID]
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ConstraintViolation(Exception):
+    """Raised when a write breaks a unique constraint of the store."""
+
+    def __init__(self, constraint: str, key: Hashable):
+        self.constraint = constraint
+        self.key = key
+        super().__init__(f"Duplicate key {key!r} violates {constraint}")
+
+
+@dataclass(frozen=True)
+class TriviaRow:
+    id: UUID
+    name: str
+    description: Optional[str]
+
+
+class Table(Generic[T]):
+    """Rows by ID in (created_at, id) order, with unique and partition indexes.
+
+    Rows are handed out as copies so callers cannot change stored state
+    without going through the repository. A unique key of None is not
+    indexed, like a NULL in a SQL unique constraint.
+    """
+
+    def __init__(
+        self,
+        unique: Optional[dict[str, Callable[[T], Hashable]]] = None,
+        partition_by: Optional[Callable[[T], Hashable]] = None,
+    ):
+        self.rows: dict[UUID, T] = {}
+        self.created_at: dict[UUID, datetime] = {}
+        self.updated_at: dict[UUID, datetime] = {}
+        self._order: list[OrderKey] = []
+        self._unique = {
+            constraint: (key, {}) for constraint, key in (unique or {}).items()
+        }
+        self._partition_by = partition_by
+        self._partitions: dict[Hashable, list[OrderKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, row_id: UUID) -> Optional[T]:
+        row = self.rows.get(row_id)
+        return replace(row) if row is not None else None
+
+    def find(self, constraint: str, key: Hashable) -> Optional[T]:
+        row_id = self._unique[constraint][1].get(key)
+        return self.get(row_id) if row_id is not None else None
+
+    def insert(self, row_id: UUID, row: T, created_at: datetime) -> Undo:
+        if row_id in self.rows:
+            raise ConstraintViolation("primary key", row_id)
+        for constraint, (key, index) in self._unique.items():
+            if key(row) is not None and key(row) in index:
+                raise ConstraintViolation(constraint, key(row))
+
+        self.rows[row_id] = replace(row)
+        self.created_at[row_id] = created_at
+        self.updated_at[row_id] = created_at
+        for key, index in self._unique.values():
+            if key(row) is not None:
+                index[key(row)] = row_id
+        insort(self._order, (created_at, row_id))
+        if self._partition_by is not None:
+            partition = self._partitions.setdefault(self._partition_by(row), [])
+            insort(partition, (created_at, row_id))
+        return lambda: self._delete(row_id)
+
+    def update(self, row_id: UUID, row: T) -> Undo:
+        """Replaces a row in place; unique and partition keys must not change."""
+        previous = self.rows[row_id]
+        self.rows[row_id] = replace(row)
+
+        def undo() -> None:
+            self.rows[row_id] = previous
+
+        return undo
+
+    def touch(self, row_id: UUID, at: datetime) -> Undo:
+        previous = self.updated_at[row_id]
+        self.updated_at[row_id] = at
+
+        def undo() -> None:
+            self.updated_at[row_id] = previous
+
+        return undo
+
+    def _delete(self, row_id: UUID) -> None:
+        row = self.rows.pop(row_id)
+        created_at = self.created_at.pop(row_id)
+        del self.updated_at[row_id]
+        for key, index in self._unique.values():
+            index.pop(key(row), None)
+        _remove(self._order, (created_at, row_id))
+        if self._partition_by is not None:
+            _remove(self._partitions[self._partition_by(row)], (created_at, row_id))
+
+    def page(
+        self,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        partition: Optional[Hashable] = None,
+    ) -> Page[T]:
+        order = self._order
+        if partition is not None:
+            order = self._partitions.get(partition, [])
+        start = 0
+        if after is not None:
+            start = bisect_right(order, (after.created_at, after.id))
+        keys = order[start : start + limit + 1]
+        next_cursor = None
+        if len(keys) > limit:
+            keys = keys[:limit]
+            next_cursor = PageCursor(created_at=keys[-1][0], id=keys[-1][1])
+        return Page(
+            items=[replace(self.rows[row_id]) for _, row_id in keys],
+            next_cursor=next_cursor,
+        )
+
+    def version(self, partition: Optional[Hashable] = None) -> Version:
+        """Row count and newest creation time, which is enough for tables whose
+        rows are never updated."""
+        order = self._order
+        if partition is not None:
+            order = self._partitions.get(partition, [])
+        return Version(count=len(order), updated_at=order[-1][0] if order else None)
+
+    def scan(self) -> Iterator[T]:
+        """Yields copies of every row, oldest first."""
+        for _, row_id in list(self._order):
+            row = self.rows.get(row_id)
+            if row is not None:
+                yield replace(row)
+
+    def batches(self, size: int) -> Iterator[List[T]]:
+        batch: List[T] = []
+        for row in self.scan():
+            batch.append(row)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _remove(order: list[OrderKey], key: OrderKey) -> None:
+    del order[bisect_left(order, key)]
+
+
+class MemoryStore:
+    def __init__(self, clock: Callable[[], datetime] = utcnow):
+        self.clock = clock
+        self.users: Table[User] = Table(unique={"uq_users_email": lambda u: u.email})
+        self.questions: Table[Question] = Table(partition_by=lambda q: q.difficulty)
+        self.trivias: Table[TriviaRow] = Table()
+        self.participations: Table[Participation] = Table(
+            unique={"uq_participation_trivia_user": lambda p: (p.trivia_id, p.user_id)}
+        )
+        self.answers: Table[Answer] = Table(
+            unique={
+                "uq_answer_participation_question": (
+                    lambda a: (a.participation_id, a.question_id)
+                ),
+                "uq_answer_participation_idempotency_key": (
+                    lambda a: (a.participation_id, a.idempotency_key)
+                    if a.idempotency_key is not None
+                    else None
+                ),
+            }
+        )
+        # Trivia members: ordered question IDs with their positions, and the
+        # user set in both directions.
+        self.trivia_questions: dict[UUID, list[UUID]] = {}
+        self.question_positions: dict[UUID, dict[UUID, int]] = {}
+        self.trivia_users: dict[UUID, dict[UUID, None]] = {}
+        self.user_trivias: dict[UUID, dict[UUID, None]] = {}
+        # Answer counts by (trivia, question).
+        self.answered_questions: dict[UUID, dict[UUID, int]] = {}
+        self.leaderboards: dict[UUID, Leaderboard] = {}
+
+    def set_trivia_questions(self, trivia_id: UUID, question_ids: List[UUID]) -> Undo:
+        previous = self.trivia_questions.get(trivia_id)
+        self.trivia_questions[trivia_id] = list(question_ids)
+        self.question_positions[trivia_id] = {
+            question_id: position for position, question_id in enumerate(question_ids)
+        }
+
+        def undo() -> None:
+            if previous is None:
+                self.trivia_questions.pop(trivia_id, None)
+                self.question_positions.pop(trivia_id, None)
+            else:
+                self.set_trivia_questions(trivia_id, previous)
+
+        return undo
+
+    def add_trivia_user(self, trivia_id: UUID, user_id: UUID) -> Undo:
+        self.trivia_users.setdefault(trivia_id, {})[user_id] = None
+        self.user_trivias.setdefault(user_id, {})[trivia_id] = None
+        return lambda: self._drop_trivia_user(trivia_id, user_id)
+
+    def remove_trivia_user(self, trivia_id: UUID, user_id: UUID) -> Undo:
+        self._drop_trivia_user(trivia_id, user_id)
+        return lambda: self.add_trivia_user(trivia_id, user_id)
+
+    def _drop_trivia_user(self, trivia_id: UUID, user_id: UUID) -> None:
+        self.trivia_users.get(trivia_id, {}).pop(user_id, None)
+        self.user_trivias.get(user_id, {}).pop(trivia_id, None)
+
+    def index_answer(self, answer: Answer) -> Undo:
+        counts = self.answered_questions.setdefault(answer.trivia_id, {})
+        counts[answer.question_id] = counts.get(answer.question_id, 0) + 1
+
+        def undo() -> None:
+            counts[answer.question_id] -= 1
+            if not counts[answer.question_id]:
+                del counts[answer.question_id]
+
+        return undo
+
+    def rank(self, participation: Participation) -> Undo:
+        """Moves a participant to their current place on the trivia leaderboard."""
+        board = self.leaderboards.setdefault(participation.trivia_id, Leaderboard())
+        user_id = participation.user_id
+        previous = board.entry(user_id)
+        user = self.users.rows.get(user_id)
+        board.upsert(
+            {
+                "user_id": user_id,
+                "user_name": user.name if user else "",
+                "score": participation.score_total,
+                "finished_at": participation.finished_at,
+            }
+        )
+
+        def undo() -> None:
+            if previous is None:
+                board.remove(user_id)
+            else:
+                board.upsert(previous)
+
+        return undo
+
+
+class MemorySession:
+    """Journal of undo steps for the writes of one request."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+        self._undo: list[Undo] = []
+
+    def record(self, undo: Undo) -> None:
+        self._undo.append(undo)
+
+    async def commit(self) -> None:
+        self._undo.clear()
+
+    async def rollback(self) -> None:
+        while self._undo:
+            self._undo.pop()()
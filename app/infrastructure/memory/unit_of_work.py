@@ -0,0 +1,24 @@
+from typing import Callable
+
+from app.infrastructure.memory.store import MemorySession
+
+
+class UnitOfWorkInMemory:
+    """Commits or undoes the writes journaled on a shared memory session."""
+
+    def __init__(self, session: MemorySession):
+        self.session = session
+        self._after_commit: list[Callable[[], None]] = []
+
+    async def commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        await self.session.commit()
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self) -> None:
+        self._after_commit.clear()
+        await self.session.rollback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self._after_commit.append(callback)
@@ -0,0 +1,143 @@
+"""Hand-rolled Prometheus metrics.
+
+Recording is a dict lookup plus a few integer additions, so the hot path
+needs no locks or client library. Samples are rendered to the text
+exposition format only when ``/metrics`` is scraped.
+"""
+from bisect import bisect_left
+from typing import Iterable, Sequence
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{n}="{_escape(str(v))}"' for n, v in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _header(name: str, help_text: str, kind: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        lines = _header(self.name, self.help_text, "counter")
+        for values, total in self._values.items():
+            lines.append(f"{self.name}{format_labels(self.labels, values)} {total}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values: str, value: float) -> None:
+        self._values[label_values] = value
+
+    def render(self) -> list[str]:
+        lines = _header(self.name, self.help_text, "gauge")
+        for values, current in self._values.items():
+            lines.append(f"{self.name}{format_labels(self.labels, values)} {current}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), sum.
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0])
+            self._series[label_values] = series
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> list[str]:
+        lines = _header(self.name, self.help_text, "histogram")
+        label_names = self.labels + ("le",)
+        for values, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts[:-1], strict=True):
+                cumulative += count
+                labels = format_labels(label_names, values + (repr(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += counts[-1]
+            labels = format_labels(label_names, values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            plain = format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{plain} {total[0]}")
+            lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+def render(metrics: Iterable) -> str:
+    lines: list[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    labels=("method", "route", "status"),
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "Requests currently being served."
+)
+http_requests_in_flight.set(value=0)
+answers_graded = Counter(
+    "talatrivia_answers_graded_total", "Answers graded.", labels=("correct",)
+)
+participations_finished = Counter(
+    "talatrivia_participations_finished_total", "Participations finished."
+)
+
+REQUEST_METRICS = (http_request_duration, http_requests_in_flight)
+DOMAIN_METRICS = (answers_graded, participations_finished)
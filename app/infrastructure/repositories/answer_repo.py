@@ -1,11 +1,14 @@
-from typing import Optional, List
+from typing import AsyncIterator, Iterable, Optional, List, Set
 from uuid import UUID
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.domain.entities.answer import Answer as DomainAnswer
+from app.domain.errors import TriviaQuestionRemoved
+from app.infrastructure.db.arrays import any_uuid
 from app.infrastructure.db.models import Answer as DBAnswer
 
 class AnswerRepoSqlAlchemy:
@@ -13,16 +16,7 @@ class AnswerRepoSqlAlchemy:
         self.session = session
 
     async def save(self, answer: DomainAnswer) -> DomainAnswer:
-        db_answer = DBAnswer(
-            id=answer.id,
-            participation_id=answer.participation_id,
-            trivia_id=answer.trivia_id,
-            question_id=answer.question_id,
-            option_id=answer.option_id,
-            is_correct=answer.is_correct,
-            score_awarded=answer.score_awarded,
-            answered_at=answer.answered_at,
-        )
+        db_answer = self._to_db(answer)
         self.session.add(db_answer)
 
         try:
@@ -34,25 +28,83 @@ class AnswerRepoSqlAlchemy:
         await self.session.refresh(db_answer)
         return self._to_domain(db_answer)
 
-    async def get_by_participation(self, participation_id: UUID) -> List[DomainAnswer]:
-        result = await self.session.execute(
-            select(DBAnswer).where(DBAnswer.participation_id == participation_id)
-        )
-        db_answers = result.scalars().all()
-        return [self._to_domain(db_answer) for db_answer in db_answers]
+    async def add(self, answer: DomainAnswer) -> bool:
+        # ON CONFLICT keeps a duplicate from aborting the transaction, so the
+        # caller can roll back cleanly instead of handling an IntegrityError.
+        # What can still fail is the composite FK to trivia_questions, when
+        # the question was removed after the caller looked it up.
+        try:
+            result = await self.session.execute(
+                pg_insert(DBAnswer)
+                .values(
+                    id=answer.id,
+                    participation_id=answer.participation_id,
+                    trivia_id=answer.trivia_id,
+                    question_id=answer.question_id,
+                    option_id=answer.option_id,
+                    is_correct=answer.is_correct,
+                    score_awarded=answer.score_awarded,
+                    answered_at=answer.answered_at,
+                    idempotency_key=answer.idempotency_key,
+                )
+                .on_conflict_do_nothing()
+                .returning(DBAnswer.id)
+            )
+        except IntegrityError as e:
+            raise TriviaQuestionRemoved("Question was removed from the trivia") from e
+        return result.scalar_one_or_none() is not None
 
-    async def get_by_participation_and_question(
-        self, participation_id: UUID, question_id: UUID
+    async def get_by_idempotency_key(
+        self, participation_id: UUID, idempotency_key: str
     ) -> Optional[DomainAnswer]:
         result = await self.session.execute(
             select(DBAnswer).where(
                 DBAnswer.participation_id == participation_id,
-                DBAnswer.question_id == question_id,
+                DBAnswer.idempotency_key == idempotency_key,
             )
         )
         db_answer = result.scalar_one_or_none()
         return self._to_domain(db_answer) if db_answer else None
 
+    async def get_answered_question_ids(
+        self, trivia_id: UUID, question_ids: Iterable[UUID]
+    ) -> Set[UUID]:
+        question_ids = list(question_ids)
+        if not question_ids:
+            return set()
+        result = await self.session.execute(
+            select(DBAnswer.question_id)
+            .where(
+                DBAnswer.trivia_id == trivia_id,
+                DBAnswer.question_id == any_uuid("question_ids", question_ids),
+            )
+            .distinct()
+        )
+        return set(result.scalars().all())
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[List[DomainAnswer]]:
+        result = await self.session.stream_scalars(
+            select(DBAnswer)
+            .order_by(DBAnswer.created_at, DBAnswer.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for db_answers in result.partitions():
+            yield [self._to_domain(db_answer) for db_answer in db_answers]
+
+    @staticmethod
+    def _to_db(answer: DomainAnswer) -> DBAnswer:
+        return DBAnswer(
+            id=answer.id,
+            participation_id=answer.participation_id,
+            trivia_id=answer.trivia_id,
+            question_id=answer.question_id,
+            option_id=answer.option_id,
+            is_correct=answer.is_correct,
+            score_awarded=answer.score_awarded,
+            answered_at=answer.answered_at,
+            idempotency_key=answer.idempotency_key,
+        )
+
     @staticmethod
     def _to_domain(db_answer: DBAnswer) -> DomainAnswer:
         return DomainAnswer(
@@ -64,4 +116,5 @@ class AnswerRepoSqlAlchemy:
             is_correct=db_answer.is_correct,
             score_awarded=db_answer.score_awarded,
             answered_at=db_answer.answered_at,
+            idempotency_key=db_answer.idempotency_key,
         )
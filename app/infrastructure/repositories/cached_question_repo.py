@@ -0,0 +1,61 @@
+from typing import AsyncIterator, Iterable, List, Optional, Set
+from uuid import UUID
+
+from app.application.pagination import Page, PageCursor
+from app.application.ports.question_repo import QuestionRepo
+from app.application.versions import Version
+from app.domain.entities.question import Question as DomainQuestion
+from app.domain.value_objects.difficulty import Difficulty
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.config import settings
+
+question_cache: LRUCache[DomainQuestion] = LRUCache(
+    maxsize=settings.question_cache_size, ttl=settings.question_cache_ttl
+)
+
+
+class CachedQuestionRepo:
+    """Serves questions by ID from a process-local cache, falling back to a repo."""
+
+    def __init__(self, repo: QuestionRepo, cache: LRUCache[DomainQuestion]):
+        self.repo = repo
+        self.cache = cache
+
+    async def save(self, question: DomainQuestion) -> DomainQuestion:
+        saved = await self.repo.save(question)
+        self.cache.invalidate(saved.id)
+        return saved
+
+    async def save_many(self, questions: List[DomainQuestion]) -> None:
+        # Fresh IDs cannot be cached yet, so there is nothing to invalidate.
+        await self.repo.save_many(questions)
+
+    async def get_all(self) -> List[DomainQuestion]:
+        return await self.repo.get_all()
+
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        difficulty: Optional[Difficulty] = None,
+    ) -> Page[DomainQuestion]:
+        return await self.repo.get_page(limit, after, difficulty)
+
+    async def get_version(self, difficulty: Optional[Difficulty] = None) -> Version:
+        return await self.repo.get_version(difficulty)
+
+    def stream_all(self, batch_size: int) -> AsyncIterator[List[DomainQuestion]]:
+        return self.repo.stream_all(batch_size)
+
+    async def get_existing_ids(self, question_ids: Iterable[UUID]) -> Set[UUID]:
+        return await self.repo.get_existing_ids(question_ids)
+
+    async def get_by_id(self, question_id: UUID) -> Optional[DomainQuestion]:
+        question = self.cache.get(question_id)
+        if question is not None:
+            return question
+
+        question = await self.repo.get_by_id(question_id)
+        if question is not None:
+            self.cache.set(question_id, question)
+        return question
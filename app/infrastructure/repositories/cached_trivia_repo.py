@@ -0,0 +1,143 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from app.application.pagination import Page, PageCursor
+from app.application.versions import Version
+from app.application.ports.trivia_repo import TriviaRepo
+from app.domain.entities.trivia import Trivia as DomainTrivia
+from app.domain.services.answer_key import AnswerKey
+from app.domain.value_objects.trivia_composition import TriviaComposition
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.config import settings
+
+composition_cache: LRUCache[TriviaComposition] = LRUCache(
+    maxsize=settings.trivia_cache_size, ttl=settings.trivia_cache_ttl
+)
+answer_key_cache: LRUCache[AnswerKey] = LRUCache(
+    maxsize=settings.trivia_cache_size, ttl=settings.trivia_cache_ttl
+)
+
+
+class CachedTriviaRepo:
+    """Serves trivia compositions and answer keys from process-local caches."""
+
+    def __init__(
+        self,
+        repo: TriviaRepo,
+        cache: LRUCache[TriviaComposition],
+        answer_keys: LRUCache[AnswerKey],
+    ):
+        self.repo = repo
+        self.cache = cache
+        self.answer_keys = answer_keys
+
+    async def save(self, trivia: DomainTrivia) -> DomainTrivia:
+        saved = await self.repo.save(trivia)
+        self.invalidate(saved.id)
+        return saved
+
+    def invalidate(self, trivia_id: UUID) -> None:
+        self.cache.invalidate(trivia_id)
+        self.answer_keys.invalidate(trivia_id)
+
+    async def get_updated_at(self, trivia_id: UUID) -> Optional[datetime]:
+        updated_at = await self.repo.get_updated_at(trivia_id)
+        # Another process may have changed the trivia since it was cached. The
+        # answer key carries no stamp, so it is dropped along with the
+        # composition.
+        composition = self.cache.get(trivia_id)
+        if composition is None or composition.updated_at != updated_at:
+            self.invalidate(trivia_id)
+        return updated_at
+
+    async def get_by_id(self, trivia_id: UUID) -> Optional[DomainTrivia]:
+        return await self.repo.get_by_id(trivia_id)
+
+    async def get_composition(self, trivia_id: UUID) -> Optional[TriviaComposition]:
+        composition = self.cache.get(trivia_id)
+        if composition is not None:
+            return composition
+
+        composition = await self.repo.get_composition(trivia_id)
+        if composition is not None:
+            self.cache.set(trivia_id, composition)
+        return composition
+
+    async def get_question_ids(self, trivia_id: UUID) -> List[UUID]:
+        composition = await self.get_composition(trivia_id)
+        return list(composition.question_ids) if composition else []
+
+    async def get_question_id_at(
+        self, trivia_id: UUID, position: int
+    ) -> Optional[UUID]:
+        composition = await self.get_composition(trivia_id)
+        return composition.question_id_at(position) if composition else None
+
+    async def get_question_position(
+        self, trivia_id: UUID, question_id: UUID
+    ) -> Optional[int]:
+        composition = await self.get_composition(trivia_id)
+        return composition.position_of(question_id) if composition else None
+
+    async def get_answer_key(self, trivia_id: UUID) -> AnswerKey:
+        answer_key = self.answer_keys.get(trivia_id)
+        if answer_key is not None:
+            return answer_key
+
+        answer_key = await self.repo.get_answer_key(trivia_id)
+        self.answer_keys.set(trivia_id, answer_key)
+        return answer_key
+
+    async def get_by_user_id(self, user_id: UUID) -> List[DomainTrivia]:
+        return await self.repo.get_by_user_id(user_id)
+
+    async def get_version(self, trivia_id: UUID) -> Optional[Version]:
+        return await self.repo.get_version(trivia_id)
+
+    async def get_user_trivias_version(self, user_id: UUID) -> Version:
+        return await self.repo.get_user_trivias_version(user_id)
+
+    async def get_all(self) -> List[DomainTrivia]:
+        return await self.repo.get_all()
+
+    async def get_page(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[DomainTrivia]:
+        return await self.repo.get_page(limit, after)
+
+    def stream_all(self, batch_size: int) -> AsyncIterator[List[DomainTrivia]]:
+        return self.repo.stream_all(batch_size)
+
+    async def touch(self, trivia_id: UUID) -> bool:
+        return await self.repo.touch(trivia_id)
+
+    async def add_users(self, trivia_id: UUID, user_ids: List[UUID]) -> List[UUID]:
+        added = await self.repo.add_users(trivia_id, user_ids)
+        if added:
+            self.invalidate(trivia_id)
+        return added
+
+    async def remove_users(
+        self, trivia_id: UUID, user_ids: List[UUID]
+    ) -> List[UUID]:
+        removed = await self.repo.remove_users(trivia_id, user_ids)
+        if removed:
+            self.invalidate(trivia_id)
+        return removed
+
+    async def add_questions(
+        self, trivia_id: UUID, question_ids: List[UUID]
+    ) -> List[UUID]:
+        added = await self.repo.add_questions(trivia_id, question_ids)
+        if added:
+            self.invalidate(trivia_id)
+        return added
+
+    async def remove_questions(
+        self, trivia_id: UUID, question_ids: List[UUID]
+    ) -> List[UUID]:
+        removed = await self.repo.remove_questions(trivia_id, question_ids)
+        if removed:
+            self.invalidate(trivia_id)
+        return removed
@@ -0,0 +1,51 @@
+from typing import AsyncIterator, Iterable, List, Optional, Set
+from uuid import UUID
+
+from app.domain.entities.answer import Answer as DomainAnswer
+from app.infrastructure.memory.store import ConstraintViolation, MemorySession
+
+IDEMPOTENCY_KEY_CONSTRAINT = "uq_answer_participation_idempotency_key"
+
+
+class AnswerRepoInMemory:
+    def __init__(self, session: MemorySession):
+        self.session = session
+        self.store = session.store
+        self.answers = session.store.answers
+
+    async def save(self, answer: DomainAnswer) -> DomainAnswer:
+        try:
+            self._insert(answer)
+        except ConstraintViolation:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        return answer
+
+    async def add(self, answer: DomainAnswer) -> bool:
+        try:
+            self._insert(answer)
+        except ConstraintViolation:
+            return False
+        return True
+
+    def _insert(self, answer: DomainAnswer) -> None:
+        self.session.record(self.answers.insert(answer.id, answer, self.store.clock()))
+        self.session.record(self.store.index_answer(answer))
+
+    async def get_by_idempotency_key(
+        self, participation_id: UUID, idempotency_key: str
+    ) -> Optional[DomainAnswer]:
+        return self.answers.find(
+            IDEMPOTENCY_KEY_CONSTRAINT, (participation_id, idempotency_key)
+        )
+
+    async def get_answered_question_ids(
+        self, trivia_id: UUID, question_ids: Iterable[UUID]
+    ) -> Set[UUID]:
+        answered = self.store.answered_questions.get(trivia_id, {})
+        return {question_id for question_id in question_ids if question_id in answered}
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[List[DomainAnswer]]:
+        for batch in self.answers.batches(batch_size):
+            yield batch
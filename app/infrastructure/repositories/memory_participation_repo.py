@@ -0,0 +1,85 @@
+from dataclasses import replace
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.domain.entities.participation import Participation as DomainParticipation
+from app.domain.services.leaderboard import Leaderboard
+from app.domain.value_objects.participation_status import ParticipationStatus
+from app.infrastructure.memory.store import ConstraintViolation, MemorySession
+
+TRIVIA_USER_CONSTRAINT = "uq_participation_trivia_user"
+
+
+class ParticipationRepoInMemory:
+    """Participations with a leaderboard per trivia kept in step on every write."""
+
+    def __init__(self, session: MemorySession):
+        self.session = session
+        self.store = session.store
+        self.participations = session.store.participations
+
+    async def save(self, participation: DomainParticipation) -> DomainParticipation:
+        try:
+            self.session.record(
+                self.participations.insert(
+                    participation.id, participation, self.store.clock()
+                )
+            )
+        except ConstraintViolation:
+            await self.session.rollback()
+            raise
+        self.session.record(self.store.rank(participation))
+        await self.session.commit()
+        return replace(participation)
+
+    async def get_by_trivia_and_user(
+        self, trivia_id: UUID, user_id: UUID
+    ) -> Optional[DomainParticipation]:
+        return self.participations.find(TRIVIA_USER_CONSTRAINT, (trivia_id, user_id))
+
+    async def advance(
+        self,
+        participation_id: UUID,
+        points: int,
+        expected_answered_count: int,
+        finished_at: Optional[datetime] = None,
+    ) -> Optional[DomainParticipation]:
+        current = self.participations.rows.get(participation_id)
+        if (
+            current is None
+            or current.status != ParticipationStatus.IN_PROGRESS
+            or current.answered_count != expected_answered_count
+        ):
+            return None
+
+        advanced = replace(
+            current,
+            score_total=current.score_total + points,
+            answered_count=current.answered_count + 1,
+        )
+        if finished_at is not None:
+            advanced.status = ParticipationStatus.FINISHED
+            advanced.finished_at = finished_at
+        self._write(advanced)
+        return replace(advanced)
+
+    async def get_ranking_page(
+        self, trivia_id: UUID, offset: int, limit: int
+    ) -> list[dict]:
+        return self._leaderboard(trivia_id).page(offset, limit)
+
+    async def get_ranking_around(
+        self, trivia_id: UUID, user_id: UUID, neighbours: int
+    ) -> list[dict]:
+        return self._leaderboard(trivia_id).around(user_id, neighbours)
+
+    async def get_ranking_entry(self, trivia_id: UUID, user_id: UUID) -> Optional[dict]:
+        return self._leaderboard(trivia_id).entry(user_id)
+
+    def _leaderboard(self, trivia_id: UUID) -> Leaderboard:
+        return self.store.leaderboards.get(trivia_id) or Leaderboard()
+
+    def _write(self, participation: DomainParticipation) -> None:
+        self.session.record(self.participations.update(participation.id, participation))
+        self.session.record(self.store.rank(participation))
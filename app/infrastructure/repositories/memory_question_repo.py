@@ -0,0 +1,54 @@
+from typing import AsyncIterator, Iterable, List, Optional, Set
+from uuid import UUID
+
+from app.application.pagination import Page, PageCursor
+from app.application.versions import Version
+from app.domain.entities.question import Question as DomainQuestion
+from app.domain.value_objects.difficulty import Difficulty
+from app.infrastructure.memory.store import ConstraintViolation, MemorySession
+
+
+class QuestionRepoInMemory:
+    def __init__(self, session: MemorySession):
+        self.session = session
+        self.questions = session.store.questions
+
+    async def save(self, question: DomainQuestion) -> DomainQuestion:
+        try:
+            await self.save_many([question])
+        except ConstraintViolation:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        return question
+
+    async def save_many(self, questions: List[DomainQuestion]) -> None:
+        created_at = self.session.store.clock()
+        for question in questions:
+            self.session.record(
+                self.questions.insert(question.id, question, created_at)
+            )
+
+    async def get_all(self) -> List[DomainQuestion]:
+        return list(self.questions.scan())
+
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        difficulty: Optional[Difficulty] = None,
+    ) -> Page[DomainQuestion]:
+        return self.questions.page(limit, after, partition=difficulty)
+
+    async def get_version(self, difficulty: Optional[Difficulty] = None) -> Version:
+        return self.questions.version(partition=difficulty)
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[List[DomainQuestion]]:
+        for batch in self.questions.batches(batch_size):
+            yield batch
+
+    async def get_existing_ids(self, question_ids: Iterable[UUID]) -> Set[UUID]:
+        return {qid for qid in question_ids if qid in self.questions.rows}
+
+    async def get_by_id(self, question_id: UUID) -> Optional[DomainQuestion]:
+        return self.questions.get(question_id)
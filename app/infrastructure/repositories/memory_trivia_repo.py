@@ -0,0 +1,178 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from app.application.pagination import Page, PageCursor
+from app.application.versions import Version
+from app.domain.entities.trivia import Trivia as DomainTrivia
+from app.domain.services.answer_key import AnswerKey, AnswerKeyEntry
+from app.domain.value_objects.trivia_composition import TriviaComposition
+from app.infrastructure.memory.store import (
+    ConstraintViolation,
+    MemorySession,
+    TriviaRow,
+)
+
+
+class TriviaRepoInMemory:
+    def __init__(self, session: MemorySession):
+        self.session = session
+        self.store = session.store
+
+    async def save(self, trivia: DomainTrivia) -> DomainTrivia:
+        row = TriviaRow(id=trivia.id, name=trivia.name, description=trivia.description)
+        try:
+            self.session.record(
+                self.store.trivias.insert(trivia.id, row, self.store.clock())
+            )
+        except ConstraintViolation:
+            await self.session.rollback()
+            raise
+        self.session.record(
+            self.store.set_trivia_questions(trivia.id, trivia.question_ids)
+        )
+        for user_id in trivia.user_ids:
+            self.session.record(self.store.add_trivia_user(trivia.id, user_id))
+        await self.session.commit()
+        return trivia
+
+    async def get_by_id(self, trivia_id: UUID) -> Optional[DomainTrivia]:
+        row = self.store.trivias.rows.get(trivia_id)
+        return self._to_domain(row) if row else None
+
+    async def get_composition(self, trivia_id: UUID) -> Optional[TriviaComposition]:
+        row = self.store.trivias.rows.get(trivia_id)
+        if row is None:
+            return None
+        return TriviaComposition(
+            trivia_id=trivia_id,
+            name=row.name,
+            question_ids=tuple(self.store.trivia_questions.get(trivia_id, ())),
+            user_ids=frozenset(self.store.trivia_users.get(trivia_id, ())),
+            updated_at=self.store.trivias.updated_at[trivia_id],
+        )
+
+    async def get_question_ids(self, trivia_id: UUID) -> List[UUID]:
+        return list(self.store.trivia_questions.get(trivia_id, ()))
+
+    async def get_question_id_at(
+        self, trivia_id: UUID, position: int
+    ) -> Optional[UUID]:
+        question_ids = self.store.trivia_questions.get(trivia_id, ())
+        if 0 <= position < len(question_ids):
+            return question_ids[position]
+        return None
+
+    async def get_question_position(
+        self, trivia_id: UUID, question_id: UUID
+    ) -> Optional[int]:
+        return self.store.question_positions.get(trivia_id, {}).get(question_id)
+
+    async def get_answer_key(self, trivia_id: UUID) -> AnswerKey:
+        entries = {}
+        for question_id in self.store.trivia_questions.get(trivia_id, ()):
+            question = self.store.questions.rows[question_id]
+            for option in question.options:
+                entries[option.id] = AnswerKeyEntry(
+                    question_id=question_id,
+                    is_correct=option.is_correct,
+                    difficulty=question.difficulty,
+                )
+        return AnswerKey(entries)
+
+    async def get_by_user_id(self, user_id: UUID) -> List[DomainTrivia]:
+        return [
+            self._to_domain(self.store.trivias.rows[trivia_id])
+            for trivia_id in self.store.user_trivias.get(user_id, ())
+        ]
+
+    async def get_version(self, trivia_id: UUID) -> Optional[Version]:
+        updated_at = self.store.trivias.updated_at.get(trivia_id)
+        return Version(count=1, updated_at=updated_at) if updated_at else None
+
+    async def get_user_trivias_version(self, user_id: UUID) -> Version:
+        trivia_ids = self.store.user_trivias.get(user_id, {})
+        updated_at = self.store.trivias.updated_at
+        return Version(
+            count=len(trivia_ids),
+            updated_at=max((updated_at[t] for t in trivia_ids), default=None),
+        )
+
+    async def get_all(self) -> List[DomainTrivia]:
+        return [self._to_domain(row) for row in self.store.trivias.scan()]
+
+    async def get_page(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[DomainTrivia]:
+        page = self.store.trivias.page(limit, after)
+        return Page(
+            items=[self._to_domain(row) for row in page.items],
+            next_cursor=page.next_cursor,
+        )
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[List[DomainTrivia]]:
+        for rows in self.store.trivias.batches(batch_size):
+            yield [self._to_domain(row) for row in rows]
+
+    async def get_updated_at(self, trivia_id: UUID) -> Optional[datetime]:
+        return self.store.trivias.updated_at.get(trivia_id)
+
+    async def touch(self, trivia_id: UUID) -> bool:
+        if trivia_id not in self.store.trivias.rows:
+            return False
+        self.session.record(self.store.trivias.touch(trivia_id, self.store.clock()))
+        return True
+
+    async def add_users(self, trivia_id: UUID, user_ids: List[UUID]) -> List[UUID]:
+        members = self.store.trivia_users.get(trivia_id, {})
+        added = [
+            user_id for user_id in dict.fromkeys(user_ids) if user_id not in members
+        ]
+        for user_id in added:
+            self.session.record(self.store.add_trivia_user(trivia_id, user_id))
+        return added
+
+    async def remove_users(self, trivia_id: UUID, user_ids: List[UUID]) -> List[UUID]:
+        members = self.store.trivia_users.get(trivia_id, {})
+        removed = [user_id for user_id in dict.fromkeys(user_ids) if user_id in members]
+        for user_id in removed:
+            self.session.record(self.store.remove_trivia_user(trivia_id, user_id))
+        return removed
+
+    async def add_questions(
+        self, trivia_id: UUID, question_ids: List[UUID]
+    ) -> List[UUID]:
+        current = self.store.trivia_questions.get(trivia_id, [])
+        positions = self.store.question_positions.get(trivia_id, {})
+        added = [qid for qid in dict.fromkeys(question_ids) if qid not in positions]
+        if added:
+            self.session.record(
+                self.store.set_trivia_questions(trivia_id, current + added)
+            )
+        return added
+
+    async def remove_questions(
+        self, trivia_id: UUID, question_ids: List[UUID]
+    ) -> List[UUID]:
+        positions = self.store.question_positions.get(trivia_id, {})
+        removed = [qid for qid in dict.fromkeys(question_ids) if qid in positions]
+        if removed:
+            # Rebuilding the list keeps positions dense, as the participation
+            # cursor requires.
+            dropped = set(removed)
+            remaining = [
+                qid
+                for qid in self.store.trivia_questions[trivia_id]
+                if qid not in dropped
+            ]
+            self.session.record(self.store.set_trivia_questions(trivia_id, remaining))
+        return removed
+
+    def _to_domain(self, row: TriviaRow) -> DomainTrivia:
+        return DomainTrivia(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            question_ids=list(self.store.trivia_questions.get(row.id, ())),
+            user_ids=list(self.store.trivia_users.get(row.id, ())),
+        )
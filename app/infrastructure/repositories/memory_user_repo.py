@@ -0,0 +1,51 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.application.pagination import Page, PageCursor
+from app.domain.entities.user import User as DomainUser
+from app.domain.errors import EmailAlreadyRegistered
+from app.infrastructure.memory.store import MemorySession
+
+EMAIL_CONSTRAINT = "uq_users_email"
+
+
+class UserRepoInMemory:
+    def __init__(self, session: MemorySession):
+        self.session = session
+        self.users = session.store.users
+
+    async def save(self, user: DomainUser) -> DomainUser:
+        if self.users.find(EMAIL_CONSTRAINT, user.email) is not None:
+            await self.session.rollback()
+            raise EmailAlreadyRegistered(f"Email {user.email} is already registered")
+        self.session.record(
+            self.users.insert(user.id, user, self.session.store.clock())
+        )
+        await self.session.commit()
+        return user
+
+    async def save_many(self, users: List[DomainUser]) -> List[Tuple[UUID, bool]]:
+        stored: Dict[str, Tuple[UUID, bool]] = {}
+        for user in users:
+            if user.email in stored:
+                continue
+            existing = self.users.find(EMAIL_CONSTRAINT, user.email)
+            if existing is not None:
+                stored[user.email] = (existing.id, False)
+                continue
+            self.session.record(
+                self.users.insert(user.id, user, self.session.store.clock())
+            )
+            stored[user.email] = (user.id, True)
+        return [stored[user.email] for user in users]
+
+    async def get_existing_ids(self, user_ids: Iterable[UUID]) -> Set[UUID]:
+        return {user_id for user_id in user_ids if user_id in self.users.rows}
+
+    async def get_all(self) -> List[DomainUser]:
+        return list(self.users.scan())
+
+    async def get_page(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[DomainUser]:
+        return self.users.page(limit, after)
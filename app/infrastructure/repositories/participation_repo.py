@@ -2,13 +2,14 @@ from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.domain.entities.participation import Participation as DomainParticipation
 from app.infrastructure.db.models import (
     Participation as DBParticipation,
+    ParticipationStatus as DBParticipationStatus,
     User as DBUser,
 )
 
@@ -23,6 +24,7 @@ class ParticipationRepoSqlAlchemy:
             user_id=participation.user_id,
             status=participation.status,
             score_total=participation.score_total,
+            answered_count=participation.answered_count,
             started_at=participation.started_at,
             finished_at=participation.finished_at,
         )
@@ -49,43 +51,107 @@ class ParticipationRepoSqlAlchemy:
         db_participation = result.scalar_one_or_none()
         return self._to_domain(db_participation) if db_participation else None
 
-    async def update(self, participation: DomainParticipation) -> DomainParticipation:
+    async def advance(
+        self,
+        participation_id: UUID,
+        points: int,
+        expected_answered_count: int,
+        finished_at: Optional[datetime] = None,
+    ) -> Optional[DomainParticipation]:
+        values = {
+            "score_total": DBParticipation.score_total + points,
+            "answered_count": DBParticipation.answered_count + 1,
+        }
+        if finished_at is not None:
+            values["status"] = DBParticipationStatus.finished
+            values["finished_at"] = finished_at
+
         result = await self.session.execute(
-            select(DBParticipation).where(DBParticipation.id == participation.id)
+            update(DBParticipation)
+            .where(
+                DBParticipation.id == participation_id,
+                DBParticipation.status == DBParticipationStatus.in_progress,
+                DBParticipation.answered_count == expected_answered_count,
+            )
+            .values(**values)
+            .returning(DBParticipation)
+            .execution_options(populate_existing=True)
         )
         db_participation = result.scalar_one_or_none()
-        if not db_participation:
-            raise ValueError("Participation not found")
-
-        db_participation.status = participation.status
-        db_participation.score_total = participation.score_total
-        db_participation.finished_at = participation.finished_at
+        return self._to_domain(db_participation) if db_participation else None
 
-        try:
-            await self.session.commit()
-        except IntegrityError:
-            await self.session.rollback()
-            raise
+    async def get_ranking_page(
+        self, trivia_id: UUID, offset: int, limit: int
+    ) -> list[dict]:
+        ranked = self._ranked(trivia_id)
+        result = await self.session.execute(
+            select(ranked)
+            .where(ranked.c.rank > offset)
+            .order_by(ranked.c.rank)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in result.all()]
 
-        await self.session.refresh(db_participation)
-        return self._to_domain(db_participation)
+    async def get_ranking_around(
+        self, trivia_id: UUID, user_id: UUID, neighbours: int
+    ) -> list[dict]:
+        # The CTE is referenced twice, so it is materialized and the ranks are
+        # computed once.
+        ranked = self._ranked(trivia_id)
+        target = (
+            select(ranked.c.rank).where(ranked.c.user_id == user_id).subquery("target")
+        )
+        result = await self.session.execute(
+            select(ranked)
+            .join(
+                target,
+                ranked.c.rank.between(
+                    target.c.rank - neighbours, target.c.rank + neighbours
+                ),
+            )
+            .order_by(ranked.c.rank)
+        )
+        return [dict(row._mapping) for row in result.all()]
 
-    async def get_ranking(self, trivia_id: UUID) -> list[dict]:
+    async def get_ranking_entry(
+        self, trivia_id: UUID, user_id: UUID
+    ) -> Optional[dict]:
         result = await self.session.execute(
-            select(
-                DBUser.id.label("user_id"),
-                DBUser.name.label("user_name"),
-                DBParticipation.score_total.label("score"),
-                DBParticipation.finished_at.label("finished_at"),
+            self._ranking_query().where(
+                DBParticipation.trivia_id == trivia_id,
+                DBParticipation.user_id == user_id,
             )
-            .join(DBParticipation, DBUser.id == DBParticipation.user_id)
-            .where(DBParticipation.trivia_id == trivia_id)
-            .order_by(
-                DBParticipation.score_total.desc(),
-                DBParticipation.finished_at.asc().nullslast(),
+        )
+        row = result.one_or_none()
+        return dict(row._mapping) if row else None
+
+    @classmethod
+    def _ranked(cls, trivia_id: UUID):
+        return (
+            cls._ranking_query()
+            .add_columns(
+                func.row_number().over(order_by=cls._ranking_order()).label("rank")
             )
+            .where(DBParticipation.trivia_id == trivia_id)
+            .cte("ranked")
         )
-        return [dict(row._mapping) for row in result.all()]
+
+    @staticmethod
+    def _ranking_order():
+        return (
+            DBParticipation.score_total.desc(),
+            DBParticipation.finished_at.asc().nullslast(),
+            DBParticipation.user_id,
+        )
+
+    @staticmethod
+    def _ranking_query():
+        return select(
+            DBUser.id.label("user_id"),
+            DBUser.name.label("user_name"),
+            DBParticipation.score_total.label("score"),
+            DBParticipation.finished_at.label("finished_at"),
+        ).join(DBParticipation, DBUser.id == DBParticipation.user_id)
 
     @staticmethod
     def _to_domain(db_participation: DBParticipation) -> DomainParticipation:
@@ -97,4 +163,5 @@ class ParticipationRepoSqlAlchemy:
             score_total=db_participation.score_total,
             started_at=db_participation.started_at,
             finished_at=db_participation.finished_at,
+            answered_count=db_participation.answered_count,
         )
@@ -1,14 +1,25 @@
-from typing import List, Optional
+from typing import AsyncIterator, Iterable, List, Optional, Set
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
 
+from app.application.pagination import Page, PageCursor
+from app.application.versions import Version
 from app.domain.entities.question import Question as DomainQuestion, QuestionOption as DomainQuestionOption
-from app.infrastructure.db.models import Question as DBQuestion, QuestionOption as DBQuestionOption
+from app.domain.value_objects.difficulty import Difficulty
+from app.infrastructure.db.arrays import any_uuid
+from app.infrastructure.db.loading import QUESTION_WITH_OPTIONS, QUESTIONS_WITH_OPTIONS
+from app.infrastructure.db.models import (
+    CollectionVersion,
+    Question as DBQuestion,
+    QuestionOption as DBQuestionOption,
+)
+from app.infrastructure.db.pagination import keyset, to_page
 
+VERSION_NAME = "questions"
 
 class QuestionRepoSqlAlchemy:
     def __init__(self, session: AsyncSession):
@@ -30,28 +41,116 @@ class QuestionRepoSqlAlchemy:
             self.session.add(db_option)
 
         try:
+            await self._bump_version()
             await self.session.commit()
         except IntegrityError:
             await self.session.rollback()
             raise
 
-        await self.session.refresh(db_question)
-        return self._to_domain(db_question)
+        return question
+
+    async def save_many(self, questions: List[DomainQuestion]) -> None:
+        if not questions:
+            return
+        await self.session.execute(
+            insert(DBQuestion),
+            [
+                {
+                    "id": question.id,
+                    "text": question.text,
+                    "difficulty": question.difficulty,
+                }
+                for question in questions
+            ],
+        )
+        await self.session.execute(
+            insert(DBQuestionOption),
+            [
+                {
+                    "id": option.id,
+                    "question_id": question.id,
+                    "text": option.text,
+                    "is_correct": option.is_correct,
+                }
+                for question in questions
+                for option in question.options
+            ],
+        )
+        await self._bump_version()
 
     async def get_all(self) -> List[DomainQuestion]:
         result = await self.session.execute(
-            select(DBQuestion).options(selectinload(DBQuestion.options))
+            select(DBQuestion).options(*QUESTIONS_WITH_OPTIONS)
         )
         db_questions = result.scalars().all()
         return [self._to_domain(db_question) for db_question in db_questions]
 
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        difficulty: Optional[Difficulty] = None,
+    ) -> Page[DomainQuestion]:
+        stmt = select(DBQuestion).options(*QUESTIONS_WITH_OPTIONS)
+        if difficulty is not None:
+            stmt = stmt.where(DBQuestion.difficulty == difficulty)
+        result = await self.session.execute(keyset(stmt, DBQuestion, limit, after))
+        return to_page(result.scalars().all(), limit, self._to_domain)
+
+    async def get_version(self, difficulty: Optional[Difficulty] = None) -> Version:
+        # Every question write bumps one counter, so any filter can be
+        # validated with a primary-key read instead of scanning the table.
+        result = await self.session.execute(
+            select(CollectionVersion.version, CollectionVersion.updated_at).where(
+                CollectionVersion.name == VERSION_NAME
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return Version(count=0, updated_at=None)
+        return Version(count=row.version, updated_at=row.updated_at)
+
+    async def _bump_version(self) -> None:
+        # Writers queue on this row until they commit, which keeps the counter
+        # in commit order; question writes are rare admin operations.
+        versions = CollectionVersion.__table__
+        await self.session.execute(
+            pg_insert(versions)
+            .values(name=VERSION_NAME, version=1)
+            .on_conflict_do_update(
+                index_elements=[versions.c.name],
+                set_={"version": versions.c.version + 1, "updated_at": func.now()},
+            )
+        )
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[List[DomainQuestion]]:
+        result = await self.session.stream_scalars(
+            select(DBQuestion)
+            .options(*QUESTIONS_WITH_OPTIONS)
+            .order_by(DBQuestion.created_at, DBQuestion.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for db_questions in result.partitions():
+            yield [self._to_domain(db_question) for db_question in db_questions]
+
+    async def get_existing_ids(self, question_ids: Iterable[UUID]) -> Set[UUID]:
+        question_ids = list(question_ids)
+        if not question_ids:
+            return set()
+        result = await self.session.execute(
+            select(DBQuestion.id).where(
+                DBQuestion.id == any_uuid("question_ids", question_ids)
+            )
+        )
+        return set(result.scalars().all())
+
     async def get_by_id(self, question_id: UUID) -> Optional[DomainQuestion]:
         result = await self.session.execute(
             select(DBQuestion)
-            .options(selectinload(DBQuestion.options))
+            .options(*QUESTION_WITH_OPTIONS)
             .where(DBQuestion.id == question_id)
         )
-        db_question = result.scalar_one_or_none()
+        db_question = result.unique().scalar_one_or_none()
         return self._to_domain(db_question) if db_question else None
 
     @staticmethod
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.application.ports.participation_repo import ParticipationRepo
+from app.application.ports.unit_of_work import UnitOfWork
+from app.domain.entities.participation import Participation as DomainParticipation
+from app.domain.services.leaderboard import Leaderboard
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.config import settings
+
+leaderboard_cache: LRUCache[Leaderboard] = LRUCache(
+    maxsize=settings.leaderboard_cache_size, ttl=settings.leaderboard_cache_ttl
+)
+
+
+class RankedParticipationRepo:
+    """Keeps an in-memory leaderboard per trivia in step with participation writes.
+
+    Boards hold the top ``size`` entries and are reloaded from the paged
+    ranking query when missing or expired, which bounds how stale a board can
+    get across processes. Ranks past the board go to the repository's windowed
+    queries, so no read loads a trivia's whole ranking. Writes
+    staged in ``unit_of_work`` reach the board only once it commits, so a
+    rollback never leaves a score the database does not have. Without a unit
+    of work the board is dropped instead and rebuilt on the next read.
+    """
+
+    def __init__(
+        self,
+        repo: ParticipationRepo,
+        cache: LRUCache[Leaderboard],
+        unit_of_work: Optional[UnitOfWork] = None,
+        size: int = settings.leaderboard_size,
+    ):
+        self.repo = repo
+        self.cache = cache
+        self.unit_of_work = unit_of_work
+        self.size = size
+
+    async def save(self, participation: DomainParticipation) -> DomainParticipation:
+        saved = await self.repo.save(participation)
+        await self._refresh_entry(saved.trivia_id, saved.user_id)
+        return saved
+
+    async def get_by_trivia_and_user(
+        self, trivia_id: UUID, user_id: UUID
+    ) -> Optional[DomainParticipation]:
+        return await self.repo.get_by_trivia_and_user(trivia_id, user_id)
+
+    async def advance(
+        self,
+        participation_id: UUID,
+        points: int,
+        expected_answered_count: int,
+        finished_at: Optional[datetime] = None,
+    ) -> Optional[DomainParticipation]:
+        advanced = await self.repo.advance(
+            participation_id, points, expected_answered_count, finished_at
+        )
+        if advanced is not None:
+            self._record_on_commit(advanced)
+        return advanced
+
+    async def get_ranking_page(
+        self, trivia_id: UUID, offset: int, limit: int
+    ) -> list[dict]:
+        leaderboard = await self.get_leaderboard(trivia_id)
+        if leaderboard.covers(offset + limit):
+            return leaderboard.page(offset, limit)
+        return await self.repo.get_ranking_page(trivia_id, offset, limit)
+
+    async def get_ranking_around(
+        self, trivia_id: UUID, user_id: UUID, neighbours: int
+    ) -> list[dict]:
+        leaderboard = await self.get_leaderboard(trivia_id)
+        rank = leaderboard.rank_of(user_id)
+        if leaderboard.complete or (
+            rank is not None and leaderboard.covers(rank + neighbours)
+        ):
+            return leaderboard.around(user_id, neighbours)
+        return await self.repo.get_ranking_around(trivia_id, user_id, neighbours)
+
+    async def get_ranking_entry(
+        self, trivia_id: UUID, user_id: UUID
+    ) -> Optional[dict]:
+        return await self.repo.get_ranking_entry(trivia_id, user_id)
+
+    async def get_leaderboard(self, trivia_id: UUID) -> Leaderboard:
+        leaderboard = self.cache.get(trivia_id)
+        if leaderboard is None:
+            # One entry past the top tells whether it holds every participant.
+            top = await self.repo.get_ranking_page(trivia_id, 0, self.size + 1)
+            leaderboard = Leaderboard(top, self.size)
+            self.cache.set(trivia_id, leaderboard)
+        return leaderboard
+
+    def _record_on_commit(self, participation: DomainParticipation) -> None:
+        if self.unit_of_work is None:
+            self.cache.invalidate(participation.trivia_id)
+            return
+        self.unit_of_work.after_commit(lambda: self._record(participation))
+
+    def _record(self, participation: DomainParticipation) -> None:
+        leaderboard = self.cache.get(participation.trivia_id)
+        if leaderboard is None:
+            return
+        updated = leaderboard.update_score(
+            participation.user_id, participation.score_total, participation.finished_at
+        )
+        if not updated:
+            self.cache.invalidate(participation.trivia_id)
+
+    async def _refresh_entry(self, trivia_id: UUID, user_id: UUID) -> None:
+        leaderboard = self.cache.get(trivia_id)
+        if leaderboard is None:
+            return
+        entry = await self.repo.get_ranking_entry(trivia_id, user_id)
+        if entry is not None:
+            leaderboard.upsert(entry)
@@ -1,18 +1,68 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    DateTime,
+    Row,
+    Uuid,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
 
+from app.application.pagination import Page, PageCursor
+from app.application.versions import Version
 from app.domain.entities.trivia import Trivia as DomainTrivia
+from app.domain.errors import QuestionsAlreadyAnswered
+from app.domain.services.answer_key import AnswerKey, AnswerKeyEntry
+from app.domain.value_objects.trivia_composition import TriviaComposition
+from app.infrastructure.db.arrays import any_uuid, uuid_array
+from app.infrastructure.db.loading import TRIVIAS_WITH_MEMBER_IDS
+from app.infrastructure.db.pagination import keyset, to_page
 from app.infrastructure.db.models import (
+    Question as DBQuestion,
+    QuestionOption as DBQuestionOption,
     Trivia as DBTrivia,
     TriviaQuestion,
     TriviaUser,
 )
 
+
+class _MemberIds:
+    """Walks a (created_at, trivia_id, member_id) stream in trivia order."""
+
+    def __init__(self, rows: AsyncIterator[Row]):
+        self.rows = rows.__aiter__()
+        self.pending: Optional[Row] = None
+        self.exhausted = False
+
+    async def take(self, key: Tuple[datetime, UUID]) -> List[UUID]:
+        member_ids: List[UUID] = []
+        while not self.exhausted:
+            if self.pending is None:
+                try:
+                    self.pending = await self.rows.__anext__()
+                except StopAsyncIteration:
+                    self.exhausted = True
+                    break
+            row_key = (self.pending[0], self.pending[1])
+            if row_key > key:
+                break
+            # Rows sorting before the trivia belong to one the trivia query
+            # did not see, so they are dropped with it.
+            if row_key == key:
+                member_ids.append(self.pending[2])
+            self.pending = None
+        return member_ids
+
+
 class TriviaRepoSqlAlchemy:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -23,55 +73,354 @@ class TriviaRepoSqlAlchemy:
         )
         self.session.add(db_trivia)
 
-        # Add question associations
-        for question_id in trivia.question_ids:
-            trivia_question = TriviaQuestion(
-                trivia_id=trivia.id, question_id=question_id
-            )
-            self.session.add(trivia_question)
-
-        # Add user associations
-        for user_id in trivia.user_ids:
-            trivia_user = TriviaUser(trivia_id=trivia.id, user_id=user_id)
-            self.session.add(trivia_user)
-
         try:
+            await self.session.flush()
+            # Association rows go out as executemany batches rather than one
+            # ORM object per member.
+            if trivia.question_ids:
+                await self.session.execute(
+                    insert(TriviaQuestion),
+                    [
+                        {
+                            "trivia_id": trivia.id,
+                            "question_id": question_id,
+                            "position": position,
+                        }
+                        for position, question_id in enumerate(trivia.question_ids)
+                    ],
+                )
+            if trivia.user_ids:
+                await self.session.execute(
+                    insert(TriviaUser),
+                    [
+                        {"trivia_id": trivia.id, "user_id": user_id}
+                        for user_id in trivia.user_ids
+                    ],
+                )
             await self.session.commit()
         except IntegrityError:
             await self.session.rollback()
             raise
 
-        await self.session.refresh(db_trivia)
-        return self._to_domain(db_trivia)
+        return trivia
 
     async def get_by_id(self, trivia_id: UUID) -> Optional[DomainTrivia]:
         result = await self.session.execute(
             select(DBTrivia)
-            .options(selectinload(DBTrivia.questions), selectinload(DBTrivia.users))
+            .options(*TRIVIAS_WITH_MEMBER_IDS)
             .where(DBTrivia.id == trivia_id)
         )
         db_trivia = result.scalar_one_or_none()
         return self._to_domain(db_trivia) if db_trivia else None
 
+    async def get_composition(self, trivia_id: UUID) -> Optional[TriviaComposition]:
+        result = await self.session.execute(
+            select(DBTrivia.name, DBTrivia.updated_at).where(DBTrivia.id == trivia_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        question_ids = await self.get_question_ids(trivia_id)
+        result = await self.session.execute(
+            select(TriviaUser.user_id).where(TriviaUser.trivia_id == trivia_id)
+        )
+        return TriviaComposition(
+            trivia_id=trivia_id,
+            name=row.name,
+            question_ids=tuple(question_ids),
+            user_ids=frozenset(result.scalars().all()),
+            updated_at=row.updated_at,
+        )
+
+    async def get_question_ids(self, trivia_id: UUID) -> List[UUID]:
+        result = await self.session.execute(
+            select(TriviaQuestion.question_id)
+            .where(TriviaQuestion.trivia_id == trivia_id)
+            .order_by(TriviaQuestion.position)
+        )
+        return list(result.scalars().all())
+
+    async def get_question_id_at(
+        self, trivia_id: UUID, position: int
+    ) -> Optional[UUID]:
+        result = await self.session.execute(
+            select(TriviaQuestion.question_id).where(
+                TriviaQuestion.trivia_id == trivia_id,
+                TriviaQuestion.position == position,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_question_position(
+        self, trivia_id: UUID, question_id: UUID
+    ) -> Optional[int]:
+        result = await self.session.execute(
+            select(TriviaQuestion.position).where(
+                TriviaQuestion.trivia_id == trivia_id,
+                TriviaQuestion.question_id == question_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_answer_key(self, trivia_id: UUID) -> AnswerKey:
+        result = await self.session.execute(
+            select(
+                DBQuestionOption.id,
+                DBQuestionOption.question_id,
+                DBQuestionOption.is_correct,
+                DBQuestion.difficulty,
+            )
+            .join(DBQuestion, DBQuestion.id == DBQuestionOption.question_id)
+            .join(TriviaQuestion, TriviaQuestion.question_id == DBQuestion.id)
+            .where(TriviaQuestion.trivia_id == trivia_id)
+        )
+        return AnswerKey(
+            {
+                row.id: AnswerKeyEntry(
+                    question_id=row.question_id,
+                    is_correct=row.is_correct,
+                    difficulty=row.difficulty,
+                )
+                for row in result.all()
+            }
+        )
+
     async def get_by_user_id(self, user_id: UUID) -> List[DomainTrivia]:
         result = await self.session.execute(
             select(DBTrivia)
             .join(TriviaUser, DBTrivia.id == TriviaUser.trivia_id)
-            .options(selectinload(DBTrivia.questions), selectinload(DBTrivia.users))
+            .options(*TRIVIAS_WITH_MEMBER_IDS)
             .where(TriviaUser.user_id == user_id)
         )
         db_trivias = result.scalars().all()
         return [self._to_domain(db_trivia) for db_trivia in db_trivias]
 
-    async def get_all(self) -> List[DomainTrivia]:
+    async def get_version(self, trivia_id: UUID) -> Optional[Version]:
+        # Membership changes go through touch(), so updated_at covers them.
+        result = await self.session.execute(
+            select(DBTrivia.updated_at).where(DBTrivia.id == trivia_id)
+        )
+        updated_at = result.scalar_one_or_none()
+        return Version(count=1, updated_at=updated_at) if updated_at else None
+
+    async def get_user_trivias_version(self, user_id: UUID) -> Version:
         result = await self.session.execute(
-            select(DBTrivia).options(
-                selectinload(DBTrivia.questions), selectinload(DBTrivia.users)
+            select(
+                func.count(),
+                func.greatest(
+                    func.max(DBTrivia.updated_at),
+                    func.max(TriviaUser.created_at),
+                    type_=DateTime(timezone=True),
+                ),
             )
+            .select_from(TriviaUser)
+            .join(DBTrivia, DBTrivia.id == TriviaUser.trivia_id)
+            .where(TriviaUser.user_id == user_id)
+        )
+        count, updated_at = result.one()
+        return Version(count=count, updated_at=updated_at)
+
+    async def get_all(self) -> List[DomainTrivia]:
+        result = await self.session.execute(
+            select(DBTrivia).options(*TRIVIAS_WITH_MEMBER_IDS)
         )
         db_trivias = result.scalars().all()
         return [self._to_domain(db_trivia) for db_trivia in db_trivias]
 
+    async def get_page(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[DomainTrivia]:
+        stmt = select(DBTrivia).options(*TRIVIAS_WITH_MEMBER_IDS)
+        result = await self.session.execute(keyset(stmt, DBTrivia, limit, after))
+        return to_page(result.scalars().all(), limit, self._to_domain)
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[List[DomainTrivia]]:
+        # Member ids stream as their own ordered queries and are merged in
+        # here; eager loading a page of trivias would pull every member of all
+        # of them at once.
+        order = (DBTrivia.created_at, DBTrivia.id)
+        trivias = await self.session.stream(
+            select(*order, DBTrivia.name, DBTrivia.description)
+            .order_by(*order)
+            .execution_options(yield_per=batch_size)
+        )
+        question_ids = _MemberIds(
+            await self.session.stream(
+                select(*order, TriviaQuestion.question_id)
+                .join(TriviaQuestion, TriviaQuestion.trivia_id == DBTrivia.id)
+                .order_by(*order, TriviaQuestion.position)
+                .execution_options(yield_per=batch_size)
+            )
+        )
+        user_ids = _MemberIds(
+            await self.session.stream(
+                select(*order, TriviaUser.user_id)
+                .join(TriviaUser, TriviaUser.trivia_id == DBTrivia.id)
+                .order_by(*order, TriviaUser.user_id)
+                .execution_options(yield_per=batch_size)
+            )
+        )
+
+        batch: List[DomainTrivia] = []
+        member_count = 0
+        async for row in trivias:
+            key = (row.created_at, row.id)
+            trivia = DomainTrivia(
+                id=row.id,
+                name=row.name,
+                description=row.description,
+                question_ids=await question_ids.take(key),
+                user_ids=await user_ids.take(key),
+            )
+            size = len(trivia.question_ids) + len(trivia.user_ids)
+            # Cut on member ids as well as trivias, so a batch of large
+            # trivias holds no more rows than a batch of empty ones.
+            if batch and (
+                len(batch) == batch_size or member_count + size > batch_size
+            ):
+                yield batch
+                batch, member_count = [], 0
+            batch.append(trivia)
+            member_count += size
+        if batch:
+            yield batch
+
+    async def get_updated_at(self, trivia_id: UUID) -> Optional[datetime]:
+        result = await self.session.execute(
+            select(DBTrivia.updated_at).where(DBTrivia.id == trivia_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def touch(self, trivia_id: UUID) -> bool:
+        result = await self.session.execute(
+            update(DBTrivia)
+            .where(DBTrivia.id == trivia_id)
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    async def add_users(self, trivia_id: UUID, user_ids: List[UUID]) -> List[UUID]:
+        if not user_ids:
+            return []
+        trivia_users = TriviaUser.__table__
+        result = await self.session.execute(
+            pg_insert(trivia_users)
+            .from_select(
+                ["trivia_id", "user_id"],
+                select(
+                    literal(trivia_id, Uuid()),
+                    func.unnest(uuid_array("user_ids", user_ids)),
+                ),
+            )
+            .on_conflict_do_nothing()
+            .returning(trivia_users.c.user_id)
+        )
+        added = set(result.scalars().all())
+        return [user_id for user_id in user_ids if user_id in added]
+
+    async def remove_users(
+        self, trivia_id: UUID, user_ids: List[UUID]
+    ) -> List[UUID]:
+        if not user_ids:
+            return []
+        result = await self.session.execute(
+            delete(TriviaUser)
+            .where(
+                TriviaUser.trivia_id == trivia_id,
+                TriviaUser.user_id == any_uuid("user_ids", user_ids),
+            )
+            .returning(TriviaUser.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        removed = set(result.scalars().all())
+        return [user_id for user_id in user_ids if user_id in removed]
+
+    async def add_questions(
+        self, trivia_id: UUID, question_ids: List[UUID]
+    ) -> List[UUID]:
+        if not question_ids:
+            return []
+        result = await self.session.execute(
+            select(TriviaQuestion.question_id).where(
+                TriviaQuestion.trivia_id == trivia_id,
+                TriviaQuestion.question_id == any_uuid("question_ids", question_ids),
+            )
+        )
+        present = set(result.scalars().all())
+        new_ids = [qid for qid in question_ids if qid not in present]
+        if not new_ids:
+            return []
+
+        result = await self.session.execute(
+            select(func.coalesce(func.max(TriviaQuestion.position) + 1, 0)).where(
+                TriviaQuestion.trivia_id == trivia_id
+            )
+        )
+        start = result.scalar_one()
+        await self.session.execute(
+            insert(TriviaQuestion),
+            [
+                {
+                    "trivia_id": trivia_id,
+                    "question_id": question_id,
+                    "position": start + offset,
+                }
+                for offset, question_id in enumerate(new_ids)
+            ],
+        )
+        return new_ids
+
+    async def remove_questions(
+        self, trivia_id: UUID, question_ids: List[UUID]
+    ) -> List[UUID]:
+        if not question_ids:
+            return []
+        try:
+            result = await self.session.execute(
+                delete(TriviaQuestion)
+                .where(
+                    TriviaQuestion.trivia_id == trivia_id,
+                    TriviaQuestion.question_id
+                    == any_uuid("question_ids", question_ids),
+                )
+                .returning(TriviaQuestion.question_id)
+                .execution_options(synchronize_session=False)
+            )
+        except IntegrityError as e:
+            # An answer committed after the caller checked for answers; the
+            # composite FK on answers keeps the question in place.
+            raise QuestionsAlreadyAnswered(question_ids) from e
+        removed = set(result.scalars().all())
+        if removed:
+            await self._renumber_questions(trivia_id)
+        return [qid for qid in question_ids if qid in removed]
+
+    async def _renumber_questions(self, trivia_id: UUID) -> None:
+        # Positions are the participation cursor, so they must stay dense.
+        # Only rows after a removed question are rewritten.
+        ranked = (
+            select(
+                TriviaQuestion.question_id,
+                (
+                    func.row_number().over(order_by=TriviaQuestion.position) - 1
+                ).label("position"),
+            )
+            .where(TriviaQuestion.trivia_id == trivia_id)
+            .subquery()
+        )
+        await self.session.execute(
+            update(TriviaQuestion)
+            .where(
+                TriviaQuestion.trivia_id == trivia_id,
+                TriviaQuestion.question_id == ranked.c.question_id,
+                TriviaQuestion.position != ranked.c.position,
+            )
+            .values(position=ranked.c.position)
+            .execution_options(synchronize_session=False)
+        )
+
     @staticmethod
     def _to_domain(db_trivia: DBTrivia) -> DomainTrivia:
         return DomainTrivia(
@@ -1,11 +1,17 @@
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
+from app.application.pagination import Page, PageCursor
 from app.domain.entities.user import User as DomainUser
+from app.domain.errors import EmailAlreadyRegistered
+from app.infrastructure.db.arrays import any_uuid
 from app.infrastructure.db.models import User as DBUser
+from app.infrastructure.db.pagination import keyset, to_page
 
 
 class UserRepoSqlAlchemy:
@@ -17,17 +23,68 @@ class UserRepoSqlAlchemy:
         self.session.add(db_user)
         try:
             await self.session.commit()
-        except IntegrityError:
+        except IntegrityError as e:
             await self.session.rollback()
-            raise
+            raise EmailAlreadyRegistered(
+                f"Email {user.email} is already registered"
+            ) from e
         await self.session.refresh(db_user)
         return self._to_domain(db_user)
 
+    async def save_many(self, users: List[DomainUser]) -> List[Tuple[UUID, bool]]:
+        # A repeated email would conflict with its own first occurrence.
+        unique: Dict[str, DomainUser] = {}
+        for user in users:
+            unique.setdefault(user.email, user)
+        stored: Dict[str, Tuple[UUID, bool]] = {}
+        pending = list(unique.values())
+        # A conflicting row can be deleted before it is looked up; its email is
+        # then inserted again on the next pass.
+        while pending:
+            result = await self.session.execute(
+                insert(DBUser)
+                .values(
+                    [
+                        {"id": user.id, "name": user.name, "email": user.email}
+                        for user in pending
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=[DBUser.email])
+                .returning(DBUser.id, DBUser.email)
+            )
+            stored.update((email, (user_id, True)) for user_id, email in result.all())
+            missing = [user.email for user in pending if user.email not in stored]
+            if missing:
+                result = await self.session.execute(
+                    select(DBUser.id, DBUser.email).where(DBUser.email.in_(missing))
+                )
+                stored.update(
+                    (email, (user_id, False)) for user_id, email in result.all()
+                )
+            pending = [user for user in pending if user.email not in stored]
+        return [stored[user.email] for user in users]
+
+    async def get_existing_ids(self, user_ids: Iterable[UUID]) -> Set[UUID]:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        result = await self.session.execute(
+            select(DBUser.id).where(DBUser.id == any_uuid("user_ids", user_ids))
+        )
+        return set(result.scalars().all())
+
     async def get_all(self) -> List[DomainUser]:
         result = await self.session.execute(select(DBUser))
         db_users = result.scalars().all()
         return [self._to_domain(db_user) for db_user in db_users]
 
+    async def get_page(
+        self, limit: int, after: Optional[PageCursor] = None
+    ) -> Page[DomainUser]:
+        stmt = keyset(select(DBUser), DBUser, limit, after)
+        result = await self.session.execute(stmt)
+        return to_page(result.scalars().all(), limit, self._to_domain)
+
     @staticmethod
     def _to_domain(db_user: DBUser) -> DomainUser:
         return DomainUser(id=db_user.id, name=db_user.name, email=db_user.email)
@@ -1,14 +1,57 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from app.api.routes import health, users, questions, trivias, play
+from app.api.middleware import (
+    MetricsMiddleware,
+    QueryInstrumentationMiddleware,
+    ReadYourWritesMiddleware,
+)
+from app.api.routes import health, users, questions, trivias, play, exports, metrics
+from app.infrastructure.backend import load_memory_snapshot, save_memory_snapshot
+from app.infrastructure.config import settings
+from app.infrastructure.db.instrumentation import install_query_hooks
+from app.infrastructure.db.session import engine, prewarm_pool, read_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.repository_backend == "memory":
+        load_memory_snapshot()
+        yield
+        save_memory_snapshot()
+        return
+
+    engines = [engine] if read_engine is engine else [engine, read_engine]
+    for pooled in engines:
+        await prewarm_pool(pooled, settings.prewarm_connections)
+    yield
+    for pooled in engines:
+        await pooled.dispose()
+
+
+app = FastAPI(title="TalaTrivia API", lifespan=lifespan)
 
-app = FastAPI(title="TalaTrivia API")
+if settings.sql_instrumentation:
+    install_query_hooks()
+    app.add_middleware(
+        QueryInstrumentationMiddleware,
+        n_plus_one_threshold=settings.n_plus_one_threshold,
+    )
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if read_engine is not engine:
+    app.add_middleware(
+        ReadYourWritesMiddleware, window=settings.read_your_writes_window
+    )
 
 app.include_router(health.router)
 app.include_router(users.router)
 app.include_router(questions.router)
 app.include_router(trivias.router)
 app.include_router(play.router)
+app.include_router(exports.router)
+app.include_router(metrics.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,176 @@
+"""Drives concurrent players through the play/answer flow.
+
+    python -m benchmarks.play_flow --base-url http://localhost:8000 \\
+        --players 500 --concurrency 50
+
+Each player starts with ``GET /users/{user_id}/trivias/{trivia_id}/play`` and
+follows the ``answer`` links, picking a random option each time, until the
+trivia is finished. Start the API with ``SQL_INSTRUMENTATION=true`` so the
+query counts in ``Server-Timing`` are captured. Results are printed and saved
+as JSON under ``benchmarks/results/``.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from benchmarks.report import EndpointSamples, parse_query_count
+from benchmarks.seed import DEFAULT_MANIFEST
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class PlayFlow:
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.samples = {"play": EndpointSamples(), "answer": EndpointSamples()}
+        self.players_finished = 0
+        self.players_failed = 0
+
+    async def _request(self, endpoint: str, method: str, url: str) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(method, url)
+        self.samples[endpoint].record(
+            time.perf_counter() - started,
+            response.status_code,
+            parse_query_count(response.headers.get("server-timing")),
+        )
+        return response
+
+    async def play(self, user_id: str, trivia_id: str) -> None:
+        response = await self._request(
+            "play", "GET", f"/users/{user_id}/trivias/{trivia_id}/play"
+        )
+        while response.status_code == 200:
+            data = response.json()
+            if data.get("finished"):
+                self.players_finished += 1
+                return
+            option = self.rng.choice(data["options"])
+            response = await self._request("answer", "POST", option["answer"])
+        self.players_failed += 1
+
+    async def worker(self, players: asyncio.Queue) -> None:
+        while True:
+            try:
+                user_id, trivia_id = players.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await self.play(user_id, trivia_id)
+            except httpx.HTTPError:
+                self.players_failed += 1
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    manifest = json.loads(args.manifest.read_text())
+    players = manifest["players"][args.offset : args.offset + args.players]
+    if not players:
+        raise SystemExit("No players left in the manifest; re-seed or lower --offset")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for player in players:
+        queue.put_nowait(player)
+
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        flow = PlayFlow(client, random.Random(args.seed))
+        started = time.perf_counter()
+        await asyncio.gather(*(flow.worker(queue) for _ in range(args.concurrency)))
+        duration = time.perf_counter() - started
+
+    total = EndpointSamples()
+    for samples in flow.samples.values():
+        total.latencies.extend(samples.latencies)
+        total.queries.extend(samples.queries)
+        total.errors += samples.errors
+        for status, count in samples.statuses.items():
+            total.statuses[status] = total.statuses.get(status, 0) + count
+
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "config": {
+            "base_url": args.base_url,
+            "players": len(players),
+            "offset": args.offset,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "dataset": manifest["config"],
+        },
+        "duration_seconds": duration,
+        "players_finished": flow.players_finished,
+        "players_failed": flow.players_failed,
+        "total": total.summary(duration),
+        "endpoints": {
+            name: samples.summary(duration) for name, samples in flow.samples.items()
+        },
+    }
+
+
+def _print_summary(results: dict) -> None:
+    print(
+        f"{results['players_finished']} players finished, "
+        f"{results['players_failed']} failed in {results['duration_seconds']:.1f}s"
+    )
+    for name, summary in [("total", results["total"]), *results["endpoints"].items()]:
+        latency = summary["latency_ms"]
+        queries = summary["queries_per_request"]
+        print(
+            f"{name:>6}: {summary['requests']} req, "
+            f"{summary['throughput_rps']:.1f} req/s, "
+            f"p50 {latency['p50']:.1f}ms p95 {latency['p95']:.1f}ms "
+            f"p99 {latency['p99']:.1f}ms, "
+            + (f"{queries['mean']:.1f} queries/req" if queries else "queries n/a")
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument(
+        "--offset", type=int, default=0, help="skip players used by earlier runs"
+    )
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    _print_summary(results)
+
+    output = args.output or RESULTS_DIR / (
+        f"play_flow-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Latency and query-count summaries for benchmark runs."""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+_QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+
+
+def parse_query_count(server_timing: Optional[str]) -> Optional[int]:
+    """Reads the query count the SQL instrumentation middleware puts in
+    ``Server-Timing``. ``None`` when instrumentation is off on the server."""
+    if not server_timing:
+        return None
+    match = _QUERY_COUNT.search(server_timing)
+    return int(match.group(1)) if match else None
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class EndpointSamples:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def record(
+        self, latency: float, status: int, queries: Optional[int] = None
+    ) -> None:
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+        if queries is not None:
+            self.queries.append(queries)
+
+    def summary(self, duration: float) -> dict:
+        latencies_ms = [latency * 1000 for latency in self.latencies]
+        count = len(latencies_ms)
+        summary = {
+            "requests": count,
+            "errors": self.errors,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+            "throughput_rps": count / duration if duration else 0.0,
+            "latency_ms": {
+                "mean": sum(latencies_ms) / count if count else 0.0,
+                "p50": percentile(latencies_ms, 50),
+                "p95": percentile(latencies_ms, 95),
+                "p99": percentile(latencies_ms, 99),
+                "max": max(latencies_ms, default=0.0),
+            },
+            "queries_per_request": None,
+        }
+        if self.queries:
+            summary["queries_per_request"] = {
+                "mean": sum(self.queries) / len(self.queries),
+                "p95": percentile(self.queries, 95),
+                "max": max(self.queries),
+            }
+        return summary
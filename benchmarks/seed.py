@@ -0,0 +1,205 @@
+"""Seeds a database with a realistic play/answer workload.
+
+    python -m benchmarks.seed --users 20000 --questions 5000 --trivias 50
+
+Rows are written with executemany batches straight to the tables, bypassing
+the API, and the (user, trivia) assignments are saved to a manifest that
+``benchmarks.play_flow`` replays. Every assignment can be played once, so
+re-seed with ``--reset`` between runs.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from sqlalchemy import Table, insert, text
+
+from app.infrastructure.config import settings
+from app.infrastructure.db.models import (
+    Difficulty,
+    Question,
+    QuestionOption,
+    Trivia,
+    TriviaQuestion,
+    TriviaUser,
+    User,
+)
+from app.infrastructure.db.session import create_engine
+
+DEFAULT_MANIFEST = Path(__file__).parent / "results" / "manifest.json"
+INSERT_BATCH_SIZE = 5000
+OPTIONS_PER_QUESTION = 4
+
+TABLES = (
+    "answers",
+    "participations",
+    "trivia_users",
+    "trivia_questions",
+    "trivias",
+    "question_options",
+    "questions",
+    "users",
+)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    # Drawn from the seeded generator so reruns produce the same dataset.
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _insert(conn, table: Table, rows: Iterable[dict]) -> int:
+    inserted = 0
+    for batch in _batches(rows, INSERT_BATCH_SIZE):
+        await conn.execute(insert(table), batch)
+        inserted += len(batch)
+    return inserted
+
+
+def _plan(args: argparse.Namespace, rng: random.Random) -> dict[str, list[dict]]:
+    if args.questions_per_trivia > args.questions:
+        raise SystemExit("--questions-per-trivia cannot exceed --questions")
+    if args.trivias_per_user > args.trivias:
+        raise SystemExit("--trivias-per-user cannot exceed --trivias")
+
+    users = [
+        {
+            "id": _uuid(rng),
+            "name": f"Player {i}",
+            "email": f"player{i}@bench.example.com",
+        }
+        for i in range(args.users)
+    ]
+    difficulties = list(Difficulty)
+    questions, options = [], []
+    for i in range(args.questions):
+        question_id = _uuid(rng)
+        questions.append(
+            {
+                "id": question_id,
+                "text": f"Benchmark question {i}?",
+                "difficulty": rng.choice(difficulties),
+            }
+        )
+        correct = rng.randrange(OPTIONS_PER_QUESTION)
+        options.extend(
+            {
+                "id": _uuid(rng),
+                "question_id": question_id,
+                "text": f"Option {n}",
+                "is_correct": n == correct,
+            }
+            for n in range(OPTIONS_PER_QUESTION)
+        )
+
+    trivias, trivia_questions = [], []
+    question_ids = [q["id"] for q in questions]
+    for i in range(args.trivias):
+        trivia_id = _uuid(rng)
+        trivias.append(
+            {"id": trivia_id, "name": f"Benchmark trivia {i}", "description": None}
+        )
+        trivia_questions.extend(
+            {"trivia_id": trivia_id, "question_id": question_id, "position": position}
+            for position, question_id in enumerate(
+                rng.sample(question_ids, args.questions_per_trivia)
+            )
+        )
+
+    trivia_users = [
+        {"trivia_id": trivia["id"], "user_id": user["id"]}
+        for user in users
+        for trivia in rng.sample(trivias, args.trivias_per_user)
+    ]
+    return {
+        "users": users,
+        "questions": questions,
+        "question_options": options,
+        "trivias": trivias,
+        "trivia_questions": trivia_questions,
+        "trivia_users": trivia_users,
+    }
+
+
+async def seed(args: argparse.Namespace) -> dict[str, int]:
+    plan = _plan(args, random.Random(args.seed))
+    tables = {
+        "users": User.__table__,
+        "questions": Question.__table__,
+        "question_options": QuestionOption.__table__,
+        "trivias": Trivia.__table__,
+        "trivia_questions": TriviaQuestion.__table__,
+        "trivia_users": TriviaUser.__table__,
+    }
+
+    engine = create_engine(settings)
+    try:
+        async with engine.begin() as conn:
+            if args.reset:
+                await conn.execute(text(f"TRUNCATE {', '.join(TABLES)}"))
+            counts = {
+                name: await _insert(conn, table, plan[name])
+                for name, table in tables.items()
+            }
+            await conn.execute(text(f"ANALYZE {', '.join(TABLES)}"))
+    finally:
+        await engine.dispose()
+
+    players = [
+        [str(row["user_id"]), str(row["trivia_id"])] for row in plan["trivia_users"]
+    ]
+    random.Random(args.seed).shuffle(players)
+    args.manifest.parent.mkdir(parents=True, exist_ok=True)
+    args.manifest.write_text(
+        json.dumps({"config": _config(args), "counts": counts, "players": players})
+    )
+    return counts
+
+
+def _config(args: argparse.Namespace) -> dict:
+    return {
+        "users": args.users,
+        "questions": args.questions,
+        "trivias": args.trivias,
+        "questions_per_trivia": args.questions_per_trivia,
+        "trivias_per_user": args.trivias_per_user,
+        "seed": args.seed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--trivias", type=int, default=50)
+    parser.add_argument("--questions-per-trivia", type=int, default=200)
+    parser.add_argument("--trivias-per-user", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--reset", action="store_true", help="truncate every table before seeding"
+    )
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    args = parser.parse_args()
+
+    counts = asyncio.run(seed(args))
+    for name, count in counts.items():
+        print(f"{name}: {count}")
+    print(f"Manifest written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
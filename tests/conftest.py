@@ -0,0 +1,15 @@
+import pytest
+
+from app.infrastructure.db.loading import allow_lazy_loads, forbid_lazy_loads
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def no_lazy_loads():
+    forbid_lazy_loads()
+    yield
+    allow_lazy_loads()
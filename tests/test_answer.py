@@ -1,3 +1,4 @@
+from dataclasses import replace
 from unittest.mock import AsyncMock
 from uuid import UUID
 from datetime import datetime
@@ -6,8 +7,14 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.api.routes.play import get_answer_question_use_case
+from app.application.use_cases.answer_question import AnswerQuestion
+from app.domain.entities.answer import Answer
+from app.domain.entities.participation import Participation
 from app.domain.entities.question import Question, QuestionOption
+from app.domain.errors import IdempotencyKeyReused, TriviaQuestionRemoved
+from app.domain.services.answer_key import AnswerKey, AnswerKeyEntry
 from app.domain.value_objects.difficulty import Difficulty
+from app.domain.value_objects.participation_status import ParticipationStatus
 from app.main import app
 
 client = TestClient(app)
@@ -52,6 +59,7 @@ def test_answer_question_with_next_question(mock_answer_question_use_case):
         None,
         False,
         True,
+        False,
     )
 
     response = client.post(
@@ -72,7 +80,7 @@ def test_answer_question_with_next_question(mock_answer_question_use_case):
     assert "answer" not in data
     assert data["message"] == "¡Correcto! Vamos con la siguiente."
     mock_answer_question_use_case.execute.assert_called_once_with(
-        user_id, trivia_id, question_id, option_id
+        user_id, trivia_id, question_id, option_id, None
     )
 
     app.dependency_overrides = {}
@@ -91,7 +99,13 @@ def test_answer_last_question(mock_answer_question_use_case):
 
     final_score = 5
 
-    mock_answer_question_use_case.execute.return_value = (None, final_score, True, True)
+    mock_answer_question_use_case.execute.return_value = (
+        None,
+        final_score,
+        True,
+        True,
+        False,
+    )
 
     response = client.post(
         f"/users/{user_id}/trivias/{trivia_id}/questions/{question_id}/options/{option_id}"
@@ -179,3 +193,414 @@ def test_answer_question_invalid_option(mock_answer_question_use_case):
     assert response.status_code == 400
 
     app.dependency_overrides = {}
+
+
+def test_answer_question_forwards_idempotency_key(mock_answer_question_use_case):
+    """The Idempotency-Key header reaches the use case; reusing it is a 422"""
+    app.dependency_overrides[get_answer_question_use_case] = (
+        lambda: mock_answer_question_use_case
+    )
+
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    question_id = UUID("11111111-1111-1111-1111-111111111111")
+    option_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    url = (
+        f"/users/{user_id}/trivias/{trivia_id}/questions/{question_id}"
+        f"/options/{option_id}"
+    )
+    mock_answer_question_use_case.execute.return_value = (None, 5, True, True, True)
+
+    response = client.post(url, headers={"Idempotency-Key": "retry-1"})
+
+    assert response.status_code == 200
+    assert response.json()["score"] == 5
+    mock_answer_question_use_case.execute.assert_called_once_with(
+        user_id, trivia_id, question_id, option_id, "retry-1"
+    )
+
+    mock_answer_question_use_case.execute.side_effect = IdempotencyKeyReused("retry-1")
+    response = client.post(url, headers={"Idempotency-Key": "retry-1"})
+
+    assert response.status_code == 422
+
+    app.dependency_overrides = {}
+
+
+def _build_answer_use_case(participation, question, question_ids):
+    answer_repo = AsyncMock()
+    participation_repo = AsyncMock()
+    question_repo = AsyncMock()
+    trivia_repo = AsyncMock()
+    unit_of_work = AsyncMock()
+
+    participation_repo.get_by_trivia_and_user.return_value = participation
+    participation_repo.advance.side_effect = (
+        lambda participation_id, points, expected_answered_count, finished_at: replace(
+            participation, finished_at=finished_at
+        )
+    )
+    trivia_repo.get_question_id_at.side_effect = lambda trivia_id, position: (
+        question_ids[position] if position < len(question_ids) else None
+    )
+    trivia_repo.get_question_position.side_effect = (
+        lambda trivia_id, question_id: question_ids.index(question_id)
+        if question_id in question_ids
+        else None
+    )
+    question_repo.get_by_id.return_value = question
+    trivia_repo.get_answer_key.return_value = AnswerKey(
+        {
+            option.id: AnswerKeyEntry(
+                question_id=question.id,
+                is_correct=option.is_correct,
+                difficulty=question.difficulty,
+            )
+            for option in question.options
+        }
+    )
+
+    use_case = AnswerQuestion(
+        answer_repo, participation_repo, question_repo, trivia_repo, unit_of_work
+    )
+    return use_case, answer_repo, participation_repo, trivia_repo, unit_of_work
+
+
+def _participation(trivia_id, user_id, answered_count=0):
+    return Participation(
+        id=UUID("99999999-9999-9999-9999-999999999999"),
+        trivia_id=trivia_id,
+        user_id=user_id,
+        status=ParticipationStatus.IN_PROGRESS,
+        score_total=0,
+        started_at=datetime.now(),
+        finished_at=None,
+        answered_count=answered_count,
+    )
+
+
+def _question(question_id, difficulty=Difficulty.MEDIUM):
+    return Question(
+        id=question_id,
+        text="What is FastAPI?",
+        difficulty=difficulty,
+        options=[
+            QuestionOption(
+                id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+                text="A web framework",
+                is_correct=True,
+            ),
+            QuestionOption(
+                id=UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"),
+                text="A database",
+                is_correct=False,
+            ),
+        ],
+    )
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_commits_once():
+    """The answer and the participation update are committed together"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    participation = _participation(trivia_id, user_id)
+
+    use_case, answer_repo, participation_repo, trivia_repo, unit_of_work = (
+        _build_answer_use_case(
+            participation, _question(first_id), [first_id, second_id]
+        )
+    )
+    question_repo = use_case.question_repo
+
+    result = await use_case.execute(
+        user_id, trivia_id, first_id, UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    )
+    next_question, final_score, is_finished, is_correct, replayed = result
+
+    assert is_correct is True
+    assert is_finished is False
+    assert replayed is False
+    assert final_score is None
+    assert next_question is not None
+    question_repo.get_by_id.assert_called_once_with(second_id)
+    assert participation.score_total == 2
+    assert participation.answered_count == 1
+    answer_repo.add.assert_called_once()
+    answer_repo.save.assert_not_called()
+    trivia_repo.get_by_id.assert_not_called()
+    participation_repo.advance.assert_called_once_with(participation.id, 2, 0, None)
+    unit_of_work.commit.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_reports_a_concurrently_removed_question():
+    """Answers take no lock; the FK catches a removal that raced the lookup"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    participation = _participation(trivia_id, user_id)
+
+    use_case, answer_repo, _, trivia_repo, unit_of_work = _build_answer_use_case(
+        participation, _question(first_id), [first_id, second_id]
+    )
+    answer_repo.add.side_effect = TriviaQuestionRemoved("removed")
+
+    with pytest.raises(TriviaQuestionRemoved):
+        await use_case.execute(
+            user_id, trivia_id, first_id, UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+        )
+
+    unit_of_work.rollback.assert_called_once()
+    unit_of_work.commit.assert_not_called()
+    trivia_repo.get_updated_at.assert_called_once_with(trivia_id)
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_rechecks_the_trivia_before_finishing():
+    """A question appended elsewhere keeps the participation going"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    participation = _participation(trivia_id, user_id)
+    question_ids = [first_id]
+
+    use_case, _, participation_repo, trivia_repo, _ = _build_answer_use_case(
+        participation, _question(first_id), question_ids
+    )
+    trivia_repo.get_updated_at.side_effect = lambda trivia_id: (
+        question_ids.append(second_id) or datetime.now()
+    )
+
+    _, final_score, is_finished, _, _ = await use_case.execute(
+        user_id, trivia_id, first_id, UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    )
+
+    assert is_finished is False
+    assert final_score is None
+    participation_repo.advance.assert_called_once_with(participation.id, 2, 0, None)
+    trivia_repo.get_updated_at.assert_called_once_with(trivia_id)
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_skips_the_recheck_mid_trivia():
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    participation = _participation(trivia_id, user_id)
+
+    use_case, _, _, trivia_repo, _ = _build_answer_use_case(
+        participation, _question(first_id), [first_id, second_id]
+    )
+
+    await use_case.execute(
+        user_id, trivia_id, first_id, UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    )
+
+    trivia_repo.get_updated_at.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_finishes_on_last_question():
+    """Answering the last pending question finishes the participation"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    participation = _participation(trivia_id, user_id, answered_count=1)
+
+    use_case, _, _, _, unit_of_work = _build_answer_use_case(
+        participation, _question(second_id, Difficulty.HARD), [first_id, second_id]
+    )
+
+    result = await use_case.execute(
+        user_id, trivia_id, second_id, UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    )
+    next_question, final_score, is_finished, is_correct, replayed = result
+
+    assert next_question is None
+    assert is_finished is True
+    assert final_score == 3
+    assert participation.status == ParticipationStatus.FINISHED
+    unit_of_work.commit.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_rejects_answered_question():
+    """An already answered question is rejected before anything is written"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    participation = _participation(trivia_id, user_id, answered_count=1)
+
+    use_case, answer_repo, _, _, unit_of_work = _build_answer_use_case(
+        participation, _question(first_id), [first_id]
+    )
+
+    with pytest.raises(ValueError, match="Question already answered"):
+        await use_case.execute(
+            user_id, trivia_id, first_id, UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+        )
+
+    answer_repo.add.assert_not_called()
+    unit_of_work.commit.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_rejects_question_ahead_of_cursor():
+    """Only the question at the participation cursor can be answered"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    participation = _participation(trivia_id, user_id)
+
+    use_case, answer_repo, _, _, unit_of_work = _build_answer_use_case(
+        participation, _question(second_id), [first_id, second_id]
+    )
+
+    with pytest.raises(ValueError, match="Question is not the current one"):
+        await use_case.execute(
+            user_id, trivia_id, second_id, UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+        )
+
+    answer_repo.add.assert_not_called()
+    unit_of_work.commit.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_loses_concurrent_race():
+    """A concurrent answer that already moved the cursor wins the race"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    participation = _participation(trivia_id, user_id)
+
+    use_case, answer_repo, participation_repo, _, unit_of_work = (
+        _build_answer_use_case(
+            participation, _question(first_id), [first_id, second_id]
+        )
+    )
+    participation_repo.advance.side_effect = None
+    participation_repo.advance.return_value = None
+
+    with pytest.raises(ValueError, match="Question already answered"):
+        await use_case.execute(
+            user_id, trivia_id, first_id, UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+        )
+
+    answer_repo.add.assert_not_called()
+    unit_of_work.commit.assert_not_called()
+    unit_of_work.rollback.assert_called_once()
+
+
+def _stored_answer(participation, question_id, option_id, key):
+    return Answer(
+        id=UUID("77777777-7777-7777-7777-777777777777"),
+        participation_id=participation.id,
+        trivia_id=participation.trivia_id,
+        question_id=question_id,
+        option_id=option_id,
+        is_correct=True,
+        score_awarded=2,
+        answered_at=datetime.now(),
+        idempotency_key=key,
+    )
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_replays_retried_answer():
+    """A retry with the same key gets the stored result instead of an error"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    option_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    participation = _participation(trivia_id, user_id, answered_count=1)
+
+    use_case, answer_repo, participation_repo, _, unit_of_work = (
+        _build_answer_use_case(
+            participation, _question(second_id), [first_id, second_id]
+        )
+    )
+    answer_repo.get_by_idempotency_key.return_value = _stored_answer(
+        participation, first_id, option_id, "retry-1"
+    )
+
+    next_question, final_score, is_finished, is_correct, replayed = (
+        await use_case.execute(user_id, trivia_id, first_id, option_id, "retry-1")
+    )
+
+    assert replayed is True
+    assert is_correct is True
+    assert is_finished is False
+    assert next_question.id == second_id
+    answer_repo.get_by_idempotency_key.assert_called_once_with(
+        participation.id, "retry-1"
+    )
+    participation_repo.advance.assert_not_called()
+    unit_of_work.commit.assert_not_called()
+
+    with pytest.raises(IdempotencyKeyReused):
+        await use_case.execute(user_id, trivia_id, first_id, second_id, "retry-1")
+
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_replay_of_a_removed_question():
+    """A retry after its question left the trivia is a not-found error"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    option_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    participation = replace(
+        _participation(trivia_id, user_id, answered_count=2),
+        status=ParticipationStatus.FINISHED,
+        finished_at=datetime.now(),
+    )
+
+    use_case, answer_repo, _, _, _ = _build_answer_use_case(
+        participation, _question(second_id), [second_id]
+    )
+    answer_repo.get_by_idempotency_key.return_value = _stored_answer(
+        participation, first_id, option_id, "retry-1"
+    )
+
+    with pytest.raises(ValueError, match="Question not found"):
+        await use_case.execute(user_id, trivia_id, first_id, option_id, "retry-1")
+
+@pytest.mark.anyio
+async def test_answer_question_use_case_replays_after_insert_conflict():
+    """A concurrent submit with the same key rolls back and replays the winner"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    option_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    participation = _participation(trivia_id, user_id)
+
+    use_case, answer_repo, participation_repo, _, unit_of_work = (
+        _build_answer_use_case(participation, _question(first_id), [first_id])
+    )
+    answer_repo.add.return_value = False
+    finished = replace(participation, score_total=2, answered_count=1)
+    participation_repo.get_by_trivia_and_user.side_effect = [participation, finished]
+    answer_repo.get_by_idempotency_key.return_value = _stored_answer(
+        participation, first_id, option_id, "retry-1"
+    )
+
+    next_question, final_score, is_finished, _, replayed = await use_case.execute(
+        user_id, trivia_id, first_id, option_id, "retry-1"
+    )
+
+    assert replayed is True
+    assert next_question is None
+    assert is_finished is True
+    assert final_score == 2
+    unit_of_work.rollback.assert_called_once()
+    unit_of_work.commit.assert_not_called()
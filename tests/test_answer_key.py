@@ -0,0 +1,49 @@
+from uuid import UUID
+
+import pytest
+
+from app.domain.services.answer_key import AnswerKey, AnswerKeyEntry
+from app.domain.value_objects.difficulty import Difficulty
+
+QUESTION_ID = UUID("11111111-1111-1111-1111-111111111111")
+OTHER_QUESTION_ID = UUID("22222222-2222-2222-2222-222222222222")
+CORRECT_OPTION_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+WRONG_OPTION_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+OTHER_OPTION_ID = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
+
+
+@pytest.fixture
+def answer_key():
+    return AnswerKey(
+        {
+            CORRECT_OPTION_ID: AnswerKeyEntry(
+                question_id=QUESTION_ID, is_correct=True, difficulty=Difficulty.HARD
+            ),
+            WRONG_OPTION_ID: AnswerKeyEntry(
+                question_id=QUESTION_ID, is_correct=False, difficulty=Difficulty.HARD
+            ),
+            OTHER_OPTION_ID: AnswerKeyEntry(
+                question_id=OTHER_QUESTION_ID,
+                is_correct=True,
+                difficulty=Difficulty.EASY,
+            ),
+        }
+    )
+
+
+def test_grade_correct_option(answer_key):
+    assert answer_key.grade(QUESTION_ID, CORRECT_OPTION_ID) == (True, 3)
+
+
+def test_grade_wrong_option(answer_key):
+    assert answer_key.grade(QUESTION_ID, WRONG_OPTION_ID) == (False, 0)
+
+
+def test_grade_rejects_option_of_another_question(answer_key):
+    with pytest.raises(ValueError, match="Option not found"):
+        answer_key.grade(QUESTION_ID, OTHER_OPTION_ID)
+
+
+def test_grade_rejects_unknown_option(answer_key):
+    with pytest.raises(ValueError, match="Option not found"):
+        answer_key.grade(QUESTION_ID, UUID("99999999-9999-9999-9999-999999999999"))
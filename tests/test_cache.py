@@ -0,0 +1,190 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+import pytest
+
+from app.domain.entities.question import Question, QuestionOption
+from app.domain.services.answer_key import AnswerKey
+from app.domain.value_objects.difficulty import Difficulty
+from app.infrastructure.cache.lru import LRUCache
+from app.domain.value_objects.trivia_composition import TriviaComposition
+from app.infrastructure.repositories.cached_question_repo import CachedQuestionRepo
+from app.infrastructure.repositories.cached_trivia_repo import CachedTriviaRepo
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _question(question_id):
+    return Question(
+        id=question_id,
+        text="What is 2+2?",
+        difficulty=Difficulty.EASY,
+        options=[
+            QuestionOption(
+                id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+                text="4",
+                is_correct=True,
+            ),
+            QuestionOption(
+                id=UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"),
+                text="5",
+                is_correct=False,
+            ),
+        ],
+    )
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_expires_entries():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.anyio
+async def test_cached_question_repo_serves_repeated_reads_from_cache():
+    question_id = UUID("11111111-1111-1111-1111-111111111111")
+    repo = AsyncMock()
+    repo.get_by_id.return_value = _question(question_id)
+    cached_repo = CachedQuestionRepo(repo, LRUCache(maxsize=10, ttl=60))
+
+    first = await cached_repo.get_by_id(question_id)
+    second = await cached_repo.get_by_id(question_id)
+
+    assert first is second
+    repo.get_by_id.assert_called_once_with(question_id)
+
+
+@pytest.mark.anyio
+async def test_cached_question_repo_invalidates_on_save():
+    question_id = UUID("11111111-1111-1111-1111-111111111111")
+    question = _question(question_id)
+    repo = AsyncMock()
+    repo.get_by_id.return_value = question
+    repo.save.return_value = question
+    cache = LRUCache(maxsize=10, ttl=60)
+    cached_repo = CachedQuestionRepo(repo, cache)
+
+    await cached_repo.get_by_id(question_id)
+    await cached_repo.save(question)
+
+    assert cache.get(question_id) is None
+
+
+@pytest.mark.anyio
+async def test_cached_trivia_repo_serves_positions_from_composition():
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    repo = AsyncMock()
+    repo.get_composition.return_value = TriviaComposition(
+        trivia_id=trivia_id,
+        name="Python Quiz",
+        question_ids=(first_id, second_id),
+        user_ids=frozenset(),
+    )
+    cached_repo = CachedTriviaRepo(
+        repo, LRUCache(maxsize=10, ttl=60), LRUCache(maxsize=10, ttl=60)
+    )
+
+    assert await cached_repo.get_question_id_at(trivia_id, 1) == second_id
+    assert await cached_repo.get_question_id_at(trivia_id, 2) is None
+    assert await cached_repo.get_question_position(trivia_id, first_id) == 0
+    repo.get_composition.assert_called_once_with(trivia_id)
+    repo.get_question_id_at.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_cached_trivia_repo_invalidates_on_membership_change():
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    question_id = UUID("11111111-1111-1111-1111-111111111111")
+    repo = AsyncMock()
+    repo.get_composition.return_value = TriviaComposition(
+        trivia_id=trivia_id,
+        name="Python Quiz",
+        question_ids=(),
+        user_ids=frozenset(),
+    )
+    repo.add_questions.return_value = [question_id]
+    repo.remove_users.return_value = []
+    cache = LRUCache(maxsize=10, ttl=60)
+    cached_repo = CachedTriviaRepo(repo, cache, LRUCache(maxsize=10, ttl=60))
+
+    await cached_repo.get_composition(trivia_id)
+    await cached_repo.remove_users(trivia_id, [question_id])
+    assert cache.get(trivia_id) is not None
+
+    await cached_repo.add_questions(trivia_id, [question_id])
+    assert cache.get(trivia_id) is None
+
+
+@pytest.mark.anyio
+async def test_cached_trivia_repo_drops_compositions_changed_elsewhere():
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    cached_at = datetime(2024, 1, 1)
+    repo = AsyncMock()
+    repo.get_composition.return_value = TriviaComposition(
+        trivia_id=trivia_id,
+        name="Python Quiz",
+        question_ids=(),
+        user_ids=frozenset(),
+        updated_at=cached_at,
+    )
+    repo.get_answer_key.return_value = AnswerKey({})
+    compositions = LRUCache(maxsize=10, ttl=60)
+    answer_keys = LRUCache(maxsize=10, ttl=60)
+    cached_repo = CachedTriviaRepo(repo, compositions, answer_keys)
+    await cached_repo.get_composition(trivia_id)
+    await cached_repo.get_answer_key(trivia_id)
+
+    repo.get_updated_at.return_value = cached_at
+    assert await cached_repo.get_updated_at(trivia_id) == cached_at
+    assert compositions.get(trivia_id) is not None
+    assert answer_keys.get(trivia_id) is not None
+
+    # Another process touched the trivia after this one cached it.
+    repo.get_updated_at.return_value = cached_at + timedelta(seconds=1)
+    await cached_repo.get_updated_at(trivia_id)
+    assert compositions.get(trivia_id) is None
+    assert answer_keys.get(trivia_id) is None
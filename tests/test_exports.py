@@ -0,0 +1,192 @@
+import json
+from datetime import datetime, timezone
+from collections import namedtuple
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes.exports import get_answer_repo, get_question_repo
+from app.domain.entities.answer import Answer
+from app.domain.entities.question import Question, QuestionOption
+from app.domain.value_objects.difficulty import Difficulty
+from app.infrastructure.repositories.trivia_repo import TriviaRepoSqlAlchemy
+from app.main import app
+
+client = TestClient(app)
+
+
+def _batches(*batches):
+    async def stream():
+        for batch in batches:
+            yield batch
+
+    return stream()
+
+
+@pytest.fixture
+def mock_repo():
+    return MagicMock()
+
+
+def _question(question_id: str) -> Question:
+    return Question(
+        id=UUID(question_id),
+        text="What is Python?",
+        difficulty=Difficulty.EASY,
+        options=[
+            QuestionOption(
+                id=UUID("11111111-1111-1111-1111-111111111111"),
+                text="A language",
+                is_correct=True,
+            ),
+            QuestionOption(
+                id=UUID("22222222-2222-2222-2222-222222222222"),
+                text="A snake",
+                is_correct=False,
+            ),
+        ],
+    )
+
+
+def test_export_questions_streams_ndjson(mock_repo):
+    app.dependency_overrides[get_question_repo] = lambda: mock_repo
+    mock_repo.stream_all.return_value = _batches(
+        [_question("12345678-1234-5678-1234-567812345678")],
+        [_question("87654321-4321-8765-4321-876543210987")],
+    )
+
+    response = client.get("/exports/questions", params={"batch_size": 1})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [
+        "12345678-1234-5678-1234-567812345678",
+        "87654321-4321-8765-4321-876543210987",
+    ]
+    assert rows[0]["difficulty"] == "easy"
+    assert rows[0]["options"][0] == {
+        "id": "11111111-1111-1111-1111-111111111111",
+        "text": "A language",
+        "is_correct": True,
+    }
+    mock_repo.stream_all.assert_called_once_with(1)
+
+    app.dependency_overrides = {}
+
+
+def test_export_answers_streams_ndjson(mock_repo):
+    app.dependency_overrides[get_answer_repo] = lambda: mock_repo
+    answered_at = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    mock_repo.stream_all.return_value = _batches(
+        [
+            Answer(
+                id=UUID("33333333-3333-3333-3333-333333333333"),
+                participation_id=UUID("44444444-4444-4444-4444-444444444444"),
+                trivia_id=UUID("55555555-5555-5555-5555-555555555555"),
+                question_id=UUID("66666666-6666-6666-6666-666666666666"),
+                option_id=UUID("77777777-7777-7777-7777-777777777777"),
+                is_correct=True,
+                score_awarded=2,
+                answered_at=answered_at,
+            )
+        ]
+    )
+
+    response = client.get("/exports/answers")
+
+    assert response.status_code == 200
+    (row,) = [json.loads(line) for line in response.text.splitlines()]
+    assert row["score_awarded"] == 2
+    assert row["answered_at"] == answered_at.isoformat()
+    mock_repo.stream_all.assert_called_once_with(1000)
+
+    app.dependency_overrides = {}
+
+
+def test_export_streams_while_the_session_is_open():
+    session_open = []
+    reads = []
+
+    async def stream_all(batch_size):
+        for question_id in (
+            "12345678-1234-5678-1234-567812345678",
+            "87654321-4321-8765-4321-876543210987",
+        ):
+            reads.append(session_open[-1])
+            yield [_question(question_id)]
+
+    def repo_with_session():
+        session_open.append(True)
+        yield MagicMock(stream_all=stream_all)
+        session_open.append(False)
+
+    app.dependency_overrides[get_question_repo] = repo_with_session
+
+    response = client.get("/exports/questions", params={"batch_size": 1})
+
+    assert len(response.text.splitlines()) == 2
+    assert reads == [True, True]
+    assert session_open == [True, False]
+
+    app.dependency_overrides = {}
+
+def test_export_rejects_oversized_batches(mock_repo):
+    app.dependency_overrides[get_question_repo] = lambda: mock_repo
+
+    response = client.get("/exports/questions", params={"batch_size": 100000})
+
+    assert response.status_code == 422
+    mock_repo.stream_all.assert_not_called()
+
+    app.dependency_overrides = {}
+
+
+TriviaRow = namedtuple("TriviaRow", "created_at id name description")
+MemberRow = namedtuple("MemberRow", "created_at id member_id")
+
+
+@pytest.mark.anyio
+async def test_trivia_stream_bounds_member_rows_per_batch():
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    trivias = [
+        TriviaRow(created_at + timedelta(minutes=minute), uuid4(), "Quiz", None)
+        for minute in range(5)
+    ]
+    big, empty, with_question, with_user, last = trivias
+    question_id = uuid4()
+    user_ids = [uuid4() for _ in range(4)]
+    # Inserted after the trivia query ran, so only the member query sees it.
+    unseen = MemberRow(created_at - timedelta(minutes=1), uuid4(), uuid4())
+    session = MagicMock()
+    session.stream = AsyncMock(
+        side_effect=[
+            _batches(*trivias),
+            _batches(MemberRow(*with_question[:2], question_id)),
+            _batches(
+                unseen,
+                *(MemberRow(*big[:2], user_id) for user_id in user_ids[:3]),
+                MemberRow(*with_user[:2], user_ids[3]),
+            ),
+        ]
+    )
+
+    batches = [batch async for batch in TriviaRepoSqlAlchemy(session).stream_all(2)]
+
+    for call in session.stream.call_args_list:
+        (statement,) = call.args
+        assert statement.get_execution_options()["yield_per"] == 2
+    assert [[trivia.id for trivia in batch] for batch in batches] == [
+        [big.id],
+        [empty.id, with_question.id],
+        [with_user.id, last.id],
+    ]
+    # Only a trivia alone in its batch may hold more member ids than that.
+    for batch in batches[1:]:
+        assert sum(len(t.question_ids) + len(t.user_ids) for t in batch) <= 2
+    assert batches[0][0].user_ids == user_ids[:3]
+    assert batches[1][1].question_ids == [question_id]
+    assert batches[2][0].user_ids == [user_ids[3]]
@@ -1,5 +1,8 @@
+import pytest
 from fastapi.testclient import TestClient
 
+from app.infrastructure.config import Settings
+from app.infrastructure.db.session import create_engine, prewarm_pool
 from app.main import app
 
 client = TestClient(app)
@@ -9,3 +12,58 @@ def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_health_pool_reports_gauges():
+    response = client.get("/health/pool")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["checkedout"] >= 0
+    assert "overflow" in data
+    assert set(data["wait"]) >= {"count", "max_seconds", "avg_seconds"}
+
+
+def test_settings_drive_engine_pool(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "7")
+    monkeypatch.setenv("DB_POOL_PREWARM", "10")
+    settings = Settings()
+
+    engine = create_engine(settings)
+
+    assert engine.sync_engine.pool.size() == 3
+    assert engine.sync_engine.pool._max_overflow == 7
+    assert settings.prewarm_connections == 3
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeEngine:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.connections = []
+
+    async def connect(self):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("connection refused")
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+
+@pytest.mark.anyio
+async def test_prewarm_pool_opens_and_releases_connections():
+    engine = FakeEngine(failures=1)
+
+    opened = await prewarm_pool(engine, 3)
+
+    assert opened == 2
+    assert all(conn.closed for conn in engine.connections)
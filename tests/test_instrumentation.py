@@ -0,0 +1,81 @@
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.api.middleware import QueryInstrumentationMiddleware
+from app.infrastructure.db.instrumentation import install_query_hooks, statement_shape
+
+
+@pytest.fixture
+def engine():
+    install_query_hooks()
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def _app(engine, threshold=0):
+    app = FastAPI()
+    app.add_middleware(QueryInstrumentationMiddleware, n_plus_one_threshold=threshold)
+
+    @app.get("/items/{item_id}")
+    def read_items(item_id: int):
+        with engine.connect() as conn:
+            for i in range(item_id):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    return app
+
+
+def test_server_timing_reports_query_count(engine):
+    client = TestClient(_app(engine))
+
+    response = client.get("/items/3")
+
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="3 queries"' in timing
+    assert "app;dur=" in timing
+
+
+def test_request_log_uses_route_template(engine, caplog):
+    client = TestClient(_app(engine))
+
+    with caplog.at_level(logging.INFO, logger="app.requests"):
+        client.get("/items/2")
+
+    (record,) = [json.loads(r.getMessage()) for r in caplog.records]
+    assert record["route"] == "/items/{item_id}"
+    assert record["queries"] == 2
+    assert record["slowest_statement"] == "SELECT ?"
+
+
+def test_n_plus_one_detector_warns_on_repeated_shapes(engine, caplog):
+    client = TestClient(_app(engine, threshold=3))
+
+    with caplog.at_level(logging.WARNING, logger="app.requests"):
+        client.get("/items/3")
+        assert caplog.records == []
+        client.get("/items/5")
+
+    (record,) = [json.loads(r.getMessage()) for r in caplog.records]
+    assert record["event"] == "n_plus_one"
+    assert record["count"] == 5
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT a FROM t WHERE id IN ($1, $2,\n $3)") == (
+        "SELECT a FROM t WHERE id IN (?)"
+    )
+    assert statement_shape("SELECT a FROM t WHERE id IN (?)") == (
+        "SELECT a FROM t WHERE id IN (?)"
+    )
@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+import pytest
+
+from app.domain.entities.participation import Participation
+from app.domain.services.leaderboard import Leaderboard
+from app.domain.value_objects.participation_status import ParticipationStatus
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.db.unit_of_work import UnitOfWorkSqlAlchemy
+from app.infrastructure.repositories.ranked_participation_repo import (
+    RankedParticipationRepo,
+)
+
+TRIVIA_ID = UUID("12345678-1234-5678-1234-567812345678")
+ALICE = UUID("11111111-1111-1111-1111-111111111111")
+BOB = UUID("22222222-2222-2222-2222-222222222222")
+CAROL = UUID("33333333-3333-3333-3333-333333333333")
+
+
+def _entry(user_id, name, score, finished_at=None):
+    return {
+        "user_id": user_id,
+        "user_name": name,
+        "score": score,
+        "finished_at": finished_at,
+    }
+
+
+def test_leaderboard_orders_by_score_then_finish_time():
+    early = datetime(2023, 1, 1, 10, 0, tzinfo=timezone.utc)
+    late = datetime(2023, 1, 1, 10, 5, tzinfo=timezone.utc)
+    leaderboard = Leaderboard(
+        [
+            _entry(ALICE, "Alice", 5, late),
+            _entry(BOB, "Bob", 5, early),
+            _entry(CAROL, "Carol", 5),
+        ]
+    )
+
+    assert [e["user_name"] for e in leaderboard.page()] == ["Bob", "Alice", "Carol"]
+    assert leaderboard.rank_of(ALICE) == 2
+
+
+def test_leaderboard_moves_entries_when_scores_change():
+    leaderboard = Leaderboard(
+        [_entry(ALICE, "Alice", 3), _entry(BOB, "Bob", 2), _entry(CAROL, "Carol", 1)]
+    )
+
+    assert leaderboard.update_score(CAROL, 4, None) is True
+
+    assert leaderboard.rank_of(CAROL) == 1
+    assert [e["user_name"] for e in leaderboard.top(2)] == ["Carol", "Alice"]
+    assert [e["user_name"] for e in leaderboard.page(1, 1)] == ["Alice"]
+    assert len(leaderboard) == 3
+
+
+def test_leaderboard_ignores_unknown_participants():
+    leaderboard = Leaderboard([_entry(ALICE, "Alice", 3)])
+
+    assert leaderboard.update_score(BOB, 4, None) is False
+    assert leaderboard.rank_of(BOB) is None
+
+
+def test_bounded_leaderboard_keeps_only_the_top():
+    leaderboard = Leaderboard(
+        [_entry(ALICE, "Alice", 3), _entry(BOB, "Bob", 2), _entry(CAROL, "Carol", 1)],
+        size=2,
+    )
+
+    assert [e["user_name"] for e in leaderboard.page()] == ["Alice", "Bob"]
+    assert leaderboard.complete is False
+    assert leaderboard.covers(2) is True
+    assert leaderboard.covers(3) is False
+    # Still below the board, so nothing on it changes.
+    assert leaderboard.update_score(CAROL, 1, None) is True
+    # Passing Bob needs Carol's entry, which the board does not have.
+    assert leaderboard.update_score(CAROL, 5, None) is False
+    assert leaderboard.update_score(BOB, 4, None) is True
+    assert [e["user_name"] for e in leaderboard.page()] == ["Bob", "Alice"]
+
+
+@pytest.mark.anyio
+async def test_ranked_repo_queries_ranks_past_the_board():
+    repo = AsyncMock()
+    repo.get_ranking_page.return_value = [
+        _entry(ALICE, "Alice", 3),
+        _entry(BOB, "Bob", 2),
+        _entry(CAROL, "Carol", 1),
+    ]
+    ranked_repo = RankedParticipationRepo(repo, LRUCache(maxsize=10, ttl=60), size=2)
+
+    top = await ranked_repo.get_ranking_page(TRIVIA_ID, 0, 2)
+    repo.get_ranking_page.assert_called_once_with(TRIVIA_ID, 0, 3)
+    assert [e["user_name"] for e in top] == ["Alice", "Bob"]
+
+    repo.get_ranking_page.reset_mock()
+    await ranked_repo.get_ranking_page(TRIVIA_ID, 1, 2)
+    repo.get_ranking_page.assert_called_once_with(TRIVIA_ID, 1, 2)
+
+    around = await ranked_repo.get_ranking_around(TRIVIA_ID, ALICE, 1)
+    assert [e["user_name"] for e in around] == ["Alice", "Bob"]
+    repo.get_ranking_around.assert_not_called()
+    await ranked_repo.get_ranking_around(TRIVIA_ID, CAROL, 1)
+    repo.get_ranking_around.assert_called_once_with(TRIVIA_ID, CAROL, 1)
+
+@pytest.mark.anyio
+async def test_ranked_repo_updates_board_without_requery():
+    repo = AsyncMock()
+    repo.get_ranking_page.return_value = [
+        _entry(ALICE, "Alice", 3),
+        _entry(BOB, "Bob", 2),
+    ]
+    repo.advance.return_value = Participation(
+        id=UUID("99999999-9999-9999-9999-999999999999"),
+        trivia_id=TRIVIA_ID,
+        user_id=BOB,
+        status=ParticipationStatus.IN_PROGRESS,
+        score_total=5,
+        started_at=None,
+        finished_at=None,
+        answered_count=2,
+    )
+    unit_of_work = UnitOfWorkSqlAlchemy(AsyncMock())
+    ranked_repo = RankedParticipationRepo(
+        repo, LRUCache(maxsize=10, ttl=60), unit_of_work
+    )
+
+    await ranked_repo.get_ranking_page(TRIVIA_ID, 0, 10)
+    await ranked_repo.advance(repo.advance.return_value.id, 3, 1)
+    staged = await ranked_repo.get_ranking_page(TRIVIA_ID, 0, 10)
+    await unit_of_work.commit()
+    ranking = await ranked_repo.get_ranking_page(TRIVIA_ID, 0, 10)
+
+    assert [e["user_name"] for e in staged] == ["Alice", "Bob"]
+    assert [e["user_name"] for e in ranking] == ["Bob", "Alice"]
+    repo.get_ranking_page.assert_called_once_with(TRIVIA_ID, 0, 1001)
+
+
+@pytest.mark.anyio
+async def test_ranked_repo_drops_staged_scores_on_rollback():
+    repo = AsyncMock()
+    repo.get_ranking_page.return_value = [
+        _entry(ALICE, "Alice", 3),
+        _entry(BOB, "Bob", 2),
+    ]
+    repo.advance.return_value = Participation(
+        id=UUID("99999999-9999-9999-9999-999999999999"),
+        trivia_id=TRIVIA_ID,
+        user_id=BOB,
+        status=ParticipationStatus.FINISHED,
+        score_total=5,
+        started_at=None,
+        finished_at=datetime(2023, 1, 1, 10, 0, tzinfo=timezone.utc),
+        answered_count=2,
+    )
+    unit_of_work = UnitOfWorkSqlAlchemy(AsyncMock())
+    ranked_repo = RankedParticipationRepo(
+        repo, LRUCache(maxsize=10, ttl=60), unit_of_work
+    )
+
+    await ranked_repo.get_ranking_page(TRIVIA_ID, 0, 10)
+    await ranked_repo.advance(repo.advance.return_value.id, 3, 1)
+    await unit_of_work.rollback()
+    await unit_of_work.commit()
+    ranking = await ranked_repo.get_ranking_page(TRIVIA_ID, 0, 10)
+
+    assert [(e["user_name"], e["score"]) for e in ranking] == [
+        ("Alice", 3),
+        ("Bob", 2),
+    ]
+    assert ranking[1]["finished_at"] is None
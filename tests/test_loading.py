@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.loading import (
+    QUESTION_WITH_OPTIONS,
+    TRIVIAS_WITH_MEMBER_IDS,
+    UnexpectedLazyLoad,
+)
+from app.infrastructure.db.models import (
+    Difficulty,
+    Question,
+    QuestionOption,
+    Trivia,
+    TriviaQuestion,
+    TriviaUser,
+    User,
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(name="User 1", email="user1@example.com")
+        trivia = Trivia(name="Python Quiz")
+        question = Question(text="What is 2+2?", difficulty=Difficulty.easy)
+        session.add_all([user, trivia, question])
+        session.flush()
+        session.add_all(
+            [
+                QuestionOption(question_id=question.id, text="4", is_correct=True),
+                QuestionOption(question_id=question.id, text="5", is_correct=False),
+                TriviaQuestion(trivia_id=trivia.id, question_id=question.id, position=0),
+                TriviaUser(trivia_id=trivia.id, user_id=user.id),
+            ]
+        )
+        session.commit()
+        session.expunge_all()
+        yield session
+    engine.dispose()
+
+
+def test_lazy_load_raises(session):
+    user = session.execute(select(User)).scalar_one()
+
+    with pytest.raises(UnexpectedLazyLoad):
+        _ = user.trivias
+
+
+def test_question_profile_loads_options(session):
+    question = (
+        session.execute(select(Question).options(*QUESTION_WITH_OPTIONS))
+        .unique()
+        .scalar_one()
+    )
+
+    assert len(question.options) == 2
+
+
+def test_trivia_profile_loads_member_ids(session):
+    trivia = (
+        session.execute(select(Trivia).options(*TRIVIAS_WITH_MEMBER_IDS))
+        .scalar_one()
+    )
+
+    assert len(trivia.questions) == 1
+    assert len(trivia.users) == 1
@@ -0,0 +1,358 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.application.use_cases.answer_question import AnswerQuestion
+from app.application.use_cases.play_trivia import PlayTrivia
+from app.application.use_cases.trivia import CreateTrivia, UpdateTriviaQuestions
+from app.domain.entities.question import Question, QuestionOption
+from app.domain.entities.user import User
+from app.domain.errors import EmailAlreadyRegistered, IdempotencyKeyReused
+from app.domain.value_objects.difficulty import Difficulty
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.memory.snapshot import load_snapshot, save_snapshot
+from app.infrastructure.memory.store import (
+    ConstraintViolation,
+    MemorySession,
+    MemoryStore,
+)
+from app.infrastructure.memory.unit_of_work import UnitOfWorkInMemory
+from app.infrastructure.repositories.memory_answer_repo import AnswerRepoInMemory
+from app.infrastructure.repositories.memory_participation_repo import (
+    ParticipationRepoInMemory,
+)
+from app.infrastructure.repositories.memory_question_repo import (
+    QuestionRepoInMemory,
+)
+from app.infrastructure.repositories.memory_trivia_repo import TriviaRepoInMemory
+from app.infrastructure.repositories.memory_user_repo import UserRepoInMemory
+from app.infrastructure.repositories.ranked_participation_repo import (
+    RankedParticipationRepo,
+)
+
+
+class TickingClock:
+    def __init__(self):
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        self.now += timedelta(seconds=1)
+        return self.now
+
+
+@pytest.fixture
+def store():
+    return MemoryStore(clock=TickingClock())
+
+
+def _question(difficulty=Difficulty.EASY):
+    return Question(
+        id=uuid4(),
+        text="What is 2+2?",
+        difficulty=difficulty,
+        options=[
+            QuestionOption(id=uuid4(), text="4", is_correct=True),
+            QuestionOption(id=uuid4(), text="5", is_correct=False),
+        ],
+    )
+
+
+async def _seed(store, players=2, questions=2):
+    session = MemorySession(store)
+    users = [
+        User(id=uuid4(), name=f"User {i}", email=f"u{i}@x.com") for i in range(players)
+    ]
+    for user in users:
+        await UserRepoInMemory(session).save(user)
+    seeded = [_question() for _ in range(questions)]
+    for question in seeded:
+        await QuestionRepoInMemory(session).save(question)
+    trivia = await CreateTrivia(
+        TriviaRepoInMemory(session),
+        QuestionRepoInMemory(session),
+        UserRepoInMemory(session),
+    ).execute("Math", [q.id for q in seeded], [u.id for u in users])
+    return users, seeded, trivia
+
+
+def _answer_use_case(store):
+    session = MemorySession(store)
+    return AnswerQuestion(
+        AnswerRepoInMemory(session),
+        ParticipationRepoInMemory(session),
+        QuestionRepoInMemory(session),
+        TriviaRepoInMemory(session),
+        UnitOfWorkInMemory(session),
+    )
+
+
+def _play_use_case(store):
+    session = MemorySession(store)
+    return PlayTrivia(
+        ParticipationRepoInMemory(session),
+        TriviaRepoInMemory(session),
+        QuestionRepoInMemory(session),
+    )
+
+
+@pytest.mark.anyio
+async def test_user_email_is_unique(store):
+    repo = UserRepoInMemory(MemorySession(store))
+    first = await repo.save(User(id=uuid4(), name="Ana", email="ana@x.com"))
+
+    with pytest.raises(EmailAlreadyRegistered):
+        await repo.save(User(id=uuid4(), name="Other", email="ana@x.com"))
+
+    newcomer = User(id=uuid4(), name="Bea", email="bea@x.com")
+    results = await repo.save_many(
+        [User(id=uuid4(), name="Ana", email="ana@x.com"), newcomer]
+    )
+    assert results == [(first.id, False), (newcomer.id, True)]
+
+
+@pytest.mark.anyio
+async def test_keyset_pages_follow_creation_order_per_difficulty(store):
+    repo = QuestionRepoInMemory(MemorySession(store))
+    hard = []
+    for i in range(5):
+        question = _question(Difficulty.HARD if i % 2 else Difficulty.EASY)
+        await repo.save(question)
+        if i % 2:
+            hard.append(question.id)
+
+    first = await repo.get_page(1, difficulty=Difficulty.HARD)
+    second = await repo.get_page(1, first.next_cursor, Difficulty.HARD)
+
+    assert [q.id for q in first.items + second.items] == hard
+    assert second.next_cursor is None
+    everything = await repo.get_page(10)
+    assert len(everything.items) == 5
+
+
+@pytest.mark.anyio
+async def test_play_and_answer_update_the_ranking(store):
+    users, questions, trivia = await _seed(store)
+    for user in users:
+        await _play_use_case(store).execute(user.id, trivia.id)
+
+    winner, loser = users
+    for question in questions:
+        correct, wrong = question.options
+        await _answer_use_case(store).execute(
+            winner.id, trivia.id, question.id, correct.id
+        )
+        await _answer_use_case(store).execute(
+            loser.id, trivia.id, question.id, wrong.id
+        )
+
+    ranking = await ParticipationRepoInMemory(MemorySession(store)).get_ranking_page(
+        trivia.id, 0, 10
+    )
+    assert [entry["user_id"] for entry in ranking] == [winner.id, loser.id]
+    assert ranking[0]["rank"] == 1
+    assert ranking[0]["user_name"] == winner.name
+    assert ranking[0]["finished_at"] is not None
+
+
+@pytest.mark.anyio
+async def test_replayed_answer_is_rejected_and_rolled_back(store):
+    users, questions, trivia = await _seed(store, players=1)
+    await _play_use_case(store).execute(users[0].id, trivia.id)
+    option = questions[0].options[0]
+    await _answer_use_case(store).execute(
+        users[0].id, trivia.id, questions[0].id, option.id
+    )
+
+    with pytest.raises(ValueError, match="already answered"):
+        await _answer_use_case(store).execute(
+            users[0].id, trivia.id, questions[0].id, option.id
+        )
+
+    assert len(store.answers) == 1
+    participation = next(iter(store.participations.rows.values()))
+    assert participation.answered_count == 1
+
+
+@pytest.mark.anyio
+async def test_answer_retried_with_idempotency_key_is_replayed(store):
+    users, questions, trivia = await _seed(store, players=1)
+    await _play_use_case(store).execute(users[0].id, trivia.id)
+    option = questions[0].options[0]
+    first = await _answer_use_case(store).execute(
+        users[0].id, trivia.id, questions[0].id, option.id, "retry-1"
+    )
+
+    retried = await _answer_use_case(store).execute(
+        users[0].id, trivia.id, questions[0].id, option.id, "retry-1"
+    )
+
+    assert retried[:4] == first[:4]
+    assert (first[4], retried[4]) == (False, True)
+    assert len(store.answers) == 1
+    # The key is taken, so it cannot be sent again with the next question.
+    with pytest.raises(IdempotencyKeyReused):
+        await _answer_use_case(store).execute(
+            users[0].id,
+            trivia.id,
+            questions[1].id,
+            questions[1].options[0].id,
+            "retry-1",
+        )
+    assert len(store.answers) == 1
+    participation = next(iter(store.participations.rows.values()))
+    assert participation.answered_count == 1
+
+
+@pytest.mark.anyio
+async def test_reused_idempotency_key_leaves_cached_ranking_untouched(store):
+    users, questions, trivia = await _seed(store, players=1)
+    await _play_use_case(store).execute(users[0].id, trivia.id)
+    await _answer_use_case(store).execute(
+        users[0].id, trivia.id, questions[0].id, questions[0].options[0].id, "k"
+    )
+    session = MemorySession(store)
+    unit_of_work = UnitOfWorkInMemory(session)
+    ranked_repo = RankedParticipationRepo(
+        ParticipationRepoInMemory(session),
+        LRUCache(maxsize=10, ttl=60),
+        unit_of_work,
+    )
+    before = await ranked_repo.get_ranking_page(trivia.id, 0, 10)
+    use_case = AnswerQuestion(
+        AnswerRepoInMemory(session),
+        ranked_repo,
+        QuestionRepoInMemory(session),
+        TriviaRepoInMemory(session),
+        unit_of_work,
+    )
+
+    # Answering the last question advances and finishes the participation
+    # before the insert conflicts on the key and everything is rolled back.
+    with pytest.raises(IdempotencyKeyReused):
+        await use_case.execute(
+            users[0].id,
+            trivia.id,
+            questions[1].id,
+            questions[1].options[0].id,
+            "k",
+        )
+
+    ranking = await ranked_repo.get_ranking_page(trivia.id, 0, 10)
+    participation = next(iter(store.participations.rows.values()))
+    assert ranking == before
+    assert ranking[0]["score"] == participation.score_total
+    assert ranking[0]["finished_at"] is None
+
+
+@pytest.mark.anyio
+async def test_rollback_undoes_staged_writes(store):
+    session = MemorySession(store)
+    participation_repo = ParticipationRepoInMemory(session)
+    users, questions, trivia = await _seed(store, players=1)
+    await _play_use_case(store).execute(users[0].id, trivia.id)
+    participation = await participation_repo.get_by_trivia_and_user(
+        trivia.id, users[0].id
+    )
+
+    advanced = await participation_repo.advance(participation.id, 10, 0)
+    assert advanced.score_total == 10
+    assert await participation_repo.advance(participation.id, 10, 0) is None
+    await UnitOfWorkInMemory(session).rollback()
+
+    restored = await participation_repo.get_by_trivia_and_user(trivia.id, users[0].id)
+    assert restored.score_total == 0
+    assert restored.answered_count == 0
+    entry = await participation_repo.get_ranking_entry(trivia.id, users[0].id)
+    assert entry["score"] == 0
+
+
+@pytest.mark.anyio
+async def test_duplicate_participation_violates_unique_constraint(store):
+    users, _, trivia = await _seed(store, players=1)
+    await _play_use_case(store).execute(users[0].id, trivia.id)
+    existing = next(iter(store.participations.rows.values()))
+
+    with pytest.raises(ConstraintViolation, match="uq_participation_trivia_user"):
+        await ParticipationRepoInMemory(MemorySession(store)).save(
+            existing.__class__(**{**existing.__dict__, "id": uuid4()})
+        )
+
+
+@pytest.mark.anyio
+async def test_removing_questions_keeps_positions_dense(store):
+    _, questions, trivia = await _seed(store, players=1, questions=3)
+    session = MemorySession(store)
+    extra = _question()
+    await QuestionRepoInMemory(session).save(extra)
+    use_case = UpdateTriviaQuestions(
+        TriviaRepoInMemory(session),
+        QuestionRepoInMemory(session),
+        AnswerRepoInMemory(session),
+        UnitOfWorkInMemory(session),
+    )
+
+    added, removed = await use_case.execute(
+        trivia.id, [extra.id, questions[2].id], [questions[0].id]
+    )
+
+    assert added == [extra.id]
+    assert removed == [questions[0].id]
+    trivia_repo = TriviaRepoInMemory(MemorySession(store))
+    assert await trivia_repo.get_question_ids(trivia.id) == [
+        questions[1].id,
+        questions[2].id,
+        extra.id,
+    ]
+    assert await trivia_repo.get_question_position(trivia.id, extra.id) == 2
+
+
+@pytest.mark.anyio
+async def test_snapshot_round_trip(store, tmp_path):
+    users, questions, trivia = await _seed(store, players=1)
+    await _play_use_case(store).execute(users[0].id, trivia.id)
+    await _answer_use_case(store).execute(
+        users[0].id, trivia.id, questions[0].id, questions[0].options[0].id
+    )
+    path = tmp_path / "snapshot.json"
+
+    save_snapshot(store, path)
+    restored = load_snapshot(path)
+
+    trivia_repo = TriviaRepoInMemory(MemorySession(restored))
+    assert await trivia_repo.get_by_id(trivia.id) == trivia
+    assert await trivia_repo.get_by_user_id(users[0].id) == [trivia]
+    answer_repo = AnswerRepoInMemory(MemorySession(restored))
+    assert await answer_repo.get_answered_question_ids(
+        trivia.id, [q.id for q in questions]
+    ) == {questions[0].id}
+    assert restored.leaderboards[trivia.id].page() == (
+        store.leaderboards[trivia.id].page()
+    )
+    assert restored.users.created_at == store.users.created_at
+
+
+@pytest.mark.anyio
+async def test_versions_move_when_trivias_and_questions_change(store):
+    users, _, trivia = await _seed(store, players=1)
+    session = MemorySession(store)
+    trivia_repo = TriviaRepoInMemory(session)
+    question_repo = QuestionRepoInMemory(session)
+    trivia_version = await trivia_repo.get_version(trivia.id)
+    user_version = await trivia_repo.get_user_trivias_version(users[0].id)
+    easy_version = await question_repo.get_version(Difficulty.EASY)
+    assert await trivia_repo.get_version(uuid4()) is None
+
+    extra = _question(Difficulty.HARD)
+    await question_repo.save(extra)
+    await UpdateTriviaQuestions(
+        trivia_repo,
+        question_repo,
+        AnswerRepoInMemory(session),
+        UnitOfWorkInMemory(session),
+    ).execute(trivia.id, [extra.id], [])
+
+    assert await trivia_repo.get_version(trivia.id) != trivia_version
+    assert await trivia_repo.get_user_trivias_version(users[0].id) != user_version
+    assert await question_repo.get_version(Difficulty.EASY) == easy_version
+    assert (await question_repo.get_version()).count == easy_version.count + 1
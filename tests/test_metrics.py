@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+from app.api.routes.play import get_answer_question_use_case
+from app.infrastructure.metrics import (
+    Histogram,
+    answers_graded,
+    participations_finished,
+)
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3.0, "/a")
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_metrics_endpoint_exposes_route_templates_and_gauges():
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+        in body
+    )
+    assert "http_requests_in_flight 1" in body
+    assert 'db_pool_checkedout{pool="primary"}' in body
+    assert 'cache_hit_ratio{cache="answer_key"}' in body
+
+
+def test_unmatched_paths_share_one_series():
+    client.get("/no-such-route/1")
+    client.get("/no-such-route/2")
+
+    body = client.get("/metrics").text
+
+    assert 'route="unmatched",status="404"}' in body
+    assert "/no-such-route" not in body
+
+
+def test_answering_counts_graded_answers_and_finished_participations():
+    use_case = AsyncMock()
+    use_case.execute.return_value = (None, 30, True, True, False)
+    app.dependency_overrides[get_answer_question_use_case] = lambda: use_case
+    correct_before = answers_graded.value("true")
+    finished_before = participations_finished.value()
+
+    ids = [UUID(int=i) for i in range(1, 5)]
+    response = client.post(
+        f"/users/{ids[0]}/trivias/{ids[1]}/questions/{ids[2]}/options/{ids[3]}"
+    )
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert answers_graded.value("true") == correct_before + 1
+    assert participations_finished.value() == finished_before + 1
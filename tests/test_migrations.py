@@ -0,0 +1,133 @@
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, insert, select, text
+
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models import (
+    Answer,
+    Participation,
+    ParticipationStatus,
+    TriviaQuestion,
+)
+
+VERSIONS = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+STARTED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _migration(name):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Back to the schema the position migration starts from.
+        conn.execute(text("DROP INDEX ix_trivia_questions_trivia_position"))
+        conn.execute(text("ALTER TABLE trivia_questions DROP COLUMN position"))
+    with engine.begin() as conn:
+        yield conn
+    engine.dispose()
+
+
+def _participation(conn, trivia_id, answered, status=ParticipationStatus.in_progress):
+    participation_id = uuid4()
+    conn.execute(
+        insert(Participation.__table__).values(
+            id=participation_id,
+            trivia_id=trivia_id,
+            user_id=uuid4(),
+            status=status,
+            score_total=len(answered),
+            answered_count=len(answered),
+        )
+    )
+    for minute, question_id in enumerate(answered):
+        conn.execute(
+            insert(Answer.__table__).values(
+                id=uuid4(),
+                participation_id=participation_id,
+                trivia_id=trivia_id,
+                question_id=question_id,
+                option_id=uuid4(),
+                is_correct=True,
+                score_awarded=1,
+                created_at=STARTED + timedelta(minutes=minute),
+            )
+        )
+    return participation_id
+
+
+def test_position_backfill_keeps_in_progress_participations_resumable(connection):
+    trivia_id = uuid4()
+    first, second, third = uuid4(), uuid4(), uuid4()
+    for question_id in (first, second, third):
+        connection.execute(
+            insert(TriviaQuestion.__table__).values(
+                trivia_id=trivia_id, question_id=question_id, created_at=STARTED
+            )
+        )
+    # Everyone who started was served `second`, then `third`.
+    partial = _participation(connection, trivia_id, [second])
+    further = _participation(connection, trivia_id, [second, third])
+    finished = _participation(
+        connection, trivia_id, [second, third, first], ParticipationStatus.finished
+    )
+    # This one skipped ahead, so no order makes its answers a prefix.
+    gapped = _participation(connection, trivia_id, [third])
+    answers_before = connection.execute(select(Answer.id)).scalars().all()
+
+    with Operations.context(MigrationContext.configure(connection)):
+        _migration("4b2c523eb1e8_add_trivia_question_position").upgrade()
+
+    positions = dict(
+        connection.execute(
+            select(TriviaQuestion.question_id, TriviaQuestion.position).where(
+                TriviaQuestion.trivia_id == trivia_id
+            )
+        ).all()
+    )
+    assert positions == {second: 0, third: 1, first: 2}
+
+    # No answer or score is rewritten.
+    assert sorted(connection.execute(select(Answer.id)).scalars()) == sorted(
+        answers_before
+    )
+    progress = {
+        row.id: (row.status, row.answered_count, row.score_total)
+        for row in connection.execute(
+            select(
+                Participation.id,
+                Participation.status,
+                Participation.answered_count,
+                Participation.score_total,
+            )
+        )
+    }
+    assert progress == {
+        partial: (ParticipationStatus.in_progress, 1, 1),
+        further: (ParticipationStatus.in_progress, 2, 2),
+        finished: (ParticipationStatus.finished, 3, 3),
+        gapped: (ParticipationStatus.finished, 1, 1),
+    }
+
+    # Every participation still in progress resumes after exactly its answers.
+    for participation_id, (status, answered_count, _) in progress.items():
+        if status != ParticipationStatus.in_progress:
+            continue
+        answered = connection.execute(
+            select(Answer.question_id).where(
+                Answer.participation_id == participation_id
+            )
+        ).scalars()
+        assert sorted(positions[q] for q in answered) == list(range(answered_count))
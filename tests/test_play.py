@@ -1,13 +1,22 @@
 from unittest.mock import AsyncMock
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api.play_payloads import fragment_cache
 from app.api.routes.play import get_play_trivia_use_case
+from app.api.schemas.play import PlayQuestionResponse
+from app.application.use_cases.play_trivia import PlayTrivia
+from app.domain.entities.participation import Participation
 from app.domain.entities.question import Question, QuestionOption
+from app.domain.errors import TriviaNotAssigned
 from app.domain.value_objects.difficulty import Difficulty
+from app.domain.value_objects.participation_status import ParticipationStatus
+from app.domain.value_objects.trivia_composition import TriviaComposition
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.repositories.cached_trivia_repo import CachedTriviaRepo
 from app.main import app
 
 client = TestClient(app)
@@ -166,3 +175,208 @@ def test_play_trivia_no_questions(mock_play_trivia_use_case):
     assert response.json()["detail"] == "No questions available"
 
     app.dependency_overrides = {}
+
+
+@pytest.mark.anyio
+async def test_play_trivia_use_case_resumes_at_cursor():
+    """A resuming player gets the question at the participation cursor"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+
+    participation_repo = AsyncMock()
+    trivia_repo = AsyncMock()
+    question_repo = AsyncMock()
+    participation_repo.get_by_trivia_and_user.return_value = Participation(
+        id=UUID("99999999-9999-9999-9999-999999999999"),
+        trivia_id=trivia_id,
+        user_id=user_id,
+        status=ParticipationStatus.IN_PROGRESS,
+        score_total=1,
+        started_at=datetime.now(),
+        finished_at=None,
+        answered_count=1,
+    )
+    trivia_repo.get_composition.return_value = TriviaComposition(
+        trivia_id=trivia_id,
+        name="Python Quiz",
+        question_ids=(first_id, second_id),
+        user_ids=frozenset({user_id}),
+    )
+
+    use_case = PlayTrivia(participation_repo, trivia_repo, question_repo)
+    _, _, _, is_new, final_score = await use_case.execute(user_id, trivia_id)
+
+    assert is_new is False
+    assert final_score is None
+    trivia_repo.get_by_id.assert_not_called()
+    question_repo.get_by_id.assert_called_once_with(second_id)
+    participation_repo.save.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_play_trivia_use_case_refreshes_compositions_changed_elsewhere():
+    """A cached composition older than the stored trivia is not served"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    first_id = UUID("11111111-1111-1111-1111-111111111111")
+    second_id = UUID("22222222-2222-2222-2222-222222222222")
+    cached_at = datetime(2024, 1, 1)
+
+    participation_repo = AsyncMock()
+    question_repo = AsyncMock()
+    participation_repo.get_by_trivia_and_user.return_value = Participation(
+        id=UUID("99999999-9999-9999-9999-999999999999"),
+        trivia_id=trivia_id,
+        user_id=user_id,
+        status=ParticipationStatus.IN_PROGRESS,
+        score_total=1,
+        started_at=datetime.now(),
+        finished_at=None,
+        answered_count=1,
+    )
+    repo = AsyncMock()
+    repo.get_composition.return_value = TriviaComposition(
+        trivia_id=trivia_id,
+        name="Python Quiz",
+        question_ids=(first_id,),
+        user_ids=frozenset({user_id}),
+        updated_at=cached_at,
+    )
+    trivia_repo = CachedTriviaRepo(
+        repo, LRUCache(maxsize=10, ttl=60), LRUCache(maxsize=10, ttl=60)
+    )
+    await trivia_repo.get_composition(trivia_id)
+
+    # Another process appended a question after this one cached the trivia.
+    updated_at = cached_at + timedelta(seconds=1)
+    repo.get_updated_at.return_value = updated_at
+    repo.get_composition.return_value = TriviaComposition(
+        trivia_id=trivia_id,
+        name="Python Quiz",
+        question_ids=(first_id, second_id),
+        user_ids=frozenset({user_id}),
+        updated_at=updated_at,
+    )
+
+    use_case = PlayTrivia(participation_repo, trivia_repo, question_repo)
+    await use_case.execute(user_id, trivia_id)
+
+    question_repo.get_by_id.assert_called_once_with(second_id)
+
+
+@pytest.mark.anyio
+async def test_play_trivia_use_case_rejects_missing_trivia():
+    """A trivia without a stored stamp is reported as not found"""
+    participation_repo = AsyncMock()
+    trivia_repo = AsyncMock()
+    trivia_repo.get_updated_at.return_value = None
+
+    use_case = PlayTrivia(participation_repo, trivia_repo, AsyncMock())
+    with pytest.raises(ValueError, match="Trivia not found"):
+        await use_case.execute(
+            UUID("33333333-3333-3333-3333-333333333333"),
+            UUID("12345678-1234-5678-1234-567812345678"),
+        )
+
+    trivia_repo.get_composition.assert_not_called()
+    participation_repo.save.assert_not_called()
+
+
+def test_play_trivia_not_assigned(mock_play_trivia_use_case):
+    """Test playing a trivia the user is not assigned to"""
+    app.dependency_overrides[get_play_trivia_use_case] = (
+        lambda: mock_play_trivia_use_case
+    )
+
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+
+    mock_play_trivia_use_case.execute.side_effect = TriviaNotAssigned(
+        "User is not assigned to this trivia"
+    )
+
+    response = client.get(f"/users/{user_id}/trivias/{trivia_id}/play")
+
+    assert response.status_code == 403
+
+    app.dependency_overrides = {}
+
+
+@pytest.mark.anyio
+async def test_play_trivia_use_case_rejects_unassigned_user():
+    """Users outside the trivia member set cannot start a participation"""
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+
+    participation_repo = AsyncMock()
+    trivia_repo = AsyncMock()
+    question_repo = AsyncMock()
+    participation_repo.get_by_trivia_and_user.return_value = None
+    trivia_repo.get_composition.return_value = TriviaComposition(
+        trivia_id=trivia_id,
+        name="Python Quiz",
+        question_ids=(UUID("11111111-1111-1111-1111-111111111111"),),
+        user_ids=frozenset({UUID("44444444-4444-4444-4444-444444444444")}),
+    )
+
+    use_case = PlayTrivia(participation_repo, trivia_repo, question_repo)
+    with pytest.raises(TriviaNotAssigned):
+        await use_case.execute(user_id, trivia_id)
+
+    participation_repo.save.assert_not_called()
+
+
+def test_play_trivia_reuses_the_encoded_question_for_every_player(
+    mock_play_trivia_use_case,
+):
+    """The question JSON is encoded once; answer links stay per player"""
+    app.dependency_overrides[get_play_trivia_use_case] = (
+        lambda: mock_play_trivia_use_case
+    )
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    question = Question(
+        id=UUID("55555555-5555-5555-5555-555555555555"),
+        text='Who said "hola" {first}?',
+        difficulty=Difficulty.EASY,
+        options=[
+            QuestionOption(
+                id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+                text="Señor {x}",
+                is_correct=True,
+            ),
+            QuestionOption(
+                id=UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"),
+                text="Nobody",
+                is_correct=False,
+            ),
+        ],
+    )
+    mock_play_trivia_use_case.execute.return_value = (
+        question,
+        UUID("99999999-9999-9999-9999-999999999999"),
+        "Quotes",
+        False,
+        None,
+    )
+    fragment_cache.invalidate(question.id)
+
+    payloads = []
+    for user_id in (UUID(int=1), UUID(int=2)):
+        response = client.get(f"/users/{user_id}/trivias/{trivia_id}/play")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        payloads.append(PlayQuestionResponse.model_validate(response.json()))
+
+    app.dependency_overrides = {}
+
+    assert fragment_cache.get(question.id) is not None
+    first, second = payloads
+    assert first.text == 'Who said "hola" {first}?'
+    assert first.options[0].text == "Señor {x}"
+    assert first.options[1].answer == (
+        f"http://testserver/users/{UUID(int=1)}/trivias/{trivia_id}"
+        f"/questions/{question.id}/options/{question.options[1].id}"
+    )
+    assert str(UUID(int=2)) in second.options[0].answer
@@ -1,11 +1,23 @@
-from unittest.mock import AsyncMock
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
 
-from app.api.routes.questions import get_question_repo
+from app.api.routes.questions import (
+    get_import_questions_use_case,
+    get_question_repo,
+    get_read_question_repo,
+)
+from app.application.pagination import Page
+from app.application.use_cases.question import ImportQuestions
+from app.application.versions import Version
 from app.domain.entities.question import Question, QuestionOption
 from app.domain.value_objects.difficulty import Difficulty
+from app.infrastructure.repositories.question_repo import QuestionRepoSqlAlchemy
 from app.main import app
 
 client = TestClient(app)
@@ -72,7 +84,7 @@ def test_create_question_invalid_options(mock_question_repo):
 
 
 def test_list_questions(mock_question_repo):
-    app.dependency_overrides[get_question_repo] = lambda: mock_question_repo
+    app.dependency_overrides[get_read_question_repo] = lambda: mock_question_repo
     expected_questions = [
         Question(
             id="12345678-1234-5678-1234-567812345678",
@@ -109,7 +121,7 @@ def test_list_questions(mock_question_repo):
             ],
         ),
     ]
-    mock_question_repo.get_all.return_value = expected_questions
+    mock_question_repo.get_page.return_value = Page(items=expected_questions)
 
     response = client.get("/questions")
 
@@ -118,6 +130,163 @@ def test_list_questions(mock_question_repo):
     assert len(data) == 2
     assert data[0]["text"] == "Question 1"
     assert data[1]["text"] == "Question 2"
-    mock_question_repo.get_all.assert_called_once()
+    mock_question_repo.get_page.assert_called_once_with(100, None, None)
+
+    app.dependency_overrides = {}
+
+
+def test_list_questions_by_difficulty(mock_question_repo):
+    app.dependency_overrides[get_read_question_repo] = lambda: mock_question_repo
+    mock_question_repo.get_page.return_value = Page(items=[])
+
+    response = client.get("/questions", params={"difficulty": "hard", "limit": 10})
+
+    assert response.status_code == 200
+    assert response.json() == []
+    mock_question_repo.get_page.assert_called_once_with(10, None, Difficulty.HARD)
+
+    response = client.get("/questions", params={"difficulty": "impossible"})
+    assert response.status_code == 422
+
+    app.dependency_overrides = {}
+
+
+def test_list_questions_not_modified(mock_question_repo):
+    app.dependency_overrides[get_read_question_repo] = lambda: mock_question_repo
+    mock_question_repo.get_version.return_value = Version(
+        count=3, updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+    mock_question_repo.get_page.return_value = Page(items=[])
+
+    params = {"difficulty": "easy", "limit": 10}
+    etag = client.get("/questions", params=params).headers["ETag"]
+    mock_question_repo.get_page.reset_mock()
+
+    response = client.get("/questions", params=params, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    mock_question_repo.get_version.assert_called_with(Difficulty.EASY)
+    mock_question_repo.get_page.assert_not_called()
+
+    # Another page of the same collection is a different representation.
+    response = client.get(
+        "/questions", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
 
     app.dependency_overrides = {}
+
+
+def _import_item(text, correct=(True, False)):
+    return {
+        "text": text,
+        "difficulty": "easy",
+        "options": [
+            {"text": f"Option {i}", "is_correct": flag}
+            for i, flag in enumerate(correct)
+        ],
+    }
+
+
+def test_import_questions_reports_errors_per_item(mock_question_repo):
+    unit_of_work = AsyncMock()
+    app.dependency_overrides[get_import_questions_use_case] = lambda: ImportQuestions(
+        mock_question_repo, unit_of_work, batch_size=2
+    )
+    items = [
+        _import_item("Q1"),
+        _import_item("Q2", correct=(True, True)),
+        {"text": "Q3"},
+        _import_item("Q4"),
+        _import_item("Q5"),
+    ]
+
+    response = client.post("/questions/import", json=items)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 3
+    assert [qid is not None for qid in data["question_ids"]] == [
+        True, False, False, True, True
+    ]
+    assert [e["index"] for e in data["errors"]] == [1, 2]
+    assert "exactly 1 correct option" in data["errors"][0]["error"]
+    assert data["errors"][1]["error"].startswith("difficulty")
+    batches = [call.args[0] for call in mock_question_repo.save_many.call_args_list]
+    assert [[q.text for q in batch] for batch in batches] == [["Q1", "Q4"], ["Q5"]]
+    assert unit_of_work.commit.await_count == 2
+
+    app.dependency_overrides = {}
+
+
+def test_import_questions_accepts_ndjson(mock_question_repo):
+    unit_of_work = AsyncMock()
+    app.dependency_overrides[get_import_questions_use_case] = lambda: ImportQuestions(
+        mock_question_repo, unit_of_work
+    )
+    body = "\n".join(
+        [json.dumps(_import_item("Q1")), "{not json", "", json.dumps(_import_item("Q2"))]
+    )
+
+    response = client.post(
+        "/questions/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert data["question_ids"][1] is None
+    assert data["errors"][0]["index"] == 1
+    assert data["errors"][0]["error"].startswith("Invalid JSON")
+    mock_question_repo.save_many.assert_awaited_once()
+    unit_of_work.commit.assert_awaited_once()
+
+    app.dependency_overrides = {}
+
+
+def test_import_questions_rejects_non_array_body(mock_question_repo):
+    app.dependency_overrides[get_import_questions_use_case] = lambda: ImportQuestions(
+        mock_question_repo, AsyncMock()
+    )
+
+    response = client.post("/questions/import", json={"text": "Q1"})
+
+    assert response.status_code == 400
+    mock_question_repo.save_many.assert_not_called()
+
+    app.dependency_overrides = {}
+
+
+def _sql(call):
+    return str(call.args[0].compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.anyio
+async def test_question_version_reads_the_write_counter():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    session.execute.return_value.one_or_none.return_value = None
+    repo = QuestionRepoSqlAlchemy(session)
+
+    assert await repo.get_version(Difficulty.EASY) == Version(count=0, updated_at=None)
+    (call,) = session.execute.call_args_list
+    assert "FROM collection_versions" in _sql(call)
+    assert "FROM questions" not in _sql(call)
+
+    session.execute.reset_mock()
+    await repo.save_many(
+        [
+            Question(
+                id=uuid4(),
+                text="What is 2+2?",
+                difficulty=Difficulty.EASY,
+                options=[
+                    QuestionOption(id=uuid4(), text="4", is_correct=True),
+                    QuestionOption(id=uuid4(), text="5", is_correct=False),
+                ],
+            )
+        ]
+    )
+    assert "ON CONFLICT (name) DO UPDATE" in _sql(session.execute.call_args_list[-1])
@@ -1,5 +1,5 @@
 from unittest.mock import AsyncMock
-from uuid import UUID, uuid4
+from uuid import uuid4
 from datetime import datetime, timezone
 
 import pytest
@@ -34,7 +34,7 @@ def test_get_trivia_ranking(mock_participation_repo):
             "finished_at": datetime(2023, 1, 1, 10, 5, 0, tzinfo=timezone.utc),
         },
     ]
-    mock_participation_repo.get_ranking.return_value = expected_ranking
+    mock_participation_repo.get_ranking_page.return_value = expected_ranking
 
     response = client.get(f"/trivias/{trivia_id}/ranking")
 
@@ -46,8 +46,11 @@ def test_get_trivia_ranking(mock_participation_repo):
     assert data["ranking"][0]["score"] == 100
     assert data["ranking"][1]["user_name"] == "User 2"
     assert data["ranking"][1]["score"] == 90
+    assert data["next_cursor"] is None
     
-    mock_participation_repo.get_ranking.assert_called_once_with(trivia_id)
+    mock_participation_repo.get_ranking_page.assert_called_once_with(
+        trivia_id, 0, 101
+    )
 
     app.dependency_overrides = {}
 
@@ -56,7 +59,7 @@ def test_get_trivia_ranking_empty(mock_participation_repo):
     app.dependency_overrides[get_participation_repo] = lambda: mock_participation_repo
     trivia_id = uuid4()
     
-    mock_participation_repo.get_ranking.return_value = []
+    mock_participation_repo.get_ranking_page.return_value = []
 
     response = client.get(f"/trivias/{trivia_id}/ranking")
 
@@ -65,6 +68,116 @@ def test_get_trivia_ranking_empty(mock_participation_repo):
     assert data["trivia_id"] == str(trivia_id)
     assert len(data["ranking"]) == 0
     
-    mock_participation_repo.get_ranking.assert_called_once_with(trivia_id)
+    mock_participation_repo.get_ranking_page.assert_called_once_with(
+        trivia_id, 0, 101
+    )
+
+    app.dependency_overrides = {}
+
+
+def test_get_trivia_ranking_paginates(mock_participation_repo):
+    app.dependency_overrides[get_participation_repo] = lambda: mock_participation_repo
+    trivia_id = uuid4()
+
+    mock_participation_repo.get_ranking_page.return_value = [
+        {
+            "user_id": uuid4(),
+            "user_name": f"User {rank}",
+            "score": 100 - rank,
+            "finished_at": None,
+            "rank": rank,
+        }
+        for rank in (1, 2, 3)
+    ]
+
+    response = client.get(f"/trivias/{trivia_id}/ranking?limit=2")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [entry["rank"] for entry in data["ranking"]] == [1, 2]
+    assert data["next_cursor"]
+
+    mock_participation_repo.get_ranking_page.reset_mock()
+    mock_participation_repo.get_ranking_page.return_value = []
+    response = client.get(
+        f"/trivias/{trivia_id}/ranking?limit=2&cursor={data['next_cursor']}"
+    )
+
+    assert response.status_code == 200
+    mock_participation_repo.get_ranking_page.assert_called_once_with(
+        trivia_id, 2, 3
+    )
+
+    app.dependency_overrides = {}
+
+
+def test_get_trivia_ranking_top(mock_participation_repo):
+    app.dependency_overrides[get_participation_repo] = lambda: mock_participation_repo
+    trivia_id = uuid4()
+    mock_participation_repo.get_ranking_page.return_value = []
+
+    response = client.get(f"/trivias/{trivia_id}/ranking?top=10")
+
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] is None
+    mock_participation_repo.get_ranking_page.assert_called_once_with(
+        trivia_id, 0, 10
+    )
+
+    app.dependency_overrides = {}
+
+
+def test_get_trivia_ranking_invalid_cursor(mock_participation_repo):
+    app.dependency_overrides[get_participation_repo] = lambda: mock_participation_repo
+
+    response = client.get(f"/trivias/{uuid4()}/ranking?cursor=not-a-cursor")
+
+    assert response.status_code == 400
+
+    app.dependency_overrides = {}
+
+
+def test_get_user_rank(mock_participation_repo):
+    app.dependency_overrides[get_participation_repo] = lambda: mock_participation_repo
+    trivia_id = uuid4()
+    user_id = uuid4()
+
+    mock_participation_repo.get_ranking_around.return_value = [
+        {
+            "user_id": entry_user_id,
+            "user_name": name,
+            "score": score,
+            "finished_at": None,
+            "rank": rank,
+        }
+        for entry_user_id, name, score, rank in (
+            (uuid4(), "Above", 9, 4),
+            (user_id, "Me", 8, 5),
+            (uuid4(), "Below", 7, 6),
+        )
+    ]
+
+    response = client.get(f"/users/{user_id}/trivias/{trivia_id}/rank?neighbours=1")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["rank"] == 5
+    assert data["score"] == 8
+    assert [entry["user_name"] for entry in data["above"]] == ["Above"]
+    assert [entry["user_name"] for entry in data["below"]] == ["Below"]
+    mock_participation_repo.get_ranking_around.assert_called_once_with(
+        trivia_id, user_id, 1
+    )
+
+    app.dependency_overrides = {}
+
+
+def test_get_user_rank_not_found(mock_participation_repo):
+    app.dependency_overrides[get_participation_repo] = lambda: mock_participation_repo
+    mock_participation_repo.get_ranking_around.return_value = []
+
+    response = client.get(f"/users/{uuid4()}/trivias/{uuid4()}/rank")
+
+    assert response.status_code == 404
 
     app.dependency_overrides = {}
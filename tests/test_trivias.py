@@ -1,11 +1,27 @@
-from unittest.mock import AsyncMock
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
 import pytest
 from fastapi.testclient import TestClient
 
-from app.api.routes.trivias import get_trivia_repo
+from app.api.routes.trivias import (
+    get_create_trivia_use_case,
+    get_read_trivia_repo,
+    get_trivia_repo,
+    get_update_trivia_questions_use_case,
+    get_update_trivia_users_use_case,
+)
+from app.application.pagination import Page
+from app.application.use_cases.trivia import (
+    CreateTrivia,
+    UpdateTriviaQuestions,
+    UpdateTriviaUsers,
+)
+from app.application.versions import Version
 from app.domain.entities.trivia import Trivia
+from app.domain.errors import QuestionsAlreadyAnswered
+from app.infrastructure.db.session import recent_writes
 from app.main import app
 
 client = TestClient(app)
@@ -16,8 +32,29 @@ def mock_trivia_repo():
     return AsyncMock()
 
 
-def test_create_trivia(mock_trivia_repo):
-    app.dependency_overrides[get_trivia_repo] = lambda: mock_trivia_repo
+@pytest.fixture
+def mock_question_repo():
+    repo = AsyncMock()
+    repo.get_existing_ids.side_effect = lambda ids: set(ids)
+    return repo
+
+
+@pytest.fixture
+def mock_user_repo():
+    repo = AsyncMock()
+    repo.get_existing_ids.side_effect = lambda ids: set(ids)
+    return repo
+
+
+@pytest.fixture
+def create_trivia_use_case(mock_trivia_repo, mock_question_repo, mock_user_repo):
+    return CreateTrivia(mock_trivia_repo, mock_question_repo, mock_user_repo)
+
+
+def test_create_trivia(mock_trivia_repo, create_trivia_use_case):
+    app.dependency_overrides[get_create_trivia_use_case] = lambda: (
+        create_trivia_use_case
+    )
     trivia_data = {
         "name": "Python Quiz",
         "description": "Test your Python knowledge",
@@ -53,8 +90,10 @@ def test_create_trivia(mock_trivia_repo):
     app.dependency_overrides = {}
 
 
-def test_create_trivia_duplicate_questions(mock_trivia_repo):
-    app.dependency_overrides[get_trivia_repo] = lambda: mock_trivia_repo
+def test_create_trivia_duplicate_questions(create_trivia_use_case):
+    app.dependency_overrides[get_create_trivia_use_case] = lambda: (
+        create_trivia_use_case
+    )
     trivia_data = {
         "name": "Invalid Trivia",
         "description": "Has duplicate questions",
@@ -72,8 +111,43 @@ def test_create_trivia_duplicate_questions(mock_trivia_repo):
     app.dependency_overrides = {}
 
 
+def test_create_trivia_reports_missing_ids(
+    mock_trivia_repo, mock_question_repo, mock_user_repo, create_trivia_use_case
+):
+    app.dependency_overrides[get_create_trivia_use_case] = lambda: (
+        create_trivia_use_case
+    )
+    known_question = UUID("11111111-1111-1111-1111-111111111111")
+    mock_question_repo.get_existing_ids.side_effect = lambda ids: {known_question}
+    mock_user_repo.get_existing_ids.side_effect = lambda ids: set()
+    trivia_data = {
+        "name": "Python Quiz",
+        "question_ids": [
+            "22222222-2222-2222-2222-222222222222",
+            str(known_question),
+            "44444444-4444-4444-4444-444444444444",
+        ],
+        "user_ids": ["33333333-3333-3333-3333-333333333333"],
+    }
+
+    response = client.post("/trivias", json=trivia_data)
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["missing_question_ids"] == [
+        "22222222-2222-2222-2222-222222222222",
+        "44444444-4444-4444-4444-444444444444",
+    ]
+    assert detail["missing_user_ids"] == ["33333333-3333-3333-3333-333333333333"]
+    mock_question_repo.get_existing_ids.assert_awaited_once()
+    mock_user_repo.get_existing_ids.assert_awaited_once()
+    mock_trivia_repo.save.assert_not_called()
+
+    app.dependency_overrides = {}
+
+
 def test_get_trivia(mock_trivia_repo):
-    app.dependency_overrides[get_trivia_repo] = lambda: mock_trivia_repo
+    app.dependency_overrides[get_read_trivia_repo] = lambda: mock_trivia_repo
     trivia_id = UUID("12345678-1234-5678-1234-567812345678")
     expected_trivia = Trivia(
         id=trivia_id,
@@ -99,7 +173,7 @@ def test_get_trivia(mock_trivia_repo):
 
 
 def test_get_trivia_not_found(mock_trivia_repo):
-    app.dependency_overrides[get_trivia_repo] = lambda: mock_trivia_repo
+    app.dependency_overrides[get_read_trivia_repo] = lambda: mock_trivia_repo
     trivia_id = UUID("99999999-9999-9999-9999-999999999999")
     mock_trivia_repo.get_by_id.return_value = None
 
@@ -110,8 +184,67 @@ def test_get_trivia_not_found(mock_trivia_repo):
     app.dependency_overrides = {}
 
 
+def test_get_trivia_not_modified(mock_trivia_repo):
+    app.dependency_overrides[get_read_trivia_repo] = lambda: mock_trivia_repo
+    trivia_id = UUID("12345678-1234-5678-1234-567812345678")
+    mock_trivia_repo.get_version.return_value = Version(
+        count=1, updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+    mock_trivia_repo.get_by_id.return_value = Trivia(
+        id=trivia_id,
+        name="Python Quiz",
+        description=None,
+        question_ids=[],
+        user_ids=[],
+    )
+
+    response = client.get(f"/trivias/{trivia_id}")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    mock_trivia_repo.get_by_id.reset_mock()
+    response = client.get(f"/trivias/{trivia_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    mock_trivia_repo.get_by_id.assert_not_called()
+
+    mock_trivia_repo.get_version.return_value = Version(
+        count=1, updated_at=datetime(2024, 1, 2, tzinfo=timezone.utc)
+    )
+    response = client.get(f"/trivias/{trivia_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    app.dependency_overrides = {}
+
+
+def test_list_user_trivias_etag_tracks_membership(mock_trivia_repo):
+    app.dependency_overrides[get_read_trivia_repo] = lambda: mock_trivia_repo
+    user_id = UUID("33333333-3333-3333-3333-333333333333")
+    updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_trivia_repo.get_user_trivias_version.return_value = Version(2, updated_at)
+    mock_trivia_repo.get_by_user_id.return_value = []
+
+    etag = client.get(f"/users/{user_id}/trivias").headers["ETag"]
+    response = client.get(
+        f"/users/{user_id}/trivias", headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+
+    # Leaving a trivia drops the count without moving any timestamp forward.
+    mock_trivia_repo.get_user_trivias_version.return_value = Version(1, updated_at)
+    response = client.get(f"/users/{user_id}/trivias", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    mock_trivia_repo.get_user_trivias_version.assert_called_with(user_id)
+
+    app.dependency_overrides = {}
+
+
 def test_list_user_trivias(mock_trivia_repo):
-    app.dependency_overrides[get_trivia_repo] = lambda: mock_trivia_repo
+    app.dependency_overrides[get_read_trivia_repo] = lambda: mock_trivia_repo
     user_id = UUID("33333333-3333-3333-3333-333333333333")
     expected_trivias = [
         Trivia(
@@ -144,7 +277,7 @@ def test_list_user_trivias(mock_trivia_repo):
 
 
 def test_list_trivias(mock_trivia_repo):
-    app.dependency_overrides[get_trivia_repo] = lambda: mock_trivia_repo
+    app.dependency_overrides[get_read_trivia_repo] = lambda: mock_trivia_repo
     expected_trivias = [
         Trivia(
             id=UUID("12345678-1234-5678-1234-567812345678"),
@@ -161,7 +294,7 @@ def test_list_trivias(mock_trivia_repo):
             user_ids=[UUID("44444444-4444-4444-4444-444444444444")],
         ),
     ]
-    mock_trivia_repo.get_all.return_value = expected_trivias
+    mock_trivia_repo.get_page.return_value = Page(items=expected_trivias)
 
     response = client.get("/trivias")
 
@@ -170,6 +303,168 @@ def test_list_trivias(mock_trivia_repo):
     assert len(data) == 2
     assert data[0]["name"] == "Python Quiz"
     assert data[1]["name"] == "JavaScript Quiz"
-    mock_trivia_repo.get_all.assert_called_once()
+    mock_trivia_repo.get_page.assert_called_once_with(100, None)
+
+    app.dependency_overrides = {}
+
+
+QUESTION_A = UUID("11111111-1111-1111-1111-111111111111")
+QUESTION_B = UUID("22222222-2222-2222-2222-222222222222")
+USER_A = UUID("33333333-3333-3333-3333-333333333333")
+USER_B = UUID("44444444-4444-4444-4444-444444444444")
+TRIVIA_ID = UUID("12345678-1234-5678-1234-567812345678")
+
 
+@pytest.fixture
+def delta_trivia_repo(mock_trivia_repo):
+    mock_trivia_repo.touch.return_value = True
+    mock_trivia_repo.invalidate = MagicMock()
+    mock_trivia_repo.add_users.side_effect = lambda trivia_id, ids: ids
+    mock_trivia_repo.remove_users.side_effect = lambda trivia_id, ids: ids
+    mock_trivia_repo.add_questions.side_effect = lambda trivia_id, ids: ids
+    mock_trivia_repo.remove_questions.side_effect = lambda trivia_id, ids: ids
+    app.dependency_overrides[get_trivia_repo] = lambda: mock_trivia_repo
+    yield mock_trivia_repo
     app.dependency_overrides = {}
+
+
+def test_update_trivia_users(delta_trivia_repo, mock_user_repo):
+    unit_of_work = AsyncMock()
+    app.dependency_overrides[get_update_trivia_users_use_case] = lambda: (
+        UpdateTriviaUsers(delta_trivia_repo, mock_user_repo, unit_of_work)
+    )
+
+    response = client.patch(
+        f"/trivias/{TRIVIA_ID}/users",
+        json={"add": [str(USER_A), str(USER_A)], "remove": [str(USER_B)]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["added"] == [str(USER_A)]
+    assert data["removed"] == [str(USER_B)]
+    delta_trivia_repo.add_users.assert_awaited_once_with(TRIVIA_ID, [USER_A])
+    delta_trivia_repo.remove_users.assert_awaited_once_with(TRIVIA_ID, [USER_B])
+    unit_of_work.commit.assert_awaited_once()
+    delta_trivia_repo.invalidate.assert_called_once_with(TRIVIA_ID)
+    # Both members' trivia lists changed, so their reads skip the replica.
+    for key in [("user_id", str(USER_A)), ("user_id", str(USER_B))]:
+        assert recent_writes.get(key)
+    assert recent_writes.get(("trivia_id", str(TRIVIA_ID)))
+
+
+def test_update_trivia_users_not_found(delta_trivia_repo, mock_user_repo):
+    delta_trivia_repo.touch.return_value = False
+    app.dependency_overrides[get_update_trivia_users_use_case] = lambda: (
+        UpdateTriviaUsers(delta_trivia_repo, mock_user_repo, AsyncMock())
+    )
+
+    response = client.patch(f"/trivias/{TRIVIA_ID}/users", json={"add": []})
+
+    assert response.status_code == 404
+    delta_trivia_repo.add_users.assert_not_called()
+
+
+def test_update_trivia_users_rejects_overlap(delta_trivia_repo, mock_user_repo):
+    app.dependency_overrides[get_update_trivia_users_use_case] = lambda: (
+        UpdateTriviaUsers(delta_trivia_repo, mock_user_repo, AsyncMock())
+    )
+
+    response = client.patch(
+        f"/trivias/{TRIVIA_ID}/users",
+        json={"add": [str(USER_A)], "remove": [str(USER_A)]},
+    )
+
+    assert response.status_code == 422
+    delta_trivia_repo.touch.assert_not_called()
+
+
+def test_update_trivia_questions_reports_unknown_ids(
+    delta_trivia_repo, mock_question_repo
+):
+    mock_question_repo.get_existing_ids.side_effect = lambda ids: set()
+    unit_of_work = AsyncMock()
+    app.dependency_overrides[get_update_trivia_questions_use_case] = lambda: (
+        UpdateTriviaQuestions(
+            delta_trivia_repo, mock_question_repo, AsyncMock(), unit_of_work
+        )
+    )
+
+    response = client.patch(
+        f"/trivias/{TRIVIA_ID}/questions", json={"add": [str(QUESTION_A)]}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["missing_question_ids"] == [str(QUESTION_A)]
+    delta_trivia_repo.add_questions.assert_not_called()
+    unit_of_work.rollback.assert_awaited_once()
+
+
+def test_update_trivia_questions_rejects_answered_removals(
+    delta_trivia_repo, mock_question_repo
+):
+    answer_repo = AsyncMock()
+    answer_repo.get_answered_question_ids.return_value = {QUESTION_B}
+    app.dependency_overrides[get_update_trivia_questions_use_case] = lambda: (
+        UpdateTriviaQuestions(
+            delta_trivia_repo, mock_question_repo, answer_repo, AsyncMock()
+        )
+    )
+
+    response = client.patch(
+        f"/trivias/{TRIVIA_ID}/questions",
+        json={"add": [str(QUESTION_A)], "remove": [str(QUESTION_B)]},
+    )
+
+    assert response.status_code == 409
+    assert str(QUESTION_B) in response.json()["detail"]
+    delta_trivia_repo.remove_questions.assert_not_called()
+    delta_trivia_repo.add_questions.assert_not_called()
+
+
+def test_update_trivia_questions_rejects_removals_answered_concurrently(
+    delta_trivia_repo, mock_question_repo
+):
+    answer_repo = AsyncMock()
+    answer_repo.get_answered_question_ids.return_value = set()
+    delta_trivia_repo.remove_questions.side_effect = QuestionsAlreadyAnswered(
+        [QUESTION_B]
+    )
+    unit_of_work = AsyncMock()
+    app.dependency_overrides[get_update_trivia_questions_use_case] = lambda: (
+        UpdateTriviaQuestions(
+            delta_trivia_repo, mock_question_repo, answer_repo, unit_of_work
+        )
+    )
+
+    response = client.patch(
+        f"/trivias/{TRIVIA_ID}/questions", json={"remove": [str(QUESTION_B)]}
+    )
+
+    assert response.status_code == 409
+    unit_of_work.rollback.assert_awaited_once()
+    unit_of_work.commit.assert_not_called()
+
+def test_update_trivia_questions(delta_trivia_repo, mock_question_repo):
+    answer_repo = AsyncMock()
+    answer_repo.get_answered_question_ids.return_value = set()
+    unit_of_work = AsyncMock()
+    app.dependency_overrides[get_update_trivia_questions_use_case] = lambda: (
+        UpdateTriviaQuestions(
+            delta_trivia_repo, mock_question_repo, answer_repo, unit_of_work
+        )
+    )
+
+    response = client.patch(
+        f"/trivias/{TRIVIA_ID}/questions",
+        json={"add": [str(QUESTION_A)], "remove": [str(QUESTION_B)]},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["added"] == [str(QUESTION_A)]
+    assert response.json()["removed"] == [str(QUESTION_B)]
+    delta_trivia_repo.remove_questions.assert_awaited_once_with(
+        TRIVIA_ID, [QUESTION_B]
+    )
+    unit_of_work.commit.assert_awaited_once()
+    delta_trivia_repo.invalidate.assert_called_once_with(TRIVIA_ID)
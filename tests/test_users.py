@@ -1,10 +1,21 @@
-from unittest.mock import AsyncMock
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
 
 import pytest
 from fastapi.testclient import TestClient
 
-from app.api.routes.users import get_user_repo
+from app.api.pagination import encode_cursor
+from app.api.routes.users import (
+    get_provision_users_use_case,
+    get_read_user_repo,
+    get_user_repo,
+)
+from app.application.pagination import Page, PageCursor
+from app.application.use_cases.user import ProvisionUsers
 from app.domain.entities.user import User
+from app.domain.errors import EmailAlreadyRegistered
+from app.infrastructure.repositories.user_repo import UserRepoSqlAlchemy
 from app.main import app
 
 client = TestClient(app)
@@ -47,7 +58,7 @@ def test_create_user_invalid_email(mock_user_repo):
 
 
 def test_list_users(mock_user_repo):
-    app.dependency_overrides[get_user_repo] = lambda: mock_user_repo
+    app.dependency_overrides[get_read_user_repo] = lambda: mock_user_repo
     expected_users = [
         User(
             id="12345678-1234-5678-1234-567812345678",
@@ -60,7 +71,7 @@ def test_list_users(mock_user_repo):
             email="user2@example.com",
         ),
     ]
-    mock_user_repo.get_all.return_value = expected_users
+    mock_user_repo.get_page.return_value = Page(items=expected_users)
 
     response = client.get("/users")
 
@@ -69,6 +80,161 @@ def test_list_users(mock_user_repo):
     assert len(data) == 2
     assert data[0]["email"] == "user1@example.com"
     assert data[1]["email"] == "user2@example.com"
-    mock_user_repo.get_all.assert_called_once()
+    mock_user_repo.get_page.assert_called_once_with(100, None)
+    assert "X-Next-Cursor" not in response.headers
     
     app.dependency_overrides = {}
+
+
+def test_list_users_cursor_round_trip(mock_user_repo):
+    app.dependency_overrides[get_read_user_repo] = lambda: mock_user_repo
+    next_cursor = PageCursor(
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        id=UUID("12345678-1234-5678-1234-567812345678"),
+    )
+    mock_user_repo.get_page.return_value = Page(
+        items=[
+            User(
+                id="12345678-1234-5678-1234-567812345678",
+                name="User 1",
+                email="user1@example.com",
+            )
+        ],
+        next_cursor=next_cursor,
+    )
+
+    response = client.get("/users", params={"limit": 1})
+
+    assert response.status_code == 200
+    cursor = response.headers["X-Next-Cursor"]
+
+    client.get("/users", params={"limit": 1, "cursor": cursor})
+
+    mock_user_repo.get_page.assert_called_with(1, next_cursor)
+
+    app.dependency_overrides = {}
+
+
+def test_list_users_invalid_cursor(mock_user_repo):
+    app.dependency_overrides[get_read_user_repo] = lambda: mock_user_repo
+
+    response = client.get("/users", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    response = client.get("/users", params={"cursor": encode_cursor({"id": "x"})})
+    assert response.status_code == 400
+    mock_user_repo.get_page.assert_not_called()
+
+    app.dependency_overrides = {}
+
+
+def test_list_users_limit_is_bounded(mock_user_repo):
+    app.dependency_overrides[get_read_user_repo] = lambda: mock_user_repo
+
+    response = client.get("/users", params={"limit": 5000})
+
+    assert response.status_code == 422
+    mock_user_repo.get_page.assert_not_called()
+
+    app.dependency_overrides = {}
+
+
+def test_create_user_duplicate_email(mock_user_repo):
+    app.dependency_overrides[get_user_repo] = lambda: mock_user_repo
+    mock_user_repo.save.side_effect = EmailAlreadyRegistered(
+        "Email test@example.com is already registered"
+    )
+
+    response = client.post(
+        "/users", json={"name": "Test User", "email": "test@example.com"}
+    )
+
+    assert response.status_code == 409
+
+    app.dependency_overrides = {}
+
+
+def test_provision_users_returns_ids_in_input_order(mock_user_repo):
+    unit_of_work = AsyncMock()
+    app.dependency_overrides[get_provision_users_use_case] = lambda: ProvisionUsers(
+        mock_user_repo, unit_of_work, batch_size=2
+    )
+    existing_id = UUID("87654321-4321-8765-4321-876543210987")
+
+    async def save_many(users):
+        return [
+            (existing_id, False) if user.email == "old@example.com" else (user.id, True)
+            for user in users
+        ]
+
+    mock_user_repo.save_many.side_effect = save_many
+    users = [
+        {"name": "New", "email": "new@example.com"},
+        {"name": "Old", "email": "old@example.com"},
+        {"name": "Other", "email": "other@example.com"},
+        {"name": "New again", "email": "new@example.com"},
+    ]
+
+    response = client.post("/users/bulk", json={"users": users})
+
+    assert response.status_code == 200
+    data = response.json()
+    results = data["results"]
+    assert [r["email"] for r in results] == [u["email"] for u in users]
+    assert [r["created"] for r in results] == [True, False, True, True]
+    assert results[1]["id"] == str(existing_id)
+    assert results[3]["id"] == results[0]["id"]
+    assert data["created_ids"] == [results[0]["id"], results[2]["id"]]
+    assert data["existing_ids"] == [results[1]["id"]]
+    assert [len(c.args[0]) for c in mock_user_repo.save_many.call_args_list] == [2, 1]
+    unit_of_work.commit.assert_awaited_once()
+
+    app.dependency_overrides = {}
+
+
+def test_provision_users_rejects_empty_batch(mock_user_repo):
+    app.dependency_overrides[get_provision_users_use_case] = lambda: ProvisionUsers(
+        mock_user_repo, AsyncMock()
+    )
+
+    response = client.post("/users/bulk", json={"users": []})
+
+    assert response.status_code == 422
+    mock_user_repo.save_many.assert_not_called()
+
+    app.dependency_overrides = {}
+
+
+def _rows(*rows):
+    result = MagicMock()
+    result.all.return_value = list(rows)
+    return result
+
+
+@pytest.mark.anyio
+async def test_save_many_retries_conflicts_deleted_before_the_lookup():
+    first = User(id=uuid4(), name="First", email="first@example.com")
+    gone = User(id=uuid4(), name="Gone", email="gone@example.com")
+    repeat = User(id=uuid4(), name="Repeat", email="first@example.com")
+    session = MagicMock()
+    session.execute = AsyncMock(
+        side_effect=[
+            # gone@ conflicts, then its row is deleted before the lookup.
+            _rows((first.id, first.email)),
+            _rows(),
+            _rows((gone.id, gone.email)),
+        ]
+    )
+
+    results = await UserRepoSqlAlchemy(session).save_many([first, gone, repeat])
+
+    assert results == [(first.id, True), (gone.id, True), (first.id, True)]
+    inserted = [
+        sorted(
+            value
+            for key, value in call.args[0].compile().params.items()
+            if key.startswith("email")
+        )
+        for call in session.execute.call_args_list[::2]
+    ]
+    assert inserted == [["first@example.com", "gone@example.com"], ["gone@example.com"]]